@@ -1,3 +1,6 @@
+import topsail.visualizations.figure_export as topsail_figure_export
+import topsail.visualizations.plot_memo as topsail_plot_memo
+
 from . import error_report
 from ..store import prom
 from . import prom_report
@@ -9,6 +12,8 @@ from . import compare_test_speed
 from . import compare_report
 
 def register():
+    topsail_figure_export.init()
+
     error_report.register()
     report.register()
     prom.register()
@@ -19,3 +24,5 @@ def register():
     progress.register()
     compare_test_speed.register()
     compare_report.register()
+
+    topsail_plot_memo.init()
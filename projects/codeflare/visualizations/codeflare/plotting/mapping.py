@@ -1,4 +1,3 @@
-from collections import defaultdict
 import re
 import logging
 import datetime
@@ -51,39 +50,33 @@ def ResourceMappingTimeline_generate_data(entry):
         ))
 
     if not data:
-        return []
+        return pd.DataFrame()
 
-    df = pd.DataFrame(data).sort_values(by="Time")
     YOTA = datetime.timedelta(microseconds=1)
-    node_pod_count = defaultdict(int)
-    data = []
-    for index, row in df.iterrows():
-        data.append(dict(
-            Time = row.Time - YOTA,
-            Count = node_pod_count[row.NodeName],
-            NodeName = row.NodeName,
-        ))
-        node_pod_count[row.NodeName] += row.Inc
-        data.append(dict(
-            Time = row.Time,
-            Count = node_pod_count[row.NodeName],
-            NodeName = row.NodeName,
-        ))
 
-    for node in node_pod_count.keys():
-        data.insert(0, dict(
-            Time =entry.results.test_start_end_time.start,
-            Count = 0,
-            NodeName = node,
-        ))
+    events = pd.DataFrame(data).sort_values(by="Time", kind="stable", ignore_index=True)
+    events = events.drop(columns=["PodName"])
 
-        data.append(dict(
-            Time =entry.results.test_start_end_time.end,
-            Count = 0,
-            NodeName = node,
-        ))
+    # running Pod count of each node, after each event
+    events["Count"] = events.groupby("NodeName", sort=False).Inc.cumsum()
 
-    return data
+    # each event is a step: the previous count right before it, the new count after it
+    before = events.assign(Time=events.Time - YOTA, Count=events.Count - events.Inc)
+    steps = pd.concat([before, events]).sort_index(kind="stable").drop(columns=["Inc"])
+
+    nodes = steps.NodeName.unique()
+    start = pd.DataFrame(dict(
+        Time = entry.results.test_start_end_time.start,
+        Count = 0,
+        NodeName = nodes[::-1],
+    ))
+    end = pd.DataFrame(dict(
+        Time = entry.results.test_start_end_time.end,
+        Count = 0,
+        NodeName = nodes,
+    ))
+
+    return pd.concat([start, steps, end], ignore_index=True)
 
 class ResourceMappingTimeline():
     def __init__(self):
@@ -101,13 +94,11 @@ class ResourceMappingTimeline():
             return {}, "ERROR: only one experiment must be selected"
 
         for entry in common.Matrix.all_records(settings, setting_lists):
-            data = ResourceMappingTimeline_generate_data(entry)
+            df = ResourceMappingTimeline_generate_data(entry)
 
-        if not data:
+        if df.empty:
             return None, "Not data available ..."
 
-        df = pd.DataFrame(data)
-
         fig = go.Figure()
         for name in df.NodeName.unique():
             df_name = df[df.NodeName == name]
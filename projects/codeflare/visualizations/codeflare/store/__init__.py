@@ -1,19 +1,22 @@
 import pathlib
 import logging
 import types
-import pickle
-import fnmatch
 import os
 
 import matrix_benchmarking.store as store
 import matrix_benchmarking.store.simple as store_simple
 
+import topsail.visualizations.prom_metrics as topsail_prom_metrics
+import topsail.visualizations.store_files as topsail_store_files
+import topsail.visualizations.result_cache as topsail_result_cache
+
 from . import parsers
 from . import lts
 
 CACHE_FILENAME = "cache.pickle"
 
 IMPORTANT_FILES = parsers.IMPORTANT_FILES
+IMPORTANT_FILES_MATCHER = topsail_store_files.ImportantFilesMatcher(IMPORTANT_FILES)
 
 PARSER_VERSION = parsers.PARSER_VERSION
 ARTIFACTS_VERSION = parsers.ARTIFACTS_VERSION
@@ -27,16 +30,7 @@ def is_mandatory_file(filename):
 
 
 def is_important_file(filename):
-    if str(filename) in IMPORTANT_FILES:
-        return True
-
-    for important_file in IMPORTANT_FILES:
-        if "*" not in important_file: continue
-
-        if fnmatch.filter([str(filename)], important_file):
-            return True
-
-    return False
+    return IMPORTANT_FILES_MATCHER.match(filename)
 
 
 def is_cache_file(filename):
@@ -47,10 +41,10 @@ def resolve_artifact_dirnames(dirname, artifact_dirnames):
     artifact_paths = types.SimpleNamespace()
     for artifact_dirname, unresolved_dirname in artifact_dirnames.__dict__.items():
         direct_resolution = dirname / unresolved_dirname
-        resolutions = list(dirname.glob(unresolved_dirname))
+        resolutions = parsers.dir_listing.glob(unresolved_dirname)
         resolved_dir = None
 
-        if direct_resolution.exists():
+        if parsers.dir_listing.exists(unresolved_dirname):
             # all good
             resolved_dir = direct_resolution
         elif not resolutions:
@@ -91,8 +85,7 @@ def _rewrite_settings(settings_dict):
 
 def load_cache(dirname):
     try:
-        with open(dirname / CACHE_FILENAME, "rb") as f:
-            results = pickle.load(f)
+        results = topsail_result_cache.load(dirname / CACHE_FILENAME)
 
         cache_version = getattr(results, "parser_version", None)
         if cache_version != PARSER_VERSION:
@@ -111,6 +104,7 @@ def load_cache(dirname):
 
 
 def _parse_directory(fn_add_to_matrix, dirname, import_settings):
+    parsers.dir_listing = topsail_store_files.DirectoryListing(dirname)
     parsers.artifact_paths = resolve_artifact_dirnames(dirname, parsers.artifact_dirnames)
 
     ignore_cache = os.environ.get("MATBENCH_STORE_IGNORE_CACHE", False) in ("yes", "y", "true", "True")
@@ -124,6 +118,7 @@ def _parse_directory(fn_add_to_matrix, dirname, import_settings):
         results = None
 
     if results:
+        topsail_prom_metrics.bind_metrics(results.metrics, dirname)
         parsers._parse_always(results, dirname, import_settings)
 
         fn_add_to_matrix(results)
@@ -148,13 +143,12 @@ def _parse_directory(fn_add_to_matrix, dirname, import_settings):
 
     fn_add_to_matrix(results)
 
-    with open(dirname / CACHE_FILENAME, "wb") as f:
-        get_config = results.test_config.get
-        results.test_config.get = None
+    get_config = results.test_config.get
+    results.test_config.get = None
 
-        pickle.dump(results, f)
+    topsail_result_cache.dump(dirname / CACHE_FILENAME, results)
 
-        results.test_config.get = get_config
+    results.test_config.get = get_config
 
     print("parsing done :)")
 
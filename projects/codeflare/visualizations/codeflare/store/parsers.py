@@ -9,7 +9,10 @@ import datetime
 import jsonpath_ng
 
 import matrix_benchmarking.cli_args as cli_args
-import matrix_benchmarking.store.prom_db as store_prom_db
+
+import topsail.visualizations.prom_metrics as topsail_prom_metrics
+import topsail.visualizations.records as topsail_records
+import topsail.visualizations.parse_memo as topsail_parse_memo
 
 from . import prom as workload_prom
 from . import k8s_quantity
@@ -29,6 +32,7 @@ artifact_dirnames.CODEFLARE_GENERATE_MCAD_LOAD_DIR = "*__codeflare__generate_mca
 artifact_dirnames.CODEFLARE_CLEANUP_APPWRAPPERS_DIR = "*__codeflare__cleanup_appwrappers"
 
 artifact_paths = None # store._parse_directory will turn it into a {str: pathlib.Path} dict base on ^^^
+dir_listing = None # store._parse_directory will set it to the DirectoryListing of the results directory
 
 
 IMPORTANT_FILES = [
@@ -36,6 +40,7 @@ IMPORTANT_FILES = [
     "test_case_config.yaml",
 
     f"{artifact_dirnames.CLUSTER_DUMP_PROM_DB_DIR}/prometheus.t*",
+    "prom_metrics/*/*",
 
     f"{artifact_dirnames.CLUSTER_CAPTURE_ENV_DIR}/nodes.json",
     f"{artifact_dirnames.CLUSTER_CAPTURE_ENV_DIR}/ocp_version.yml",
@@ -143,8 +148,7 @@ def _parse_test_config(dirname):
     filename = pathlib.Path("config.yaml")
     test_config.filepath = dirname / filename
 
-    with open(register_important_file(dirname, filename)) as f:
-        yaml_file = test_config.yaml_file = yaml.safe_load(f)
+    yaml_file = test_config.yaml_file = topsail_parse_memo.load_yaml(register_important_file(dirname, filename))
 
     if not yaml_file:
         logging.error("Config file '{filename}' is empty ...")
@@ -170,15 +174,19 @@ def _parse_test_config(dirname):
 
 @ignore_file_not_found
 def _parse_nodes_info(dirname, sutest_cluster=True):
-    nodes_info = {}
-
     if not artifact_paths.CLUSTER_CAPTURE_ENV_DIR:
         raise FileNotFoundError(artifact_dirnames.CLUSTER_CAPTURE_ENV_DIR)
 
     filename = artifact_paths.CLUSTER_CAPTURE_ENV_DIR / "nodes.json"
 
-    with open(register_important_file(dirname, filename)) as f:
-        nodeList = json.load(f)
+    # parsed once per nodes.json content, the runs of the matrix share the node-info objects
+    return topsail_parse_memo.parse_file(register_important_file(dirname, filename), _parse_nodes_list, sutest_cluster)
+
+
+def _parse_nodes_list(content, sutest_cluster):
+    nodes_info = {}
+
+    nodeList = json.loads(content)
 
     for node in nodeList["items"]:
         node_name = node["metadata"]["name"]
@@ -210,8 +218,7 @@ def _parse_ocp_version(dirname):
     if not artifact_paths.CLUSTER_CAPTURE_ENV_DIR:
         raise FileNotFoundError(artifact_dirnames.CLUSTER_CAPTURE_ENV_DIR)
 
-    with open(register_important_file(dirname, artifact_paths.CLUSTER_CAPTURE_ENV_DIR / "ocp_version.yml")) as f:
-        sutest_ocp_version_yaml = yaml.safe_load(f)
+    sutest_ocp_version_yaml = topsail_parse_memo.load_yaml(register_important_file(dirname, artifact_paths.CLUSTER_CAPTURE_ENV_DIR / "ocp_version.yml"))
 
     return sutest_ocp_version_yaml["openshiftVersion"]
 
@@ -224,18 +231,18 @@ def _extract_metrics(dirname):
         "sutest": (str(artifact_paths.CLUSTER_DUMP_PROM_DB_DIR / "prometheus.t*"), workload_prom.get_sutest_metrics()),
     }
 
-    metrics = {}
+    prom_tarballs = {}
     for name, (tarball_glob, metric) in METRICS.items():
         try:
-            prom_tarball = list(dirname.glob(tarball_glob))[0]
+            prom_tarball = dir_listing.glob(tarball_glob)[0]
         except IndexError:
             logging.warning(f"No {tarball_glob} in '{dirname}'.")
             continue
 
         register_important_file(dirname, prom_tarball.relative_to(dirname))
-        metrics[name] = store_prom_db.extract_metrics(prom_tarball, metric, dirname)
+        prom_tarballs[name] = (prom_tarball, metric)
 
-    return metrics
+    return topsail_prom_metrics.extract_metrics(prom_tarballs, dirname)
 
 def _extract_cluster_info(nodes_info):
     cluster_info = types.SimpleNamespace()
@@ -265,7 +272,7 @@ def _parse_pod_times(dirname):
 
     pod_times = []
     for pod in json_file["items"]:
-      pod_time = types.SimpleNamespace()
+      pod_time = topsail_records.PodTimes()
       pod_times.append(pod_time)
 
       pod_time.pod_name = pod["metadata"]["name"]
@@ -300,7 +307,7 @@ def _parse_pod_times(dirname):
           except KeyError: continue
 
           # take the last container_finished found
-          if ("container_finished" not in pod_time.__dict__
+          if (not hasattr(pod_time, "container_finished")
               or pod_time.container_finished < finishedAt):
               pod_time.container_finished = finishedAt
 
@@ -1,3 +1,6 @@
+import topsail.visualizations.figure_export as topsail_figure_export
+import topsail.visualizations.plot_memo as topsail_plot_memo
+
 from . import error_report
 from . import report
 from . import latency
@@ -7,6 +10,8 @@ from . import lts
 from . import lts_documentation
 
 def register():
+    topsail_figure_export.init()
+
     error_report.register()
     report.register()
     latency.register()
@@ -14,3 +19,5 @@ def register():
     throughput.register()
     lts.register()
     lts_documentation.register()
+
+    topsail_plot_memo.init()
@@ -8,6 +8,7 @@ import copy
 import statistics as stats
 
 import plotly.graph_objs as go
+import numpy as np
 import pandas as pd
 import plotly.express as px
 from dash import html
@@ -97,17 +98,9 @@ def generateSuccesssCount(entries, variables):
     data = []
 
     for entry in entries:
-        llm_data = entry.results.llm_load_test_output
-
-        success_count = 0
-        for idx, block in enumerate(llm_data):
-            error_count = 0
-            for descr, count in block.get("errorDistribution", {}).items():
-                error_count += count
-            success_count += len(block["details"]) - error_count
         data.append(dict(
             test_name=entry.get_name(variables),
-            count=success_count,
+            count=entry.results.llm_load_test_summary.success_count,
         ))
 
     return data
@@ -134,22 +127,14 @@ def generateFinishReasonData(entries, variables):
     data = []
 
     for entry in entries:
-        llm_data = entry.results.llm_load_test_output
+        table = entry.results.llm_load_test_table
 
-        finishReasons = defaultdict(int)
-        for idx, block in enumerate(llm_data):
-            for detail in block.get("details"):
-                if detail["error"]:
-                    reason = "ERROR"
-                else:
-                    reason = detail["response"].get("finishReason", "ERROR")
-                pass
-                finishReasons[reason] += 1
-
-        for reason, count in finishReasons.items():
+        reasons = np.where(table.has_error, "ERROR", table.finish_reason)
+
+        for reason, count in zip(*np.unique(reasons.astype(str), return_counts=True)):
             datum = {}
-            datum["reason"] = reason
-            datum["count"] = count
+            datum["reason"] = str(reason)
+            datum["count"] = int(count)
             datum["test_name"] = entry.get_name(variables).replace(", ", "<br>")
             data.append(datum)
 
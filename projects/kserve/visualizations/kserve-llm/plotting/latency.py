@@ -5,9 +5,8 @@ import datetime
 import math
 import copy
 
-import statistics as stats
-
 import plotly.graph_objs as go
+import numpy as np
 import pandas as pd
 import plotly.express as px
 from dash import html
@@ -16,6 +15,7 @@ import matrix_benchmarking.plotting.table_stats as table_stats
 import matrix_benchmarking.common as common
 
 from . import error_report, report
+from ..store import summary as workload_summary
 
 def register():
     LatencyDistribution()
@@ -39,23 +39,25 @@ class LatencyDistribution():
         cfg__box_plot = cfg.get("box_plot", True)
         cfg__show_text = cfg.get("show_text", True)
 
-        df = pd.DataFrame(generateLatencyDetailsData(entries, variables, only_tokens=cfg__only_tokens, collapse_index=cfg__collapse_index))
+        summaries = generateLatencySummaries(entries, variables, only_tokens=cfg__only_tokens, collapse_index=cfg__collapse_index)
 
-        if df.empty:
+        if not summaries:
             return None, "Not data available ..."
 
-        df = df.sort_values(by=["timestamp"])
         if cfg__only_tokens:
             y_key = "tokens"
         else:
             y_key = "latencyPerToken"
 
         if cfg__box_plot:
+            df = pd.DataFrame(generateLatencyDetailsData(entries, variables, only_tokens=cfg__only_tokens, collapse_index=cfg__collapse_index))
+            df = df.sort_values(by=["timestamp"])
+
             fig = px.box(df, hover_data=df.columns,
                          x="model_name", y=y_key, color="test_name")
             fig.update_yaxes(range=[0, df[y_key].max() * 1.1])
         else:
-            fig = plotCustomComparison(df, x="test_fullname", y=y_key)
+            fig = plotCustomComparison(summaries)
 
         if cfg__only_tokens:
             plot_title = f"Distribution of the number of tokens of the model answers"
@@ -83,14 +85,14 @@ class LatencyDistribution():
                     plot.visible = "legendonly"
 
         msg = []
-        for test_fullname in df.sort_values(by=["test_fullname"]).test_fullname.unique() if cfg__show_text else []:
-            stats_data = df[df.test_fullname == test_fullname][y_key]
+        for test_fullname in sorted(summaries) if cfg__show_text else []:
+            summary = summaries[test_fullname]
 
             msg += [html.H3(test_fullname)]
-            q0 = stats_data.min()
-            q100 = stats_data.max()
-            q1, med, q3 = stats.quantiles(stats_data)
-            q90 = stats.quantiles(stats_data, n=10)[8] # 90th percentile
+            q0 = summary.min
+            q100 = summary.max
+            q1, med, q3 = summary.percentiles[[25, 50, 75]]
+            q90 = summary.percentiles[90] # 90th percentile
             if cfg__only_tokens:
                 label = "the calls contained less than"
                 unit = "tokens"
@@ -111,7 +113,7 @@ class LatencyDistribution():
             msg.append(f"100% of {label} {q100:.0f} {unit} (+ {q100-q90:.0f} {unit}) [max]")
             msg.append(html.Br())
             msg.append(html.Br())
-            msg.append(f"There are {len(stats_data)} recorded calls.")
+            msg.append(f"There are {summary.count} recorded calls.")
             msg.append(html.Br())
             msg.append(f"The median is {med:.0f} {unit}.")
             msg.append(html.Br())
@@ -125,26 +127,18 @@ class LatencyDistribution():
         return fig, msg
 
 
-def plotCustomComparison(df, x, y):
+def plotCustomComparison(summaries):
     fig = go.Figure()
     data_whatxy = defaultdict(dict)
 
-    for x_value in df[x].unique():
-        df_x_value = df[df[x] == x_value]
-        y_min = df_x_value[y].min()
-        y_max = df_x_value[y].max()
-        q1, median, q3 = stats.quantiles(df_x_value[y])
-
-        q90 = stats.quantiles(df_x_value[y], n=10)[8] # 90th percentile
-        q99 = stats.quantiles(df_x_value[y], n=100)[98] # 99th percentile
-
-        data_whatxy["max"][x_value] = y_max
-        data_whatxy["99th percentile"][x_value] = q99
-        data_whatxy["90th percentile"][x_value] = q90
-        data_whatxy["Q3 (75%)"][x_value] = q3
-        data_whatxy["median (50%)"][x_value] = median
-        data_whatxy["Q1 (25%)"][x_value] = q1
-        data_whatxy["min"][x_value] = y_min
+    for x_value, summary in summaries.items():
+        data_whatxy["max"][x_value] = summary.max
+        data_whatxy["99th percentile"][x_value] = summary.percentiles[99]
+        data_whatxy["90th percentile"][x_value] = summary.percentiles[90]
+        data_whatxy["Q3 (75%)"][x_value] = summary.percentiles[75]
+        data_whatxy["median (50%)"][x_value] = summary.percentiles[50]
+        data_whatxy["Q1 (25%)"][x_value] = summary.percentiles[25]
+        data_whatxy["min"][x_value] = summary.min
 
     all_x_values = set()
     all_y_values = []
@@ -162,6 +156,51 @@ def plotCustomComparison(df, x, y):
 
     return fig
 
+def _get_test_fullname(entry, _variables, collapse_index):
+    variables = [v for v in _variables if v != "mode"]
+
+    test_fullname = entry.get_name([v for v in variables if v != "index"] if collapse_index else variables)
+    if "mode" in _variables:
+        test_fullname += f" {entry.settings.mode.title()}"
+
+    return test_fullname
+
+
+def _get_successful_values(table, only_tokens):
+    success = ~table.has_error
+    if only_tokens:
+        return table.generated_tokens[success]
+
+    return table.latency_ns[success] / 1000 / 1000 / table.generated_tokens[success] # in ms/token
+
+
+def generateLatencySummaries(entries, _variables, only_tokens=False, collapse_index=False):
+    summary_key = "tokens" if only_tokens else "latency_per_token"
+
+    entries_by_name = defaultdict(list)
+    for entry in sorted(entries, key=lambda entry: entry.results.test_start_end.start):
+        entries_by_name[_get_test_fullname(entry, _variables, collapse_index)].append(entry)
+
+    summaries = {}
+    for test_fullname, name_entries in entries_by_name.items():
+        if len(name_entries) == 1:
+            # computed at parse time
+            summary = getattr(name_entries[0].results.llm_load_test_summary, summary_key)
+        else:
+            # multiple entries aggregated together, cannot reuse the summaries
+            summary = workload_summary.summarize(np.concatenate([
+                _get_successful_values(entry.results.llm_load_test_table, only_tokens)
+                for entry in name_entries
+            ]))
+
+        if not summary.count:
+            continue
+
+        summaries[test_fullname] = summary
+
+    return summaries
+
+
 def generateLatencyDetailsData(entries, _variables, only_errors=False, test_name_by_error=False, latency_per_token=True, show_errors=False, only_tokens=False, collapse_index=False):
     data = []
 
@@ -174,50 +213,55 @@ def generateLatencyDetailsData(entries, _variables, only_errors=False, test_name
         has_multiple_modes = False
 
     for entry in entries:
-        llm_data = entry.results.llm_load_test_output
-        for idx, block in enumerate(llm_data):
-            for detail in block["details"]:
-                if only_errors and not detail.get("error"):
-                    continue # in this plot, ignore the latency if no error occured
-                if not show_errors and detail.get("error"):
-                    continue
-
-                datum = {}
-
-                datum["timestamp"] = detail["timestamp"]
-
-                generatedTokens = int(detail["response"].get("generatedTokens", 1))
-                datum["tokens"] = generatedTokens
-
-                datum["latencyPerToken"] = detail["latency"] / 1000 / 1000 / generatedTokens # in ms/token
-                datum["latency"] = detail["latency"] / 1000 / 1000
-
-                datum["model_name"] = (f"{entry.settings.model_name}<br>"+entry.get_name([v for v in variables if v not in ("index", "mode", "model_name")]).replace(", ", "<br>")).removesuffix("<br>")
-
-                if has_multiple_modes:
-                    datum["model_name"] += f"<br>{entry.settings.mode.title()}"
-
-                if collapse_index:
-                    datum["test_name"] = entry.get_name(v for v in variables if v != "index").replace(", ", "<br>")
-                elif test_name_by_error:
-                    simplified_error = datum["test_name"] = error_report.simplify_error(detail.get("error"))
-                    if not simplified_error: continue
+        table = entry.results.llm_load_test_table
+
+        mask = np.ones(len(table.latency_ns), dtype=bool)
+        if only_errors:
+            mask &= table.has_error # in this plot, ignore the latency if no error occured
+        if not show_errors:
+            mask &= ~table.has_error
+
+        has_error = table.has_error[mask]
+        error = table.error[mask]
+        generatedTokens = table.generated_tokens[mask]
+        latency = table.latency_ns[mask] / 1000 / 1000
+
+        df = pd.DataFrame(dict(
+            timestamp=table.timestamp[mask],
+            tokens=generatedTokens,
+            latencyPerToken=latency / generatedTokens, # in ms/token
+            latency=latency,
+        ))
+
+        model_name = (f"{entry.settings.model_name}<br>"+entry.get_name([v for v in variables if v not in ("index", "mode", "model_name")]).replace(", ", "<br>")).removesuffix("<br>")
+
+        if has_multiple_modes:
+            model_name += f"<br>{entry.settings.mode.title()}"
+        df["model_name"] = model_name
+
+        keep = None
+        if collapse_index:
+            df["test_name"] = entry.get_name(v for v in variables if v != "index").replace(", ", "<br>")
+        elif test_name_by_error:
+            simplified_error = pd.Series(error, dtype=object).map(error_report.simplify_error)
+            keep = (simplified_error.notna() & (simplified_error != "")).to_numpy()
+            df["test_name"] = simplified_error.to_numpy()
+        else:
+            df["test_name"] = np.where(has_error, "errors", entry.get_name(variables).replace(", ", "<br>"))
+            df.loc[has_error, "latency"] = -1
 
-                elif detail.get("error"):
-                    datum["test_name"] = "errors"
-                    datum["latency"] = -1
-                else:
-                    datum["test_name"] = entry.get_name(variables).replace(", ", "<br>")
+        df["error"] = np.where(has_error, error, "no error")
+        if keep is not None:
+            df = df[keep]
 
-                datum["error"] = detail.get("error", "no error")
+        df["test_fullname"] = _get_test_fullname(entry, _variables, collapse_index)
 
-                datum["test_fullname"] = entry.get_name([v for v in variables if v != "index"] if collapse_index else variables)
-                if has_multiple_modes:
-                    datum["test_fullname"] += f" {entry.settings.mode.title()}"
+        data.append(df)
 
-                data.append(datum)
+    if not data:
+        return pd.DataFrame()
 
-    return data
+    return pd.concat(data, ignore_index=True)
 
 
 class LatencyDetails():
@@ -2,13 +2,9 @@ from collections import defaultdict
 import re
 import logging
 import datetime
-import math
 import copy
 
-import statistics as stats
-
 import plotly.subplots
-import plotly.graph_objs as go
 import pandas as pd
 import plotly.express as px
 from dash import html
@@ -16,21 +12,27 @@ from dash import html
 import matrix_benchmarking.plotting.table_stats as table_stats
 import matrix_benchmarking.common as common
 
+import topsail.visualizations.lts_history_plot as topsail_lts_history_plot
+
 from . import error_report, report
+from ..store import summary as workload_summary
+from ..store import lts as workload_lts
 
 def register():
     LtsThrougput()
     LtsLatencyPerToken()
     LtsModelLoadTime()
+    topsail_lts_history_plot.LtsKpiHistory(workload_lts.HISTORY_WORKLOAD, default_kpi="throughput",
+                                           higher_is_better_kpis=("throughput",))
 
 
-def generateTimePerOutputTokenStats(time_per_output_token):
+def generateTimePerOutputTokenStats(tpot_summary):
     stats_dict = {}
-    stats_dict["tpot.min"] = min(time_per_output_token)
-    stats_dict["tpot.max"] = max(time_per_output_token)
-    stats_dict["tpot.q1"], stats_dict["tpot.med"], stats_dict["tpot.q3"] = stats.quantiles(time_per_output_token)
-    stats_dict["tpot.90%"] = stats.quantiles(time_per_output_token, n=10)[8] # 90th percentile
-    stats_dict["tpot.95%"] = stats.quantiles(time_per_output_token, n=20)[18] # 95th percentile
+    stats_dict["tpot.min"] = tpot_summary.min
+    stats_dict["tpot.max"] = tpot_summary.max
+    stats_dict["tpot.q1"], stats_dict["tpot.med"], stats_dict["tpot.q3"] = tpot_summary.percentiles[[25, 50, 75]]
+    stats_dict["tpot.90%"] = tpot_summary.percentiles[90] # 90th percentile
+    stats_dict["tpot.95%"] = tpot_summary.percentiles[95] # 95th percentile
 
     return stats_dict
 
@@ -41,7 +43,14 @@ def generateLtsData(entries, _variables):
         datum = dict(name=entry.get_name(_variables),)
 
         datum["throughput"] = entry.results.lts.results.throughput
-        datum |= generateTimePerOutputTokenStats(entry.results.lts.results.time_per_output_token)
+
+        try:
+            tpot_summary = entry.results.llm_load_test_summary.latency_per_token
+        except AttributeError:
+            # not computed at parse time (eg, LTS entry)
+            tpot_summary = workload_summary.summarize(entry.results.lts.results.time_per_output_token)
+
+        datum |= generateTimePerOutputTokenStats(tpot_summary)
         try:
             datum["model_load_time"] = entry.results.lts.results.model_load_duration
         except AttributeError:
@@ -73,7 +82,7 @@ class LtsThrougput():
         fig.data[0].name = "Throughput"
         fig.data[0].showlegend = True
 
-        list(map(fig.add_trace, get_regression_lanes("throughput", df.name, df.throughput, default_op="max")))
+        list(map(fig.add_trace, topsail_lts_history_plot.get_regression_lanes("throughput", df.name, df.throughput, default_op="max")))
 
         fig.update_layout(title=f"Throughput the load tests", title_x=0.5,)
         fig.update_yaxes(title=f"Throughput (in tokens/s) ❯")
@@ -104,7 +113,7 @@ class LtsLatencyPerToken():
         fig.data[0].name = "median TPOT"
         fig.data[0].showlegend = True
 
-        list(map(fig.add_trace, get_regression_lanes("median TPOT", df.name, df["tpot.med"], default_op="min")))
+        list(map(fig.add_trace, topsail_lts_history_plot.get_regression_lanes("median TPOT", df.name, df["tpot.med"], default_op="min")))
 
         fig.update_layout(title=f"Time Per Output Token of the load tests", title_x=0.5,)
         fig.update_yaxes(title=f"❮ Time Per Output Token (in ms/token)")
@@ -135,44 +144,10 @@ class LtsModelLoadTime():
         fig.data[0].name = "Model load time"
         fig.data[0].showlegend = True
 
-        list(map(fig.add_trace, get_regression_lanes("model load time", df.name, df.model_load_time, default_op="min")))
+        list(map(fig.add_trace, topsail_lts_history_plot.get_regression_lanes("model load time", df.name, df.model_load_time, default_op="min")))
 
         fig.update_layout(title=f"Model load times", title_x=0.5,)
         fig.update_yaxes(title=f"❮ Model Load Time (in s)")
         fig.update_xaxes(title=f"")
 
         return fig, ""
-
-
-def find_reference_point(df_name, df_colname, default_op):
-    for name, value in zip(df_name, df_colname):
-        if name.endswith("-GA"):
-            return "GA", value
-
-    return default_op, getattr(df_colname, default_op)()
-
-
-def get_lane(x_col, ref_value, pct, name):
-    if ref_value == "max": import pdb;pdb.set_trace()
-    new_value = ref_value * (1 + pct/100)
-
-    return go.Scatter(x=x_col,
-                      y=[new_value] * len(x_col),
-                      name=name,
-                      mode="lines",
-                      line_dash="dot",
-                      )
-
-def get_regression_lanes(y_col_name, x_col, y_col, default_op):
-    ref_name, ref_value = find_reference_point(x_col, y_col, default_op)
-
-    diff_pct = [-round((1 - y/ref_value)*100) for y in y_col if not math.isnan(y)]
-
-    ROUND = 5
-    round_pcts = set([0, 5, -5] + [ROUND * round(pct/ROUND) for pct in diff_pct])
-
-    for pct in sorted(round_pcts):
-        name = f"{ref_name} {y_col_name}" if pct == 0 else \
-            f"{pct:+d}% of the {ref_name} {y_col_name}"
-
-        yield get_lane(x_col, ref_value, pct, name)
@@ -34,8 +34,7 @@ def generateThroughputData(entries, _variables):
         has_multiple_modes = False
 
     for entry in entries:
-        llm_data = entry.results.llm_load_test_output
-        generatedTokens = 0
+        table = entry.results.llm_load_test_table
 
         datum = {}
         datum["model_name"] = (f"{entry.settings.model_name}<br>"+entry.get_name([v for v in variables if v not in ("index", "mode", "model_name")]).replace(", ", "<br>")).removesuffix("<br>")
@@ -49,13 +48,9 @@ def generateThroughputData(entries, _variables):
         else:
             datum["test_name:sort_index"] = datum["test_name"]
 
-        calls_count = 0
-        latency_s = 0.0
-        for idx, block in enumerate(llm_data):
-            for detail in block["details"]:
-                generatedTokens += int(detail["response"].get("generatedTokens", 1))
-                calls_count += 1
-                latency_s += detail["latency"] / 1000 / 1000 / 1000
+        generatedTokens = int(table.generated_tokens.sum())
+        calls_count = len(table.latency_ns)
+        latency_s = table.latency_ns.sum() / 1000 / 1000 / 1000
 
         duration = (entry.results.test_start_end.end-entry.results.test_start_end.start).total_seconds()
         datum["duration"] = int(duration)
@@ -67,7 +62,7 @@ def generateThroughputData(entries, _variables):
         except AttributeError:
             datum["vusers"] = entry.results.test_config.get("tests.e2e.llm_load_test.threads")
 
-        datum["avg_latency"] = latency_s / calls_count
+        datum["avg_latency"] = float(latency_s / calls_count)
 
         data.append(datum)
 
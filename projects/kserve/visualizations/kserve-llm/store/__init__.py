@@ -1,20 +1,24 @@
 import pathlib
 import logging
 import types
-import pickle
-import fnmatch
 import os
 import json
 
 import matrix_benchmarking.store as store
 import matrix_benchmarking.store.simple as store_simple
 
+import topsail.visualizations.store_files as topsail_store_files
+import topsail.visualizations.result_cache as topsail_result_cache
+
 from . import parsers
 from . import lts_parser
 
 CACHE_FILENAME = "cache.pickle"
 
 IMPORTANT_FILES = parsers.IMPORTANT_FILES
+IMPORTANT_FILES_MATCHER = topsail_store_files.ImportantFilesMatcher(IMPORTANT_FILES)
+
+PARSER_VERSION = parsers.PARSER_VERSION
 
 from ..models import lts as models_lts
 
@@ -25,16 +29,7 @@ def is_mandatory_file(filename):
 
 
 def is_important_file(filename):
-    if str(filename) in IMPORTANT_FILES:
-        return True
-
-    for important_file in IMPORTANT_FILES:
-        if "*" not in important_file: continue
-
-        if fnmatch.filter([str(filename)], important_file):
-            return True
-
-    return False
+    return IMPORTANT_FILES_MATCHER.match(filename)
 
 
 def is_cache_file(filename):
@@ -45,10 +40,10 @@ def resolve_artifact_dirnames(dirname, artifact_dirnames):
     artifact_paths = types.SimpleNamespace()
     for artifact_dirname, unresolved_dirname in artifact_dirnames.__dict__.items():
         direct_resolution = dirname / unresolved_dirname
-        resolutions = list(dirname.glob(unresolved_dirname))
+        resolutions = parsers.dir_listing.glob(unresolved_dirname)
         resolved_dir = None
 
-        if direct_resolution.exists():
+        if parsers.dir_listing.exists(unresolved_dirname):
             # all good
             resolved_dir = direct_resolution.relative_to(dirname)
         elif not resolutions:
@@ -81,11 +76,27 @@ def _rewrite_settings(settings_dict):
 
 
 def load_cache(dirname):
-    with open(dirname / CACHE_FILENAME, "rb") as f:
-        return pickle.load(f)
+    try:
+        results = topsail_result_cache.load(dirname / CACHE_FILENAME)
+
+        cache_version = getattr(results, "parser_version", None)
+        if cache_version != PARSER_VERSION:
+            raise ValueError(cache_version)
+
+    except ValueError as e:
+        cache_version = e.args[0]
+        if not cache_version:
+            logging.warning(f"Cache file '{dirname / CACHE_FILENAME}' does not have a version, ignoring.")
+        else:
+            logging.warning(f"Cache file '{dirname / CACHE_FILENAME}' version '{cache_version}' does not match the parser version '{PARSER_VERSION}', ignoring.")
+
+        results = None
+
+    return results
 
 
 def _parse_directory(fn_add_to_matrix, dirname, import_settings):
+    parsers.dir_listing = topsail_store_files.DirectoryListing(dirname)
     parsers.artifact_paths = resolve_artifact_dirnames(dirname, parsers.artifact_dirnames)
 
     ignore_cache = os.environ.get("MATBENCH_STORE_IGNORE_CACHE", False) in ("yes", "y", "true", "True")
@@ -108,6 +119,8 @@ def _parse_directory(fn_add_to_matrix, dirname, import_settings):
 
     results = types.SimpleNamespace()
 
+    results.parser_version = PARSER_VERSION
+
     parsers._parse_always(results, dirname, import_settings)
     parsers._parse_once(results, dirname)
 
@@ -124,13 +137,12 @@ def _parse_directory(fn_add_to_matrix, dirname, import_settings):
         ), f, indent=4)
         print("", file=f)
 
-    with open(dirname / CACHE_FILENAME, "wb") as f:
-        get_config = results.test_config.get
-        results.test_config.get = None
+    get_config = results.test_config.get
+    results.test_config.get = None
 
-        pickle.dump(results, f)
+    topsail_result_cache.dump(dirname / CACHE_FILENAME, results)
 
-        results.test_config.get = get_config
+    results.test_config.get = get_config
 
     logging.info("parsing done :)")
 
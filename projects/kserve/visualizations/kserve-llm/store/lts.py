@@ -1,30 +1,28 @@
 import logging
-import json
-import functools
 
 import matrix_benchmarking.common as common
-from matrix_benchmarking.parse import json_dumper
+
+import topsail.visualizations.lts_payload as topsail_lts_payload
+import topsail.visualizations.lts_history as topsail_lts_history
 
 from .. import models
 from ..models import lts as models_lts
-from . import lts_parser
+from . import summary as workload_summary
 
-def validate_lts_payload(payload, import_settings, reraise=False):
-    try:
-        json_lts = json.dumps(payload, indent=4, default=functools.partial(json_dumper, strict=False))
-    except ValueError as e:
-        logging.error(f"Couldn't dump the lts_payload into JSON :/ {e}")
+HISTORY_WORKLOAD = "kserve-llm"
 
-        if reraise:
-            raise
+# id(payload) --> payload, for the payloads already validated. Keeping
+# the payload reference keeps its id valid. The payloads aren't
+# modified once generated.
+_validated_payloads = {}
 
-        return False
 
-    parsed_lts = json.loads(json_lts)
-    try:
-        models.lts.Payload.parse_obj(parsed_lts)
+def validate_lts_payload(payload, import_settings, reraise=False):
+    if _validated_payloads.get(id(payload)) is payload:
         return True
 
+    try:
+        topsail_lts_payload.validate(models.lts.Payload, payload)
     except Exception as e:
         logging.error(f"lts-error: Failed to validate the generated LTS payload against the model")
         logging.error(f"lts-error: entry settings: {import_settings}")
@@ -36,15 +34,42 @@ def validate_lts_payload(payload, import_settings, reraise=False):
 
         return False
 
+    _validated_payloads[id(payload)] = payload
+
+    return True
+
+
+def get_lts_kpis(lts_payload):
+    results = lts_payload.results
+
+    kpis = dict(throughput=results.throughput,
+                model_load_duration=getattr(results, "model_load_duration", None))
+
+    tpot_summary = workload_summary.summarize(results.time_per_output_token)
+    if tpot_summary.count:
+        for name, percentile in ("min", 0), ("q1", 25), ("med", 50), ("q3", 75), ("90%", 90), ("95%", 95), ("max", 100):
+            kpis[f"tpot.{name}"] = tpot_summary.percentiles[percentile]
+
+    return kpis
+
 
 def build_lts_payloads():
-    for entry in common.Matrix.processed_map.values():
-        results = entry.results
+    with topsail_lts_history.open_history() as history:
+        for entry in common.Matrix.processed_map.values():
+            lts_payload = entry.results.lts
+
+            # already validated during the parsing, unless the results came from the cache file
+            validate_lts_payload(lts_payload, entry.import_settings, reraise=True)
+
+            if history:
+                history.append(HISTORY_WORKLOAD, lts_payload.metadata.start, lts_payload.metadata.end,
+                               lts_payload.metadata.settings, lts_payload.metadata.presets,
+                               get_lts_kpis(lts_payload))
 
-        lts_results = results.lts
-        lts_payload = lts_parser.generate_lts_payload(entry.results, lts_results, entry.import_settings, must_validate=True)
+            yield lts_payload, lts_payload.metadata.start, lts_payload.metadata.end
 
-        yield lts_payload, lts_payload.metadata.start, lts_payload.metadata.end
+            # the payloads are written one at a time, they don't need to be kept alive anymore
+            _validated_payloads.pop(id(lts_payload), None)
 
 
 def _parse_lts_dir(add_to_matrix, dirname, import_settings):
@@ -31,15 +31,8 @@ def generate_lts_payload(results, lts_results, import_settings, must_validate=Fa
 
 
 def _generate_throughput(results):
-    generated_tokens = 0
-
-    llm_data = results.llm_load_test_output
-    for idx, block in enumerate(llm_data):
-        for detail in block["details"]:
-            if detail.get("error"):
-                continue # in this plot, ignore the latency if an error occured
-
-            generated_tokens += int(detail["response"]["generatedTokens"])
+    # the tokens of the calls that failed are not part of the summary
+    generated_tokens = int(results.llm_load_test_summary.tokens.sum or 0)
 
     duration_s = (results.test_start_end.end - results.test_start_end.start).total_seconds()
 
@@ -47,19 +40,13 @@ def _generate_throughput(results):
 
 
 def _generate_time_per_output_token(results):
-    time_per_output_token = []
-
-    llm_data = results.llm_load_test_output
-    for idx, block in enumerate(llm_data):
-        for detail in block["details"]:
-            if detail.get("error"):
-                continue # in this plot, ignore the latency if an error occured
+    table = results.llm_load_test_table
 
-            generated_tokens = int(detail["response"]["generatedTokens"])
-            latency_ms = detail["latency"] / 1000 / 1000
-            time_per_output_token.append(latency_ms / generated_tokens)
+    # ignore the latency of the calls that failed
+    success = ~table.has_error
+    latency_ms = table.latency_ns[success] / 1000 / 1000
 
-    return time_per_output_token
+    return (latency_ms / table.generated_tokens[success]).tolist()
 
 
 def _generate_time_to_first_token(results):
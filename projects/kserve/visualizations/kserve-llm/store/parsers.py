@@ -5,18 +5,23 @@ import yaml
 import os
 import json
 import datetime
-from collections import defaultdict
 import dateutil.parser
 
 import jsonpath_ng
+import numpy as np
 
 import matrix_benchmarking.cli_args as cli_args
 import matrix_benchmarking.store.prom_db as store_prom_db
 
+import topsail.visualizations.log_scanner as topsail_log_scanner
+import topsail.visualizations.parse_memo as topsail_parse_memo
+
 from . import prom as workload_prom
+from . import summary as workload_summary
 
 
 register_important_file = None # will be when importing store/__init__.py
+dir_listing = None # store._parse_directory will set it to the DirectoryListing of the results directory
 
 K8S_TIME_FMT = "%Y-%m-%dT%H:%M:%SZ"
 SHELL_DATE_TIME_FMT = "%a %b %d %H:%M:%S %Z %Y"
@@ -35,8 +40,18 @@ IMPORTANT_FILES = [
     f"{artifact_dirnames.KSERVE_CAPTURE_STATE}/ocp_version.yaml",
     f"{artifact_dirnames.KSERVE_CAPTURE_STATE}/rhods.createdAt",
     f"{artifact_dirnames.KSERVE_CAPTURE_STATE}/rhods.version",
+    f"{artifact_dirnames.KSERVE_CAPTURE_STATE}/logs/*.log*",
 ]
 
+# bump when the content of the results changes, to invalidate the cache files
+PARSER_VERSION = "2026-10-19"
+
+PREDICTOR_LOG_PATTERNS = {
+    "errors": topsail_log_scanner.severity("ERROR"),
+    "DESTROY-THRD": topsail_log_scanner.channel("DESTROY-THRD"),
+    "ABORT-ACTION": topsail_log_scanner.channel("ABORT-ACTION"),
+}
+
 def ignore_file_not_found(fn):
     def decorator(*args, **kwargs):
         try:
@@ -57,6 +72,8 @@ def _parse_always(results, dirname, import_settings):
 
 def _parse_once(results, dirname):
     results.llm_load_test_output = _parse_llm_load_test_output(dirname)
+    results.llm_load_test_table = _parse_llm_load_test_table(results.llm_load_test_output)
+    results.llm_load_test_summary = _parse_llm_load_test_summary(results.llm_load_test_table)
     results.predictor_logs = _parse_predictor_logs(dirname)
     results.predictor_pod = _parse_predictor_pod(dirname)
     results.test_start_end = _parse_test_start_end(dirname, results.llm_load_test_output)
@@ -119,8 +136,7 @@ def _parse_test_config(dirname):
     filename = pathlib.Path("config.yaml")
     test_config.filepath = dirname / filename
 
-    with open(register_important_file(dirname, filename)) as f:
-        yaml_file = test_config.yaml_file = yaml.safe_load(f)
+    yaml_file = test_config.yaml_file = topsail_parse_memo.load_yaml(register_important_file(dirname, filename))
 
     if not yaml_file:
         logging.error(f"Config file '{filename}' is empty ...")
@@ -147,7 +163,7 @@ def _parse_test_config(dirname):
 @ignore_file_not_found
 def _parse_llm_load_test_output(dirname):
     llm_load_test_output = []
-    for llm_output_file in (dirname / artifact_paths.LLM_LOAD_TEST_RUN_DIR / "output").glob("ghz-multiplexed-results-*.json"):
+    for llm_output_file in dir_listing.glob("ghz-multiplexed-results-*.json", artifact_paths.LLM_LOAD_TEST_RUN_DIR / "output"):
         register_important_file(dirname, llm_output_file.relative_to(dirname))
 
         with open(llm_output_file) as f:
@@ -158,6 +174,59 @@ def _parse_llm_load_test_output(dirname):
     return llm_load_test_output
 
 
+def _parse_llm_load_test_table(llm_load_test_output):
+    # one row per llm-load-test call, one array per column
+
+    block_index = []
+    timestamp = []
+    latency_ns = []
+    generated_tokens = []
+    finish_reason = []
+    error = []
+
+    for idx, block in enumerate(llm_load_test_output or []):
+        for detail in block["details"]:
+            response = detail.get("response") or {}
+
+            block_index.append(idx)
+            timestamp.append(dateutil.parser.isoparse(detail["timestamp"])
+                             .astimezone(datetime.timezone.utc).replace(tzinfo=None))
+            latency_ns.append(detail["latency"])
+            generated_tokens.append(int(response.get("generatedTokens", 1)))
+            finish_reason.append(response.get("finishReason", "ERROR"))
+            error.append(detail.get("error") or "")
+
+    llm_load_test_table = types.SimpleNamespace()
+    llm_load_test_table.block_index = np.array(block_index, dtype=np.int32)
+    llm_load_test_table.timestamp = np.array(timestamp, dtype="datetime64[us]") # UTC
+    llm_load_test_table.latency_ns = np.array(latency_ns, dtype=np.int64)
+    llm_load_test_table.generated_tokens = np.array(generated_tokens, dtype=np.int64)
+    llm_load_test_table.finish_reason = np.array(finish_reason, dtype=object)
+    llm_load_test_table.error = np.array(error, dtype=object)
+    llm_load_test_table.has_error = llm_load_test_table.error != ""
+
+    return llm_load_test_table
+
+
+def _parse_llm_load_test_summary(llm_load_test_table):
+    # computed once here, shared by the plots, the reports and the LTS payload
+
+    llm_load_test_summary = types.SimpleNamespace()
+
+    success = ~llm_load_test_table.has_error
+    latency_ms = llm_load_test_table.latency_ns[success] / 1000 / 1000
+    generated_tokens = llm_load_test_table.generated_tokens[success]
+
+    llm_load_test_summary.success_count = int(success.sum())
+    llm_load_test_summary.error_count = int(llm_load_test_table.has_error.sum())
+
+    llm_load_test_summary.latency = workload_summary.summarize(latency_ms) # in ms
+    llm_load_test_summary.latency_per_token = workload_summary.summarize(latency_ms / generated_tokens) # in ms/token
+    llm_load_test_summary.tokens = workload_summary.summarize(generated_tokens)
+
+    return llm_load_test_summary
+
+
 @ignore_file_not_found
 def _parse_predictor_pod(dirname):
     if not artifact_paths.KSERVE_CAPTURE_STATE:
@@ -215,23 +284,10 @@ def _parse_predictor_logs(dirname):
 
     kserve_capture_state_dir = artifact_paths.KSERVE_CAPTURE_STATE[-1] if isinstance(artifact_paths.KSERVE_CAPTURE_STATE, list) else artifact_paths.KSERVE_CAPTURE_STATE
 
-    predictor_logs = types.SimpleNamespace()
-    predictor_logs.distribution = defaultdict(int)
-    predictor_logs.line_count = 0
-
-    for log_file in kserve_capture_state_dir.glob("logs/*.log"):
-
-        for line in open(log_file).readlines():
-            predictor_logs.line_count += 1
-
-            if '"severity":"ERROR"' in line:
-                predictor_logs.distribution["errors"] += 1
-            if '"channel": "DESTROY-THRD"' in line:
-                predictor_logs.distribution["DESTROY-THRD"] += 1
-            if '"channel": "ABORT-ACTION"' in line:
-                predictor_logs.distribution["ABORT-ACTION"] += 1
+    log_files = [register_important_file(dirname, log_file.relative_to(dirname))
+                 for log_file in dir_listing.glob("logs/*.log*", kserve_capture_state_dir)]
 
-    return predictor_logs
+    return topsail_log_scanner.scan_logs(log_files, PREDICTOR_LOG_PATTERNS)
 
 
 def _parse_test_start_end(dirname, llm_load_test_output):
@@ -259,8 +315,7 @@ def _parse_ocp_version(dirname):
 
     kserve_capture_state_dir = artifact_paths.KSERVE_CAPTURE_STATE[0] if isinstance(artifact_paths.KSERVE_CAPTURE_STATE, list) else artifact_paths.KSERVE_CAPTURE_STATE
 
-    with open(register_important_file(dirname, kserve_capture_state_dir / "ocp_version.yaml")) as f:
-        sutest_ocp_version_yaml = yaml.safe_load(f)
+    sutest_ocp_version_yaml = topsail_parse_memo.load_yaml(register_important_file(dirname, kserve_capture_state_dir / "ocp_version.yaml"))
 
     return sutest_ocp_version_yaml["openshiftVersion"]
 
@@ -274,8 +329,7 @@ def _parse_rhods_info(dirname):
     rhods_info = types.SimpleNamespace()
     kserve_capture_state_dir = artifact_paths.KSERVE_CAPTURE_STATE[0] if isinstance(artifact_paths.KSERVE_CAPTURE_STATE, list) else artifact_paths.KSERVE_CAPTURE_STATE
 
-    with open(register_important_file(dirname, kserve_capture_state_dir / "rhods.version")) as f:
-        rhods_info.version = f.read().strip()
+    rhods_info.version = topsail_parse_memo.read_text(register_important_file(dirname, kserve_capture_state_dir / "rhods.version"))
 
     with open(register_important_file(dirname, kserve_capture_state_dir / "rhods.createdAt")) as f:
         rhods_info.createdAt_raw = f.read().strip()
@@ -0,0 +1,42 @@
+import types
+
+import numpy as np
+
+def quantiles(values, n=4):
+    # same cut points as statistics.quantiles(values, n=n) (exclusive method),
+    # computed on the whole array at once
+
+    data = np.sort(np.asarray(values, dtype=float))
+    ld = len(data)
+    if ld == 1:
+        return np.repeat(data, n - 1)
+
+    m = ld + 1
+    i = np.arange(1, n)
+    j = np.clip(i * m // n, 1, ld - 1)
+    delta = i * m - j * n
+
+    return (data[j - 1] * (n - delta) + data[j] * delta) / n
+
+
+def summarize(values):
+    values = np.asarray(values, dtype=float)
+
+    summary = types.SimpleNamespace()
+    summary.count = len(values)
+
+    if not summary.count:
+        summary.min = summary.max = summary.mean = summary.sum = None
+        summary.percentiles = None
+
+        return summary
+
+    summary.min = float(values.min())
+    summary.max = float(values.max())
+    summary.sum = float(values.sum())
+    summary.mean = summary.sum / summary.count
+
+    # percentiles[p] is the p-th percentile, percentiles[0] is the min and percentiles[100] the max
+    summary.percentiles = np.concatenate(([summary.min], quantiles(values, n=100), [summary.max]))
+
+    return summary
@@ -1,14 +1,16 @@
 import pathlib
 import logging
 import types
-import pickle
-import fnmatch
 import os
 
 import matrix_benchmarking.cli_args as cli_args
 import matrix_benchmarking.store as store
 import matrix_benchmarking.store.simple as store_simple
 
+import topsail.visualizations.prom_metrics as topsail_prom_metrics
+import topsail.visualizations.store_files as topsail_store_files
+import topsail.visualizations.result_cache as topsail_result_cache
+
 from . import parsers
 from . import lts
 from . import lts_parser
@@ -16,6 +18,7 @@ from . import lts_parser
 CACHE_FILENAME = "kserve-prom.cache.pickle"
 
 IMPORTANT_FILES = parsers.IMPORTANT_FILES
+IMPORTANT_FILES_MATCHER = topsail_store_files.ImportantFilesMatcher(IMPORTANT_FILES)
 
 PROM_BASE_DIR_FILE = ".matbench_prom_db_dir"
 
@@ -28,16 +31,7 @@ def is_mandatory_file(filename):
 
 
 def is_important_file(filename):
-    if str(filename) in IMPORTANT_FILES:
-        return True
-
-    for important_file in IMPORTANT_FILES:
-        if "*" not in important_file: continue
-
-        if fnmatch.filter([str(filename)], important_file):
-            return True
-
-    return False
+    return IMPORTANT_FILES_MATCHER.match(filename)
 
 
 def is_cache_file(filename):
@@ -48,10 +42,10 @@ def resolve_artifact_dirnames(dirname, artifact_dirnames):
     artifact_paths = types.SimpleNamespace()
     for artifact_dirname, unresolved_dirname in artifact_dirnames.__dict__.items():
         direct_resolution = dirname / unresolved_dirname
-        resolutions = list(dirname.glob(unresolved_dirname))
+        resolutions = parsers.dir_listing.glob(unresolved_dirname)
         resolved_dir = None
 
-        if direct_resolution.exists():
+        if parsers.dir_listing.exists(unresolved_dirname):
             # all good
             resolved_dir = direct_resolution
         elif not resolutions:
@@ -86,13 +80,13 @@ def _rewrite_settings(settings_dict):
 
 def load_cache(dirname):
     try:
-        with open(dirname / CACHE_FILENAME, "rb") as f:
-            return pickle.load(f)
+        return topsail_result_cache.load(dirname / CACHE_FILENAME)
     except EOFError as e:
         logging.warning(f"Reloading the cache '{dirname/CACHE_FILENAME}' failed :/ EOFError: {e}")
 
 
 def _parse_directory(fn_add_to_matrix, dirname, import_settings):
+    parsers.dir_listing = topsail_store_files.DirectoryListing(dirname)
     parsers.artifact_paths = resolve_artifact_dirnames(dirname, parsers.artifact_dirnames)
 
     ignore_cache = os.environ.get("MATBENCH_STORE_IGNORE_CACHE", False) in ("yes", "y", "true", "True")
@@ -107,6 +101,7 @@ def _parse_directory(fn_add_to_matrix, dirname, import_settings):
 
 
     if results:
+        topsail_prom_metrics.bind_metrics(results.metrics, dirname)
         parsers._parse_always(results, dirname, import_settings)
 
         fn_add_to_matrix(results)
@@ -126,13 +121,12 @@ def _parse_directory(fn_add_to_matrix, dirname, import_settings):
 
     fn_add_to_matrix(results)
 
-    with open(dirname / CACHE_FILENAME, "wb") as f:
-        get_config = results.test_config.get
-        results.test_config.get = None
+    get_config = results.test_config.get
+    results.test_config.get = None
 
-        pickle.dump(results, f)
+    topsail_result_cache.dump(dirname / CACHE_FILENAME, results)
 
-        results.test_config.get = get_config
+    results.test_config.get = get_config
 
     logging.info("parsing done :)")
 
@@ -1,7 +1,6 @@
 import types
 import pathlib
 import logging
-import yaml
 import os
 import json
 import datetime
@@ -10,11 +9,14 @@ import dateutil.parser
 import jsonpath_ng
 
 import matrix_benchmarking.cli_args as cli_args
-import matrix_benchmarking.store.prom_db as store_prom_db
+
+import topsail.visualizations.prom_metrics as topsail_prom_metrics
+import topsail.visualizations.parse_memo as topsail_parse_memo
 
 from . import prom as workload_prom
 
 register_important_file = None # will be when importing store/__init__.py
+dir_listing = None # store._parse_directory will set it to the DirectoryListing of the results directory
 
 K8S_TIME_FMT = "%Y-%m-%dT%H:%M:%SZ"
 SHELL_DATE_TIME_FMT = "%a %b %d %H:%M:%S %Z %Y"
@@ -29,6 +31,7 @@ IMPORTANT_FILES = [
     f"{artifact_dirnames.CLUSTER_DUMP_PROM_DB_DIR}/nodes.json",
 
     f"{artifact_dirnames.CLUSTER_DUMP_PROM_DB_UWM_DIR}/prometheus.t*",
+    "prom_metrics/*/*",
     f"*/test_start_end.json", f"test_start_end.json",
     "config.yaml",
 ]
@@ -70,28 +73,32 @@ def _extract_metrics(dirname):
         "uwm": (str(artifact_paths.CLUSTER_DUMP_PROM_DB_UWM_DIR / "prometheus.t*"), []),
     }
 
-    metrics = {}
+    prom_tarballs = {}
     for name, (tarball_glob, metric) in METRICS.items():
         try:
-            prom_tarball = list(dirname.glob(tarball_glob))[0]
+            prom_tarball = dir_listing.glob(tarball_glob)[0]
         except IndexError:
             logging.warning(f"No {tarball_glob} in '{dirname}'.")
             continue
 
         register_important_file(dirname, prom_tarball.relative_to(dirname))
-        metrics[name] = store_prom_db.extract_metrics(prom_tarball, metric, dirname)
+        prom_tarballs[name] = (prom_tarball, metric)
 
-    return metrics
+    return topsail_prom_metrics.extract_metrics(prom_tarballs, dirname)
 
 
 @ignore_file_not_found
 def _parse_nodes_info(dirname, sutest_cluster=True):
-    nodes_info = {}
-
     filename = artifact_paths.CLUSTER_DUMP_PROM_DB_DIR / "nodes.json"
 
-    with open(register_important_file(dirname, filename)) as f:
-        nodeList = json.load(f)
+    # parsed once per nodes.json content, the runs of the matrix share the node-info objects
+    return topsail_parse_memo.parse_file(register_important_file(dirname, filename), _parse_nodes_list, sutest_cluster)
+
+
+def _parse_nodes_list(content, sutest_cluster):
+    nodes_info = {}
+
+    nodeList = json.loads(content)
 
     for node in nodeList["items"]:
         node_name = node["metadata"]["name"]
@@ -176,8 +183,7 @@ def _parse_test_config(dirname):
     filename = pathlib.Path("config.yaml")
     test_config.filepath = dirname / filename
 
-    with open(register_important_file(dirname, filename)) as f:
-        yaml_file = test_config.yaml_file = yaml.safe_load(f)
+    yaml_file = test_config.yaml_file = topsail_parse_memo.load_yaml(register_important_file(dirname, filename))
 
     if not yaml_file:
         logging.error(f"Config file '{filename}' is empty ...")
@@ -1,3 +1,6 @@
+import topsail.visualizations.figure_export as topsail_figure_export
+import topsail.visualizations.plot_memo as topsail_plot_memo
+
 from . import error_report
 from ..store import prom
 from . import prom_report
@@ -8,6 +11,8 @@ from . import conditions
 from . import load_time
 
 def register():
+    topsail_figure_export.init()
+
     error_report.register()
     report.register()
     prom.register()
@@ -17,3 +22,5 @@ def register():
     grpc_distribution.register()
     conditions.register()
     load_time.register()
+
+    topsail_plot_memo.init()
@@ -2,6 +2,8 @@ import logging
 
 import matrix_benchmarking.common as common
 
+import topsail.visualizations.prom_metrics as topsail_prom_metrics
+
 from .. import models
 from ..models import lts as models_lts
 
@@ -45,7 +47,7 @@ def _parse_lts_dir(add_to_matrix, dirname, import_settings):
 
 
 def _gather_prom_metrics(metrics, model) -> dict:
-    data = {metric_name: metrics[metric_name]
+    data = {metric_name: topsail_prom_metrics.to_prometheus_values(metrics[metric_name])
             for metric_name in model.schema()["properties"].keys()}
 
     return model(**data)
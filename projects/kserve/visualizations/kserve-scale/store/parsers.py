@@ -11,7 +11,10 @@ import urllib.parse
 import jsonpath_ng
 
 import matrix_benchmarking.cli_args as cli_args
-import matrix_benchmarking.store.prom_db as store_prom_db
+
+import topsail.visualizations.prom_db as topsail_prom_db
+import topsail.visualizations.records as topsail_records
+import topsail.visualizations.parse_memo as topsail_parse_memo
 
 from . import prom as workload_prom
 
@@ -28,6 +31,7 @@ artifact_dirnames.LOCAL_CI_RUN_MULTI_DIR = "*__local_ci__run_multi"
 artifact_dirnames.KSERVE_CAPTURE_OPERATORS_STATE_DIR = "*__kserve__capture_operators_state"
 
 artifact_paths = None # store._parse_directory will turn it into a {str: pathlib.Path} dict base on ^^^
+dir_listing = None # store._parse_directory will set it to the DirectoryListing of the results directory
 
 IMPORTANT_FILES = [
     "config.yaml",
@@ -138,8 +142,7 @@ def _parse_test_config(dirname):
     filename = pathlib.Path("config.yaml")
     test_config.filepath = dirname / filename
 
-    with open(register_important_file(dirname, filename)) as f:
-        yaml_file = test_config.yaml_file = yaml.safe_load(f)
+    yaml_file = test_config.yaml_file = topsail_parse_memo.load_yaml(register_important_file(dirname, filename))
 
     if not yaml_file:
         logging.error("Config file '{filename}' is empty ...")
@@ -165,12 +168,16 @@ def _parse_test_config(dirname):
 
 @ignore_file_not_found
 def _parse_nodes_info(dirname, sutest_cluster=True):
-    nodes_info = {}
-
     filename = artifact_paths.CLUSTER_CAPTURE_ENV_DIR / "nodes.json"
 
-    with open(register_important_file(dirname, filename)) as f:
-        nodeList = json.load(f)
+    # parsed once per nodes.json content, the runs of the matrix share the node-info objects
+    return topsail_parse_memo.parse_file(register_important_file(dirname, filename), _parse_nodes_list, sutest_cluster)
+
+
+def _parse_nodes_list(content, sutest_cluster):
+    nodes_info = {}
+
+    nodeList = json.loads(content)
 
     for node in nodeList["items"]:
         node_name = node["metadata"]["name"]
@@ -192,8 +199,7 @@ def _parse_nodes_info(dirname, sutest_cluster=True):
 @ignore_file_not_found
 def _parse_ocp_version(dirname):
 
-    with open(register_important_file(dirname, artifact_paths.CLUSTER_CAPTURE_ENV_DIR / "ocp_version.yml")) as f:
-        sutest_ocp_version_yaml = yaml.safe_load(f)
+    sutest_ocp_version_yaml = topsail_parse_memo.load_yaml(register_important_file(dirname, artifact_paths.CLUSTER_CAPTURE_ENV_DIR / "ocp_version.yml"))
 
     return sutest_ocp_version_yaml["openshiftVersion"]
 
@@ -203,8 +209,7 @@ def _parse_rhods_info(dirname):
     rhods_info = types.SimpleNamespace()
     artifact_dirname = pathlib.Path("001__rhods__capture_state")
 
-    with open(register_important_file(dirname, artifact_paths.KSERVE_CAPTURE_OPERATORS_STATE_DIR / "rhods.version")) as f:
-        rhods_info.version = f.read().strip()
+    rhods_info.version = topsail_parse_memo.read_text(register_important_file(dirname, artifact_paths.KSERVE_CAPTURE_OPERATORS_STATE_DIR / "rhods.version"))
 
     with open(register_important_file(dirname, artifact_paths.KSERVE_CAPTURE_OPERATORS_STATE_DIR / "rhods.createdAt")) as f:
         rhods_info.createdAt_raw = f.read().strip()
@@ -227,18 +232,18 @@ def _extract_metrics(dirname):
         "sutest": (str(artifact_paths.LOCAL_CI_RUN_MULTI_DIR / "prometheus_ocp.t*"), workload_prom.get_sutest_metrics()),
     }
 
-    metrics = {}
+    prom_tarballs = {}
     for name, (tarball_glob, metric) in METRICS.items():
         try:
-            prom_tarball = list(dirname.glob(tarball_glob))[0]
+            prom_tarball = dir_listing.glob(tarball_glob)[0]
         except IndexError:
             logging.warning(f"No {tarball_glob} in '{dirname}'.")
             continue
 
         register_important_file(dirname, prom_tarball.relative_to(dirname))
-        metrics[name] = store_prom_db.extract_metrics(prom_tarball, metric, dirname)
+        prom_tarballs[name] = (prom_tarball, metric)
 
-    return metrics
+    return topsail_prom_db.extract_metrics(prom_tarballs, dirname)
 
 def _extract_cluster_info(nodes_info):
     cluster_info = types.SimpleNamespace()
@@ -356,7 +361,7 @@ def _parse_pod_times(dirname):
 
     pod_times = []
     for pod in json_file["items"]:
-      pod_time = types.SimpleNamespace()
+      pod_time = topsail_records.PodTimes()
       pod_times.append(pod_time)
 
       pod_time.namespace = pod["metadata"]["namespace"]
@@ -394,7 +399,7 @@ def _parse_pod_times(dirname):
           except KeyError: continue
 
           # take the last container_finished found
-          if ("container_finished" not in pod_time.__dict__
+          if (not hasattr(pod_time, "container_finished")
               or pod_time.container_finished < finishedAt):
               pod_time.container_finished = finishedAt
 
@@ -405,7 +410,7 @@ def _parse_pod_times(dirname):
 def _parse_user_resource_times(dirname, ci_pod_dir):
     resource_times = {}
 
-    glob_expansion = list((dirname / ci_pod_dir).glob("*__kserve__capture_state"))
+    glob_expansion = dir_listing.glob("*__kserve__capture_state", ci_pod_dir)
     if not glob_expansion:
         raise FileNotFoundError(f"'*__kserve__capture_state' not found in {ci_pod_dir}")
 
@@ -477,7 +482,7 @@ def _parse_user_resource_times(dirname, ci_pod_dir):
 def _parse_user_grpc_calls(dirname, ci_pod_dir):
     grpc_calls = []
 
-    files_path = (dirname / ci_pod_dir).glob("*__kserve__validate_model_caikit-isvc-u*-m*/caikit-isvc-u*-m*/call_*.json")
+    files_path = dir_listing.glob("*__kserve__validate_model_caikit-isvc-u*-m*/caikit-isvc-u*-m*/call_*.json", ci_pod_dir)
 
     today = datetime.datetime.today()
     today_min = datetime.datetime.combine(today, datetime.time.min)
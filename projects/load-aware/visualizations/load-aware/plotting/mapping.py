@@ -1,4 +1,3 @@
-from collections import defaultdict
 import re
 import logging
 import datetime
@@ -72,42 +71,21 @@ def ResourceMappingTimeline_generate_data(entry, workload):
         ))
 
     if not data:
-        return []
+        return pd.DataFrame()
 
-    df = pd.DataFrame(data).sort_values(by="Time")
     YOTA = datetime.timedelta(microseconds=1)
-    node_pod_count = defaultdict(int)
-    data = []
-    for index, row in df.iterrows():
-        data.append(dict(
-            Time = row.Time - YOTA,
-            Count = node_pod_count[row.NodeName],
-            NodeName = row.NodeName,
-            Instance = row.Instance,
-        ))
-        node_pod_count[row.NodeName] += row.Inc
-        data.append(dict(
-            Time = row.Time,
-            Count = node_pod_count[row.NodeName],
-            NodeName = row.NodeName,
-            Instance = row.Instance,
-        ))
 
-    for node in node_pod_count.keys():
-        continue
-        data.insert(0, dict(
-            Time =entry.results.test_start_end_time.start,
-            Count = 0,
-            NodeName = node,
-        ))
+    events = pd.DataFrame(data).sort_values(by="Time", kind="stable", ignore_index=True)
+    events = events.drop(columns=["PodName"])
 
-        data.append(dict(
-            Time =entry.results.test_start_end_time.end,
-            Count = 0,
-            NodeName = node,
-        ))
+    # running Pod count of each node, after each event
+    events["Count"] = events.groupby("NodeName", sort=False).Inc.cumsum()
 
-    return data
+    # each event is a step: the previous count right before it, the new count after it
+    before = events.assign(Time=events.Time - YOTA, Count=events.Count - events.Inc)
+    steps = pd.concat([before, events]).sort_index(kind="stable").drop(columns=["Inc"])
+
+    return steps.reset_index(drop=True)
 
 
 class ResourceMappingTimeline():
@@ -129,13 +107,12 @@ class ResourceMappingTimeline():
         cfg__instance = cfg.get("instance", False)
 
         for entry in common.Matrix.all_records(settings, setting_lists):
-            data = ResourceMappingTimeline_generate_data(entry, cfg__workload)
+            df = ResourceMappingTimeline_generate_data(entry, cfg__workload)
             metric_data = ResourceMappingTimeline_generate_metric_data(entry, "Sutest Node CPU Utilisation rate")
 
-        if not data:
+        if df.empty:
             return None, "Not data available ..."
 
-        df = pd.DataFrame(data)
         df_metric = pd.DataFrame(metric_data)
 
         from plotly.subplots import make_subplots
@@ -1,18 +1,23 @@
+import contextlib
 import pathlib
 import logging
 import types
-import pickle
-import fnmatch
 import os
 
+import matrix_benchmarking.cli_args as cli_args
 import matrix_benchmarking.store as store
 import matrix_benchmarking.store.simple as store_simple
 
+import topsail.visualizations.matrix_cache as topsail_matrix_cache
+import topsail.visualizations.store_files as topsail_store_files
+import topsail.visualizations.result_cache as topsail_result_cache
+
 from . import parsers
 
 CACHE_FILENAME = "cache.pickle"
 
 IMPORTANT_FILES = parsers.IMPORTANT_FILES
+IMPORTANT_FILES_MATCHER = topsail_store_files.ImportantFilesMatcher(IMPORTANT_FILES)
 
 PARSER_VERSION = parsers.PARSER_VERSION
 ARTIFACTS_VERSION = parsers.ARTIFACTS_VERSION
@@ -23,29 +28,27 @@ def is_mandatory_file(filename):
 
 
 def is_important_file(filename):
-    if str(filename) in IMPORTANT_FILES:
-        return True
+    return IMPORTANT_FILES_MATCHER.match(filename)
 
-    for important_file in IMPORTANT_FILES:
-        if "*" not in important_file: continue
 
-        if fnmatch.filter([str(filename)], important_file):
-            return True
+def is_cache_file(filename):
+    return filename.name == CACHE_FILENAME
 
-    return False
 
+def is_matrix_cache_tracked_file(filename):
+    # a new, removed or re-parsed test directory invalidates the merged matrix cache
+    return is_mandatory_file(filename) or is_cache_file(filename)
 
-def is_cache_file(filename):
-    return filename.name == CACHE_FILENAME
+matrix_cache = None # set in parse_data() when the merged matrix cache is enabled
 
 def resolve_artifact_dirnames(dirname, artifact_dirnames):
     artifact_paths = types.SimpleNamespace()
     for artifact_dirname, unresolved_dirname in artifact_dirnames.__dict__.items():
         direct_resolution = dirname / unresolved_dirname
-        resolutions = list(dirname.glob(unresolved_dirname))
+        resolutions = parsers.dir_listing.glob(unresolved_dirname)
         resolved_dir = None
 
-        if direct_resolution.exists():
+        if parsers.dir_listing.exists(unresolved_dirname):
             # all good
             resolved_dir = direct_resolution
         elif not resolutions:
@@ -79,10 +82,20 @@ def _rewrite_settings(settings_dict):
     return settings_dict
 
 
+@contextlib.contextmanager
+def _picklable(results):
+    # the config getter is a closure, rebuilt by _parse_always
+    get_config = results.test_config.get
+    results.test_config.get = None
+    try:
+        yield results
+    finally:
+        results.test_config.get = get_config
+
+
 def load_cache(dirname):
     try:
-        with open(dirname / CACHE_FILENAME, "rb") as f:
-            results = pickle.load(f)
+        results = topsail_result_cache.load(dirname / CACHE_FILENAME)
 
         cache_version = getattr(results, "parser_version", None)
         if cache_version != PARSER_VERSION:
@@ -101,6 +114,7 @@ def load_cache(dirname):
 
 
 def _parse_directory(fn_add_to_matrix, dirname, import_settings):
+    parsers.dir_listing = topsail_store_files.DirectoryListing(dirname)
     parsers.artifact_paths = resolve_artifact_dirnames(dirname, parsers.artifact_dirnames)
 
     ignore_cache = os.environ.get("MATBENCH_STORE_IGNORE_CACHE", False) in ("yes", "y", "true", "True")
@@ -117,6 +131,8 @@ def _parse_directory(fn_add_to_matrix, dirname, import_settings):
         parsers._parse_always(results, dirname, import_settings)
 
         fn_add_to_matrix(results)
+        if matrix_cache:
+            matrix_cache.record(import_settings, dirname, results)
 
         return
 
@@ -135,16 +151,37 @@ def _parse_directory(fn_add_to_matrix, dirname, import_settings):
     parsers._parse_once(results, dirname)
 
     fn_add_to_matrix(results)
+    if matrix_cache:
+        matrix_cache.record(import_settings, dirname, results)
+
+    with _picklable(results):
+        topsail_result_cache.dump(dirname / CACHE_FILENAME, results)
 
-    with open(dirname / CACHE_FILENAME, "wb") as f:
-        get_config = results.test_config.get
-        results.test_config.get = None
+    print("parsing done :)")
 
-        pickle.dump(results, f)
 
-        results.test_config.get = get_config
+def _duplicated_directory(import_key, old_location, new_location):
+    logging.warning(f"duplicated results key: {import_key}")
+    logging.warning(f"  old: {old_location}")
+    logging.warning(f"  new: {new_location}")
 
-    print("parsing done :)")
+
+def _add_cached_entry(import_settings, dirname, results):
+    # same as a reload from the cache file of the directory
+    parsers.dir_listing = topsail_store_files.DirectoryListing(dirname)
+    parsers.artifact_paths = resolve_artifact_dirnames(dirname, parsers.artifact_dirnames)
+    parsers._parse_always(results, dirname, import_settings)
+
+    store.add_to_matrix(import_settings, dirname, results, _duplicated_directory)
+
+
+def get_matrix_cache_parse_settings():
+    # the store_simple settings that filter out the test directories:
+    # the merged cache only holds the entries kept with these settings
+    return dict(
+        ignore_exit_code=os.environ.get("MATBENCH_SIMPLE_STORE_IGNORE_EXIT_CODE", "false"),
+        filters=str(cli_args.kwargs.get("filters") or ""),
+    )
 
 
 def parse_data():
@@ -156,7 +193,26 @@ def parse_data():
     store_simple.register_custom_lts_parse_results(lts._parse_lts_dir)
     store_simple.register_custom_build_lts_payloads(lts.build_lts_payloads)
 
-    return store_simple.parse_data()
+    global matrix_cache
+    ignore_cache = os.environ.get("MATBENCH_STORE_IGNORE_CACHE", False) in ("yes", "y", "true", "True")
+    matrix_cache = topsail_matrix_cache.from_env(pathlib.Path(cli_args.kwargs["results_dirname"]),
+                                                 PARSER_VERSION, is_matrix_cache_tracked_file,
+                                                 get_matrix_cache_parse_settings())
+
+    # all the test directories at once, when they didn't change since the last parse
+    if matrix_cache and not ignore_cache and matrix_cache.load(_add_cached_entry):
+        matrix_cache = None
+        return
+
+    try:
+        parse_results = store_simple.parse_data()
+
+        if matrix_cache:
+            matrix_cache.save(_picklable)
+
+        return parse_results
+    finally:
+        matrix_cache = None
 
 
 def build_lts_payloads():
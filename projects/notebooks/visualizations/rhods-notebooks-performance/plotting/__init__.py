@@ -1,3 +1,6 @@
+import topsail.visualizations.figure_export as topsail_figure_export
+import topsail.visualizations.plot_memo as topsail_plot_memo
+
 from . import report
 from . import notebook_performance_comparison
 from . import gating_report
@@ -5,8 +8,12 @@ from . import notebook_performance
 from . import lts_documentation
 
 def register():
+    topsail_figure_export.init()
+
     report.register()
     notebook_performance_comparison.register()
     gating_report.register()
     notebook_performance.register()
     lts_documentation.register()
+
+    topsail_plot_memo.init()
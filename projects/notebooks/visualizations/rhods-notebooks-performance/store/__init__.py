@@ -1,13 +1,14 @@
 import pathlib
 import logging
 import types
-import pickle
-import fnmatch
 import os
 
 import matrix_benchmarking.store as store
 import matrix_benchmarking.store.simple as store_simple
 
+import topsail.visualizations.store_files as topsail_store_files
+import topsail.visualizations.result_cache as topsail_result_cache
+
 from . import parsers
 from ..models import lts as models_lts
 from . import lts_parser
@@ -15,6 +16,7 @@ from . import lts_parser
 CACHE_FILENAME = "cache.pickle"
 
 IMPORTANT_FILES = parsers.IMPORTANT_FILES
+IMPORTANT_FILES_MATCHER = topsail_store_files.ImportantFilesMatcher(IMPORTANT_FILES)
 
 PARSER_VERSION = parsers.PARSER_VERSION
 ARTIFACTS_VERSION = parsers.ARTIFACTS_VERSION
@@ -26,16 +28,7 @@ def is_mandatory_file(filename):
 
 
 def is_important_file(filename):
-    if str(filename) in IMPORTANT_FILES:
-        return True
-
-    for important_file in IMPORTANT_FILES:
-        if "*" not in important_file: continue
-
-        if fnmatch.filter([str(filename)], important_file):
-            return True
-
-    return False
+    return IMPORTANT_FILES_MATCHER.match(filename)
 
 
 def is_cache_file(filename):
@@ -58,8 +51,7 @@ def _rewrite_settings(settings_dict):
 
 def load_cache(dirname):
     try:
-        with open(dirname / CACHE_FILENAME, "rb") as f:
-            results = pickle.load(f)
+        results = topsail_result_cache.load(dirname / CACHE_FILENAME)
 
         cache_version = getattr(results, "parser_version", None)
         if cache_version != PARSER_VERSION:
@@ -114,13 +106,12 @@ def _parse_directory(fn_add_to_matrix, dirname, import_settings):
 
     fn_add_to_matrix(results)
 
-    with open(dirname / CACHE_FILENAME, "wb") as f:
-        get_config = results.test_config.get
-        results.test_config.get = None
+    get_config = results.test_config.get
+    results.test_config.get = None
 
-        pickle.dump(results, f)
+    topsail_result_cache.dump(dirname / CACHE_FILENAME, results)
 
-        results.test_config.get = get_config
+    results.test_config.get = get_config
 
     print("parsing done :)")
 
@@ -1,7 +1,6 @@
 import types
 import pathlib
 import logging
-import yaml
 import os
 import json
 import datetime
@@ -11,12 +10,14 @@ import jsonpath_ng
 
 import matrix_benchmarking.cli_args as cli_args
 
+import topsail.visualizations.ansible_log as topsail_ansible_log
+import topsail.visualizations.parse_memo as topsail_parse_memo
+
 
 register_important_file = None # will be when importing store/__init__.py
 
 K8S_TIME_FMT = "%Y-%m-%dT%H:%M:%SZ"
 SHELL_DATE_TIME_FMT = "%a %b %d %H:%M:%S %Z %Y"
-ANSIBLE_LOG_DATE_TIME_FMT = "%Y-%m-%d %H:%M:%S"
 
 IMPORTANT_FILES = [
     "config.yaml",
@@ -113,8 +114,7 @@ def _parse_test_config(dirname):
     filename = pathlib.Path("config.yaml")
     test_config.filepath = dirname / filename
 
-    with open(register_important_file(dirname, filename)) as f:
-        yaml_file = test_config.yaml_file = yaml.safe_load(f)
+    yaml_file = test_config.yaml_file = topsail_parse_memo.load_yaml(register_important_file(dirname, filename))
 
     if not yaml_file:
         logging.error("Config file '{filename}' is empty ...")
@@ -140,12 +140,16 @@ def _parse_test_config(dirname):
 
 @ignore_file_not_found
 def _parse_nodes_info(dirname, sutest_cluster=True):
-    nodes_info = {}
-
     filename = pathlib.Path("artifacts-sutest") / "nodes.json"
 
-    with open(register_important_file(dirname, filename)) as f:
-        nodeList = json.load(f)
+    # parsed once per nodes.json content, the runs of the matrix share the node-info objects
+    return topsail_parse_memo.parse_file(register_important_file(dirname, filename), _parse_nodes_list, sutest_cluster)
+
+
+def _parse_nodes_list(content, sutest_cluster):
+    nodes_info = {}
+
+    nodeList = json.loads(content)
 
     for node in nodeList["items"]:
         node_name = node["metadata"]["name"]
@@ -167,8 +171,7 @@ def _parse_nodes_info(dirname, sutest_cluster=True):
 @ignore_file_not_found
 def _parse_ocp_version(dirname):
 
-    with open(register_important_file(dirname, pathlib.Path("artifacts-sutest") / "ocp_version.yml")) as f:
-        sutest_ocp_version_yaml = yaml.safe_load(f)
+    sutest_ocp_version_yaml = topsail_parse_memo.load_yaml(register_important_file(dirname, pathlib.Path("artifacts-sutest") / "ocp_version.yml"))
 
     return sutest_ocp_version_yaml["openshiftVersion"]
 
@@ -194,8 +197,7 @@ def _parse_rhods_info(dirname):
     rhods_info = types.SimpleNamespace()
     artifact_dirname = pathlib.Path("artifacts-sutest")
 
-    with open(register_important_file(dirname, artifact_dirname / "rhods.version")) as f:
-        rhods_info.version = f.read().strip()
+    rhods_info.version = topsail_parse_memo.read_text(register_important_file(dirname, artifact_dirname / "rhods.version"))
 
     with open(register_important_file(dirname, artifact_dirname / "rhods.createdAt")) as f:
         rhods_info.createdAt_raw = f.read().strip()
@@ -222,17 +224,4 @@ def _parse_notebook_benchmark(dirname, output_dir):
 
 @ignore_file_not_found
 def _parse_start_end_time(dirname):
-    ANSIBLE_LOG_TIME_FMT = '%Y-%m-%d %H:%M:%S'
-    start_time = None
-    end_time = None
-    with open(register_important_file(dirname, "_ansible.log")) as f:
-        for line in f.readlines():
-            time_str = line.partition(",")[0] # ignore the MS
-            if start_time is None:
-                start_time = datetime.datetime.strptime(time_str, ANSIBLE_LOG_TIME_FMT)
-        if start_time is None:
-            raise ValueError("Ansible log file is empty :/")
-
-        end_time = datetime.datetime.strptime(time_str, ANSIBLE_LOG_TIME_FMT)
-
-    return start_time, end_time
+    return topsail_ansible_log.parse_start_end_times(register_important_file(dirname, "_ansible.log"))
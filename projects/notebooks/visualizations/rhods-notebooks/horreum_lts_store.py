@@ -4,15 +4,19 @@ import json
 from pathlib import PosixPath
 from collections import defaultdict, OrderedDict
 import logging
+
+import numpy as np
 import pytz
 
 from . import store_thresholds
-from . import models
 
 from .plotting import prom
 
 import matrix_benchmarking.common as common
 
+import topsail.visualizations.records as topsail_records
+import topsail.visualizations.prom_metrics as topsail_prom_metrics
+
 lts_metrics = {
     'sutest': []
 }
@@ -37,38 +41,119 @@ def _recursive_create_namespace(obj: dict) -> types.SimpleNamespace:
 
     return types.SimpleNamespace(**final_obj)
 
-def _parse_lts_dir(add_to_matrix, dirname, import_settings):
+def _check(condition, dirname, field):
+    if not condition:
+        raise ValueError(f"Invalid LTS payload in '{dirname}': '{field}' is missing or invalid")
+
+
+def _users_to_columns(users, dirname):
+    # user --> steps, stored as columns instead of a list of dicts
+    succeeded = []
+    hostname = []
+    step_user = []
+    step_name = []
+    step_status = []
+    step_duration = []
+
+    for user_idx, user in enumerate(users):
+        _check(isinstance(user.get("succeeded"), bool), dirname, f"data.users[{user_idx}].succeeded")
+        _check(isinstance(user.get("steps"), list), dirname, f"data.users[{user_idx}].steps")
+
+        succeeded.append(user["succeeded"])
+        hostname.append(user.get("hostname"))
+
+        for step_idx, step in enumerate(user["steps"]):
+            _check(isinstance(step.get("duration"), (int, float)), dirname, f"data.users[{user_idx}].steps[{step_idx}].duration")
+
+            step_user.append(user_idx)
+            step_name.append(step["name"])
+            step_status.append(step["status"])
+            step_duration.append(step["duration"])
+
+    return types.SimpleNamespace(
+        succeeded = np.array(succeeded, dtype=bool),
+        hostname = hostname,
+        steps = types.SimpleNamespace(
+            user = np.array(step_user, dtype=np.int32),
+            name = np.array(step_name, dtype=object),
+            status = np.array(step_status, dtype=object),
+            duration = np.array(step_duration, dtype=np.float64),
+        ),
+    )
+
+
+def _metric_to_columns(metric_data):
+    # [{metric: labels, values: [[ts, value], ...] or {ts: value}}] --> values as (n, 2) arrays
+    metrics = []
+    for item in metric_data:
+        values = item["values"]
+        if isinstance(values, dict):
+            values = sorted((float(ts), value) for ts, value in values.items())
+
+        metrics.append(types.SimpleNamespace(
+            metric = item["metric"],
+            values = np.array(values, dtype=np.float64).reshape(-1, 2),
+        ))
+
+    return metrics
+
+
+def load_lts_payload(dirname):
+    """
+    Loads the LTS payload of a directory, in the form used by the plots
+
+    Only the fields used by the plots are validated. The users steps
+    and the Prometheus values are stored as arrays.
+    """
+
     with open(dirname / "data.json") as f:
         payload = json.load(f)
-    model = models.NotebookScalePayload(**payload)
-    data = payload['data']
-    metadata = payload['metadata']
-    settings = metadata['settings']
+
+    data = payload.get("data")
+    metadata = payload.get("metadata")
+    _check(isinstance(data, dict), dirname, "data")
+    _check(isinstance(metadata, dict), dirname, "metadata")
+
+    for field in ("start", "end", "settings", "rhods_version", "ocp_version"):
+        _check(metadata.get(field), dirname, f"metadata.{field}")
+    _check(isinstance(data.get("users"), list), dirname, "data.users")
+    _check(isinstance(data.get("metrics"), dict), dirname, "data.metrics")
 
     results = types.SimpleNamespace(
-        start_time = model.metadata.start,
-        end_time = model.metadata.end,
+        start_time = datetime.datetime.fromisoformat(metadata["start"]),
+        end_time = datetime.datetime.fromisoformat(metadata["end"]),
 
-        thresholds = model.data.thresholds.dict() or store_thresholds.get_thresholds(import_settings),
-        settings = model.metadata.settings.dict(),
+        thresholds = data.get("thresholds"),
+        settings = metadata["settings"],
 
-        sutest_ocp_version = model.data.ocp_version,
-        rhods_cluster_info = _recursive_create_namespace(model.metadata.cluster_info.dict()),
+        sutest_ocp_version = metadata["ocp_version"],
+        rhods_cluster_info = _recursive_create_namespace(data.get("cluster_info") or {}),
         rhods_info = types.SimpleNamespace(
-            version = model.data.rhods_version
+            version = metadata["rhods_version"]
         ),
 
         test_config = types.SimpleNamespace(
-            yaml_file = model.data.config
+            yaml_file = data.get("config")
         ),
-        users = [user.dict() for user in model.data.users],
+        users = _users_to_columns(data["users"], dirname),
         metrics = {
             'sutest': {
-                key: [item.dict() for item in val.data] \
-                    for key, val in model.data.metrics.items()
+                key: _metric_to_columns(val["data"])
+                for key, val in data["metrics"].items()
             }
         }
     )
+
+    return results
+
+
+def _parse_lts_dir(add_to_matrix, dirname, import_settings):
+    results = load_lts_payload(dirname)
+
+    if not results.thresholds:
+        results.thresholds = store_thresholds.get_thresholds(import_settings)
+
+    settings = results.settings
     common.MatrixEntry(
         "LTS from Horreum",
         results,
@@ -91,6 +176,9 @@ def _parse_entry(val):
     elif val_type in [dict, types.SimpleNamespace, common.MatrixEntry, defaultdict, list]:
         return _decode_ci_items(val)
 
+    elif isinstance(val, topsail_records.Record):
+        return _decode_ci_items(val._asdict())
+
     elif val_type not in type_skiplist:
         return val
 
@@ -204,7 +292,7 @@ def _gather_prom_metrics(results) -> dict:
             logging.info(f"Gathering {metric_name[0]}")
 
             output[metric_name[0]] = {
-                'data': [promvalue for promvalue in prom.get_metrics('sutest')(entry, metric_name[0])],
+                'data': topsail_prom_metrics.to_prometheus_values(prom.get_metrics('sutest')(entry, metric_name[0])),
                 'query': metric_name[1]
             }
 
@@ -4,20 +4,56 @@ import logging
 import pytz
 import json
 import functools
+import statistics
 
 import matrix_benchmarking.common as common
 from matrix_benchmarking.parse import json_dumper
 
+import topsail.visualizations.lts_history as topsail_lts_history
+
 from . import models, lts_parser
 
 
+HISTORY_WORKLOAD = "rhods-notebooks"
+
+SPAWN_STEP_NAMES = ("Wait for the Notebook Spawn", "Create and Start the Workbench")
+
+
+def get_lts_kpis(lts_payload):
+    spawn_times = []
+    for user in lts_payload.data.users:
+        for step in user.steps:
+            step_name = str(getattr(step.name, "value", step.name)).replace("_", " ")
+            step_status = str(getattr(step.status, "value", step.status))
+            if step_name not in SPAWN_STEP_NAMES or step_status != "PASS":
+                continue
+
+            spawn_times.append(step.duration)
+
+    kpis = dict(user_count=len(lts_payload.data.users),
+                success_count=sum(1 for user in lts_payload.data.users if user.succeeded))
+
+    if spawn_times:
+        kpis["spawn_time.med"] = statistics.median(spawn_times)
+        kpis["spawn_time.max"] = max(spawn_times)
+        if len(spawn_times) > 1:
+            kpis["spawn_time.90%"] = statistics.quantiles(spawn_times, n=10)[-1]
+
+    return kpis
+
+
 def build_lts_payloads():
+    with topsail_lts_history.open_history() as history:
+        for entry in common.Matrix.processed_map.values():
+            results = entry.results
+            lts_payload = results.lts
 
-    for entry in common.Matrix.processed_map.values():
-        results = entry.results
-        lts_payload = results.lts
+            if history:
+                history.append(HISTORY_WORKLOAD, lts_payload.metadata.start, lts_payload.metadata.end,
+                               lts_payload.metadata.settings, lts_payload.metadata.presets,
+                               get_lts_kpis(lts_payload))
 
-        yield lts_payload, lts_payload.metadata.start, lts_payload.metadata.end
+            yield lts_payload, lts_payload.metadata.start, lts_payload.metadata.end
 
 
 def validate_lts_payload(payload, import_settings, reraise=False):
@@ -1,25 +1,29 @@
-from collections import defaultdict
+# the store imports .plotting.prom for the metric definitions, so the
+# plotting modules (plotly, pandas, dash) are only imported when the
+# plots are registered.
 
-import plotly.graph_objs as go
-import pandas as pd
-import plotly.express as px
+def register():
+    import topsail.visualizations.figure_export as topsail_figure_export
+    import topsail.visualizations.plot_memo as topsail_plot_memo
 
-from . import prom
-from . import completion
-from . import report
-from . import mapping
-from . import spawntime
-from . import status
-from . import launch_time
-from . import error_report
-from . import prom_report
-from . import notebook_performance
-from . import perf_report
-from . import multi_notebook_spawn_time
-from . import gating_report
-from . import lts_documentation
+    from . import prom
+    from . import completion
+    from . import report
+    from . import mapping
+    from . import spawntime
+    from . import status
+    from . import launch_time
+    from . import error_report
+    from . import prom_report
+    from . import notebook_performance
+    from . import perf_report
+    from . import multi_notebook_spawn_time
+    from . import gating_report
+    from . import lts_documentation
+    from . import lts_history
+
+    topsail_figure_export.init()
 
-def register():
     prom.register()
     completion.register()
     report.register()
@@ -34,3 +38,6 @@ def register():
     multi_notebook_spawn_time.register()
     gating_report.register()
     lts_documentation.register()
+    lts_history.register()
+
+    topsail_plot_memo.init()
@@ -0,0 +1,12 @@
+import topsail.visualizations.lts_history_plot as topsail_lts_history_plot
+
+from .. import lts as workload_lts
+
+# the KPIs where a higher value is better. The spawn times are better when lower.
+HIGHER_IS_BETTER_KPIS = ("user_count", "success_count")
+
+
+def register():
+    topsail_lts_history_plot.LtsKpiHistory(workload_lts.HISTORY_WORKLOAD, default_kpi="spawn_time.med",
+                                           higher_is_better_kpis=HIGHER_IS_BETTER_KPIS,
+                                           kpi_units={"spawn_time.": "seconds"})
@@ -84,9 +84,9 @@ def generate_data(entry, cfg, is_notebook, force_order_by_user_idx=False):
             continue
 
         shortname = hostname.replace(".compute.internal", "").replace(".us-west-2", "")
-        if "container_finished" in pod_times.__dict__:
+        if hasattr(pod_times, "container_finished"):
             finish = pod_times.container_finished
-        elif "last_activity" in pod_times.__dict__ and pod_times.last_activity:
+        elif getattr(pod_times, "last_activity", None):
             finish = pod_times.last_activity
         else:
             finish = entry_results.tester_job.completion_time
@@ -2,9 +2,13 @@ from collections import defaultdict
 import json
 
 from matrix_benchmarking import common
-import matrix_benchmarking.plotting.prom as plotting_prom
 import matrix_benchmarking.parsing.prom as parsing_prom
-import matrix_benchmarking.plotting.prom.cpu_memory as plotting_prom_cpu_memory
+
+import topsail.visualizations.prom_downsampling as topsail_prom_downsampling
+import topsail.visualizations.prom_plotting as topsail_prom_plotting
+
+plotting_prom = None
+plotting_prom_cpu_memory = None
 
 from . import utils
 
@@ -527,11 +531,17 @@ def get_metrics(name):
         except KeyError:
             return []
 
-    return _get_metrics
+    return topsail_prom_downsampling.get_metrics(_get_metrics)
 
 
 def register(only_initialize=False):
+    global plotting_prom, plotting_prom_cpu_memory
+
     register = not only_initialize
+    if register:
+        # the LTS payload generation only needs the metric definitions
+        plotting_prom, plotting_prom_cpu_memory = topsail_prom_plotting.import_modules()
+
     get_sutest_metrics(register)
     get_driver_metrics(register)
     get_rhods_metrics(register)
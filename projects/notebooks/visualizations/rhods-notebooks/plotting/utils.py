@@ -10,9 +10,8 @@ def get_user_info(entry: MatrixEntry) -> (int, int, int):
     failed_users = 0
 
     if entry.is_lts:
-        for user in entry.results.users:
-            success_users += 1 if user['succeeded'] else 0
-            failed_users += 1 if not user['succeeded'] else 0
+        success_users = int(entry.results.users.succeeded.sum())
+        failed_users = len(entry.results.users.succeeded) - success_users
     else:
         success_users = sum(1 for ods_ci in entry.results.ods_ci.values() if ods_ci.exit_code == 0)
         failed_users = entry.results.user_count - success_users
@@ -22,9 +21,9 @@ def get_user_info(entry: MatrixEntry) -> (int, int, int):
 
 def parse_users(entry: MatrixEntry) -> (int, str, str, int):
     if entry.is_lts:
-        for (i, user) in enumerate(entry.results.users):
-            for step in user['steps']:
-                yield i, step['name'], step['status'], step['duration'], None
+        steps = entry.results.users.steps
+        for i, step_name, step_status, step_duration in zip(steps.user.tolist(), steps.name, steps.status, steps.duration.tolist()):
+            yield i, step_name, step_status, step_duration, None
     else:
         for user_idx, ods_ci in entry.results.ods_ci.items() if entry.results.ods_ci else []:
             if not ods_ci: continue
@@ -36,7 +35,12 @@ def parse_users(entry: MatrixEntry) -> (int, str, str, int):
 
 def get_last_user(entry):
     if entry.is_lts:
-        return entry.results.users[-1]
+        users = entry.results.users
+        if not len(users.succeeded):
+            return None
+
+        # the names of the steps of the last user
+        return users.steps.name[users.steps.user == len(users.succeeded) - 1].tolist()
     else:
         return entry.results.ods_ci[max(entry.results.ods_ci.keys())]
 
@@ -44,7 +48,7 @@ def get_last_user(entry):
 def get_last_user_steps(entry: MatrixEntry) -> list:
     last_user = get_last_user(entry)
     if entry.is_lts:
-        return last_user['steps']
+        return last_user
     else:
         return last_user.output
 
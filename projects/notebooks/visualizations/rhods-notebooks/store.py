@@ -3,22 +3,25 @@ import pathlib
 import yaml
 import datetime
 from collections import defaultdict
-import xmltodict
+import xml.etree.ElementTree as ET
 import logging
 import re
 import os
 import json
-import fnmatch
-import pickle
 
-import pandas as pd
 import jsonpath_ng
 
 import matrix_benchmarking.store as store
 import matrix_benchmarking.store.simple as store_simple
 import matrix_benchmarking.common as common
 import matrix_benchmarking.cli_args as cli_args
-import matrix_benchmarking.store.prom_db as store_prom_db
+
+import topsail.visualizations.prom_metrics as topsail_prom_metrics
+import topsail.visualizations.ansible_log as topsail_ansible_log
+import topsail.visualizations.store_files as topsail_store_files
+import topsail.visualizations.result_cache as topsail_result_cache
+import topsail.visualizations.records as topsail_records
+import topsail.visualizations.parse_memo as topsail_parse_memo
 
 import matrix_benchmarking.cli_args as cli_args
 
@@ -32,6 +35,8 @@ from . import lts_parser, lts
 
 K8S_EVT_TIME_FMT = "%Y-%m-%dT%H:%M:%S.%fZ"
 K8S_TIME_FMT = "%Y-%m-%dT%H:%M:%SZ"
+ROBOT_TEST_PATH = ["robot", "suite", "test"]
+ROBOT_TEST_STATUS_PATH = ROBOT_TEST_PATH + ["status"]
 ROBOT_TIME_FMT = "%Y%m%d %H:%M:%S.%f"
 SHELL_DATE_TIME_FMT = "%a %b %d %H:%M:%S %Z %Y"
 
@@ -54,6 +59,7 @@ IMPORTANT_FILES = [
     "artifacts-sutest/ocp_version.yml",
     "artifacts-sutest/prometheus_ocp.t*",
     "artifacts-sutest/prometheus_rhods.t*",
+    "prom_metrics/*/*",
     "artifacts-sutest/project_*/notebook_pods.json",
     "artifacts-sutest/project_*/notebooks.json",
     "artifacts-sutest/project_*/namespaces.json",
@@ -81,6 +87,9 @@ IMPORTANT_FILES = [
 
     "config.yaml",
 ]
+IMPORTANT_FILES_MATCHER = topsail_store_files.ImportantFilesMatcher(IMPORTANT_FILES)
+
+dir_listing = None # _parse_directory will set it to the DirectoryListing of the results directory
 
 
 ARTIFACTS_VERSION = "2022-11-09"
@@ -94,16 +103,7 @@ def is_mandatory_file(filename):
 
 
 def is_important_file(filename):
-    if str(filename) in IMPORTANT_FILES:
-        return True
-
-    for important_file in IMPORTANT_FILES:
-        if "*" not in important_file: continue
-
-        if fnmatch.filter([str(filename)], important_file):
-            return True
-
-    return False
+    return IMPORTANT_FILES_MATCHER.match(filename)
 
 
 def is_cache_file(filename):
@@ -265,8 +265,7 @@ def _parse_pr_comments(dirname):
 def _parse_rhods_info(dirname):
     rhods_info = types.SimpleNamespace()
 
-    with open(register_important_file(dirname, pathlib.Path("artifacts-sutest") / "rhods.version")) as f:
-        rhods_info.version = f.read().strip()
+    rhods_info.version = topsail_parse_memo.read_text(register_important_file(dirname, pathlib.Path("artifacts-sutest") / "rhods.version"))
 
     with open(register_important_file(dirname, pathlib.Path("artifacts-sutest") / "rhods.createdAt")) as f:
         rhods_info.createdAt_raw = f.read().strip()
@@ -322,10 +321,15 @@ def _parse_tester_job(dirname):
 
 @ignore_file_not_found
 def _parse_nodes_info(dirname, sutest_cluster=False):
-    nodes_info = {}
     filename = pathlib.Path("artifacts-sutest" if sutest_cluster else "artifacts-driver") / "nodes.json"
-    with open(register_important_file(dirname, filename)) as f:
-        nodeList = json.load(f)
+    # parsed once per nodes.json content, the runs of the matrix share the node-info objects
+    return topsail_parse_memo.parse_file(register_important_file(dirname, filename), _parse_nodes_list, sutest_cluster)
+
+
+def _parse_nodes_list(content, sutest_cluster):
+    nodes_info = {}
+
+    nodeList = json.loads(content)
 
     for node in nodeList["items"]:
         node_name = node["metadata"]["name"]
@@ -430,7 +434,7 @@ def _parse_resource_times(dirname):
 @ignore_file_not_found
 def _parse_notebook_times(dirname, pod_times):
     filenames = [fname.relative_to(dirname) for fname in
-                 (dirname / pathlib.Path("artifacts-sutest")).glob("project_*/notebooks.json")]
+                 dir_listing.glob("artifacts-sutest/project_*/notebooks.json")]
 
     def _parse_notebook_times_file(notebooks):
         for notebook in notebooks["items"]:
@@ -466,11 +470,11 @@ def _parse_notebook_times(dirname, pod_times):
 def _parse_pod_times(dirname, test_config=None, is_notebook=False):
     if is_notebook:
         filenames = [fname.relative_to(dirname) for fname in
-                     (dirname / pathlib.Path("artifacts-sutest")).glob("project_*/notebook_pods.json")]
+                     dir_listing.glob("artifacts-sutest/project_*/notebook_pods.json")]
     else:
         filenames = [pathlib.Path("artifacts-driver") / "tester_pods.json"]
 
-    pod_times = defaultdict(types.SimpleNamespace)
+    pod_times = defaultdict(topsail_records.PodTimes)
     hostnames = {}
 
     def _parse_pod_times_file(pods):
@@ -517,7 +521,7 @@ def _parse_pod_times(dirname, test_config=None, is_notebook=False):
                         K8S_TIME_FMT)
                 except KeyError: continue
 
-                if ("container_finished" not in pod_times[user_index].__dict__
+                if (not hasattr(pod_times[user_index], "container_finished")
                     or pod_times[user_index].container_finished < finishedAt):
                     pod_times[user_index].container_finished = finishedAt
 
@@ -543,8 +547,7 @@ def _parse_test_config(dirname):
     filename = pathlib.Path("config.yaml")
     test_config.filepath = dirname / filename
 
-    with open(register_important_file(dirname, filename)) as f:
-        yaml_file = test_config.yaml_file = yaml.safe_load(f)
+    yaml_file = test_config.yaml_file = topsail_parse_memo.load_yaml(register_important_file(dirname, filename))
 
     if not yaml_file:
         logging.error("Config file '{filename}' is empty ...")
@@ -574,18 +577,18 @@ def _extract_metrics(dirname):
         "rhods":  ("artifacts-sutest/prometheus_rhods.t*", rhods_plotting_prom.get_rhods_metrics()),
     }
 
-    results_metrics = {}
+    prom_tarballs = {}
     for name, (tarball_glob, metrics) in METRICS.items():
         try:
-            prom_tarball = list(dirname.glob(tarball_glob))[0]
+            prom_tarball = dir_listing.glob(tarball_glob)[0]
         except IndexError:
             logging.warning(f"No {tarball_glob} in '{dirname}'.")
             continue
 
         register_important_file(dirname, prom_tarball.relative_to(dirname))
-        results_metrics[name] = store_prom_db.extract_metrics(prom_tarball, metrics, dirname)
+        prom_tarballs[name] = (prom_tarball, metrics)
 
-    return results_metrics
+    return topsail_prom_metrics.extract_metrics(prom_tarballs, dirname)
 
 
 @ignore_file_not_found
@@ -606,26 +609,41 @@ def _parse_ods_ci_exit_code(dirname, output_dir):
 @ignore_file_not_found
 def _parse_ods_ci_output_xml(dirname, output_dir):
     filename = output_dir / "output.xml"
-    with open(register_important_file(dirname, filename)) as f:
-        try:
-            output_dict = xmltodict.parse(f.read())
-        except Exception as e:
-            logging.warning(f"Failed to parse {filename}: {e}")
-            return None
 
+    # streams the XML file, and only keeps the robot/suite/test/status
+    # attributes. The elements are cleared as soon as they are parsed.
     ods_ci_output = {}
-    tests = output_dict["robot"]["suite"]["test"]
-    if not isinstance(tests, list): tests = [tests]
+    path = []
+    test_status = None
 
-    for test in tests:
-        if test["status"].get("#text") == 'Failure occurred and exit-on-failure mode is in use.':
-            continue
+    with open(register_important_file(dirname, filename), "rb") as f:
+        try:
+            for event, elem in ET.iterparse(f, events=("start", "end")):
+                if event == "start":
+                    path.append(elem.tag)
+                    continue
+
+                if path == ROBOT_TEST_STATUS_PATH:
+                    test_status = dict(elem.attrib)
+                    test_status["text"] = (elem.text or "").strip()
+
+                elif path == ROBOT_TEST_PATH:
+                    if test_status and test_status["text"] != 'Failure occurred and exit-on-failure mode is in use.':
+                        ods_ci_output[elem.attrib["name"]] = output_step = types.SimpleNamespace()
 
-        ods_ci_output[test["@name"]] = output_step = types.SimpleNamespace()
+                        output_step.start = datetime.datetime.strptime(test_status["starttime"], ROBOT_TIME_FMT)
+                        output_step.finish = datetime.datetime.strptime(test_status["endtime"], ROBOT_TIME_FMT)
+                        output_step.status = test_status["status"]
 
-        output_step.start = datetime.datetime.strptime(test["status"]["@starttime"], ROBOT_TIME_FMT)
-        output_step.finish = datetime.datetime.strptime(test["status"]["@endtime"], ROBOT_TIME_FMT)
-        output_step.status = test["status"]["@status"]
+                    test_status = None
+
+                path.pop()
+                if len(path) >= 2:
+                    elem.clear()
+
+        except ET.ParseError as e:
+            logging.warning(f"Failed to parse {filename}: {e}")
+            return None
 
     return ods_ci_output
 
@@ -650,8 +668,7 @@ def _parse_ods_ci_progress(dirname, output_dir):
 
 @ignore_file_not_found
 def _parse_ocp_version(dirname):
-    with open(register_important_file(dirname, pathlib.Path("artifacts-sutest") / "ocp_version.yml")) as f:
-        sutest_ocp_version_yaml = yaml.safe_load(f)
+    sutest_ocp_version_yaml = topsail_parse_memo.load_yaml(register_important_file(dirname, pathlib.Path("artifacts-sutest") / "ocp_version.yml"))
 
     return sutest_ocp_version_yaml["openshiftVersion"]
 
@@ -694,8 +711,7 @@ def _parse_always(results, dirname, import_settings):
 
 def load_cache(dirname):
     try:
-        with open(dirname / CACHE_FILENAME, "rb") as f:
-            results = pickle.load(f)
+        results = topsail_result_cache.load(dirname / CACHE_FILENAME)
 
         cache_version = getattr(results, "parser_version", None)
         if cache_version != PARSER_VERSION:
@@ -723,6 +739,9 @@ def _parse_ods_ci_pods_directory(dirname, output_dir):
     return ods_ci
 
 def _parse_directory(fn_add_to_matrix, dirname, import_settings):
+    global dir_listing
+    dir_listing = topsail_store_files.DirectoryListing(dirname)
+
     ignore_cache = os.environ.get("MATBENCH_STORE_IGNORE_CACHE", False) in ("yes", "y", "true", "True")
     if not ignore_cache:
         try:
@@ -734,6 +753,7 @@ def _parse_directory(fn_add_to_matrix, dirname, import_settings):
         results = None
 
     if results:
+        topsail_prom_metrics.bind_metrics(results.metrics, dirname)
         _parse_always(results, dirname, import_settings)
 
         fn_add_to_matrix(results)
@@ -803,7 +823,7 @@ def _parse_directory(fn_add_to_matrix, dirname, import_settings):
     if (dirname / "ods-ci").exists():
         results.ods_ci = {}
 
-        for ods_ci_dirname in (dirname / pathlib.Path("ods-ci")).glob("*"):
+        for ods_ci_dirname in dir_listing.glob("ods-ci/*"):
             pod_hostname = ods_ci_dirname.name
             user_idx = int(pod_hostname.split("-")[-1])
             output_dir = pathlib.Path("ods-ci") / pod_hostname
@@ -831,41 +851,23 @@ def _parse_directory(fn_add_to_matrix, dirname, import_settings):
 
     fn_add_to_matrix(results)
 
-    with open(dirname / CACHE_FILENAME, "wb") as f:
-        get_config = results.test_config.get
-        results.test_config.get = None
+    get_config = results.test_config.get
+    results.test_config.get = None
 
-        pickle.dump(results, f)
+    topsail_result_cache.dump(dirname / CACHE_FILENAME, results)
 
-        results.test_config.get = get_config
+    results.test_config.get = get_config
 
     print("parsing done :)")
 
 @ignore_file_not_found
 def _parse_start_end_times(dirname):
-    ISO_FORMAT="%Y-%m-%d %H:%M:%S"
-    with open(dirname / '_ansible.log', 'r') as file:
-        first = None
-        last = None
-        for line in file:
-            if not first:
-                first = line
-            last = line
-
-        # first = "2023-04-14 17:19:19,808 p=770 u=psap-ci-runner n=ansible | ansible-playbook 2.9.27"
-        start_time = datetime.datetime.strptime(
-            first.partition(',')[0],
-            ISO_FORMAT
-        )
-        # last = 2023-04-14 17:25:31,697 p=770 u=psap-ci-runner n=ansible |...
-        end_time = datetime.datetime.strptime(
-            last.partition(',')[0],
-            ISO_FORMAT
-        )
-        logging.debug(f'Start time: {start_time}')
-        logging.debug(f'End time: {end_time}')
-
-        return (start_time, end_time)
+    start_time, end_time = topsail_ansible_log.parse_start_end_times(dirname / '_ansible.log')
+
+    logging.debug(f'Start time: {start_time}')
+    logging.debug(f'End time: {end_time}')
+
+    return (start_time, end_time)
 
 
 def parse_data():
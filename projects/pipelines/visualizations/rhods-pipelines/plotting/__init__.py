@@ -1,3 +1,6 @@
+import topsail.visualizations.figure_export as topsail_figure_export
+import topsail.visualizations.plot_memo as topsail_plot_memo
+
 from . import error_report
 from . import spawntime
 from . import report
@@ -8,6 +11,8 @@ from . import perf_report
 from . import mapping
 
 def register():
+    topsail_figure_export.init()
+
     error_report.register()
     spawntime.register()
     report.register()
@@ -15,3 +20,5 @@ def register():
     prom_report.register()
     perf_report.register()
     mapping.register()
+
+    topsail_plot_memo.init()
@@ -1,12 +1,14 @@
 import pathlib
 import logging
 import types
-import pickle
-import fnmatch
 
 import matrix_benchmarking.store as store
 import matrix_benchmarking.store.simple as store_simple
 
+import topsail.visualizations.store_files as topsail_store_files
+import topsail.visualizations.result_cache as topsail_result_cache
+import topsail.visualizations.records as topsail_records
+
 from . import parsers
 from .. import models
 
@@ -17,6 +19,7 @@ store.register_lts_schema(models_lts.PipelinesScaleTestPayload)
 CACHE_FILENAME = "cache.pickle"
 
 IMPORTANT_FILES = parsers.IMPORTANT_FILES
+IMPORTANT_FILES_MATCHER = topsail_store_files.ImportantFilesMatcher(IMPORTANT_FILES)
 
 
 def is_mandatory_file(filename):
@@ -24,16 +27,7 @@ def is_mandatory_file(filename):
 
 
 def is_important_file(filename):
-    if str(filename) in IMPORTANT_FILES:
-        return True
-
-    for important_file in IMPORTANT_FILES:
-        if "*" not in important_file: continue
-
-        if fnmatch.filter([str(filename)], important_file):
-            return True
-
-    return False
+    return IMPORTANT_FILES_MATCHER.match(filename)
 
 
 def is_cache_file(filename):
@@ -60,12 +54,16 @@ def simpleNamespacetoModel(obj, model):
     def _parse_entry(val):
         return _parse_item(val) \
             if type(val) in (types.SimpleNamespace, dict, list) \
+               or isinstance(val, topsail_records.Record) \
                else val
 
     def _parse_item(obj):
         if type(obj) == list:
             return [_parse_entry(val) for val in obj]
 
+        elif isinstance(obj, topsail_records.Record):
+            return _parse_item(obj._asdict())
+
         elif type(obj) in (types.SimpleNamespace, dict):
             return {key: _parse_entry(val) for key, val in (obj if type(obj) == dict else vars(obj)).items()}
 
@@ -82,8 +80,7 @@ def parsedObjectToModel(result):
 
 def load_cache(dirname):
     try:
-        with open(dirname / CACHE_FILENAME, "rb") as f:
-            results = pickle.load(f)
+        results = topsail_result_cache.load(dirname / CACHE_FILENAME)
 
         cache_version = getattr(results, "parser_version", None)
         if cache_version != parsers.PARSER_VERSION:
@@ -102,6 +99,8 @@ def load_cache(dirname):
 
 
 def _parse_directory(fn_add_to_matrix, dirname, import_settings):
+    parsers.dir_listing = topsail_store_files.DirectoryListing(dirname)
+
     try:
         results = load_cache(dirname)
     except FileNotFoundError:
@@ -132,13 +131,12 @@ def _parse_directory(fn_add_to_matrix, dirname, import_settings):
     modeled_results = parsedObjectToModel(results)
     fn_add_to_matrix(modeled_results)
 
-    with open(dirname / CACHE_FILENAME, "wb") as f:
-        get_config = results.test_config.get
-        results.test_config.get = None
+    get_config = results.test_config.get
+    results.test_config.get = None
 
-        pickle.dump(results, f)
+    topsail_result_cache.dump(dirname / CACHE_FILENAME, results)
 
-        results.test_config.get = get_config
+    results.test_config.get = get_config
 
     print("parsing done :)")
 
@@ -2,6 +2,8 @@ from typing import Union
 
 import matrix_benchmarking.common as common
 
+import topsail.visualizations.prom_metrics as topsail_prom_metrics
+
 from . import prom
 from ..models import lts as models_lts
 
@@ -46,7 +48,7 @@ def register_lts_metric(cluster_role, metric):
     pass
 
 def _gather_prom_metrics(metrics, model) -> dict:
-    data = {metric_name: metrics[metric_name]
+    data = {metric_name: topsail_prom_metrics.to_prometheus_values(metrics[metric_name])
             for metric_name in model.schema()["properties"].keys()}
 
     return model(**data)
@@ -10,16 +10,20 @@ from collections import defaultdict
 import jsonpath_ng
 
 import matrix_benchmarking.cli_args as cli_args
-import matrix_benchmarking.store.prom_db as store_prom_db
+
+import topsail.visualizations.prom_db as topsail_prom_db
+import topsail.visualizations.ansible_log as topsail_ansible_log
+import topsail.visualizations.records as topsail_records
+import topsail.visualizations.parse_memo as topsail_parse_memo
 
 from . import prom as rhods_pipelines_prom
 
 
 register_important_file = None # will be when importing store/__init__.py
+dir_listing = None # store._parse_directory will set it to the DirectoryListing of the results directory
 
 K8S_TIME_FMT = "%Y-%m-%dT%H:%M:%SZ"
 SHELL_DATE_TIME_FMT = "%a %b %d %H:%M:%S %Z %Y"
-ANSIBLE_LOG_DATE_TIME_FMT = "%Y-%m-%d %H:%M:%S"
 
 IMPORTANT_FILES = [
     "artifacts_version",
@@ -134,8 +138,7 @@ def _parse_test_config(dirname):
     filename = pathlib.Path("config.yaml")
     test_config.filepath = dirname / filename
 
-    with open(register_important_file(dirname, filename)) as f:
-        yaml_file = test_config.yaml_file = yaml.safe_load(f)
+    yaml_file = test_config.yaml_file = topsail_parse_memo.load_yaml(register_important_file(dirname, filename))
 
     if not yaml_file:
         logging.error("Config file '{filename}' is empty ...")
@@ -180,12 +183,16 @@ def _extract_rhods_cluster_info(nodes_info):
 
 @ignore_file_not_found
 def _parse_nodes_info(dirname, sutest_cluster=True):
-    nodes_info = {}
-
     filename = "001__rhods__capture_state/nodes.json"
 
-    with open(register_important_file(dirname, filename)) as f:
-        nodeList = json.load(f)
+    # parsed once per nodes.json content, the runs of the matrix share the node-info objects
+    return topsail_parse_memo.parse_file(register_important_file(dirname, filename), _parse_nodes_list, sutest_cluster)
+
+
+def _parse_nodes_list(content, sutest_cluster):
+    nodes_info = {}
+
+    nodeList = json.loads(content)
 
     for node in nodeList["items"]:
         node_name = node["metadata"]["name"]
@@ -211,8 +218,7 @@ def _parse_nodes_info(dirname, sutest_cluster=True):
 def _parse_ocp_version(dirname):
     filename = "001__rhods__capture_state/ocp_version.yml"
 
-    with open(register_important_file(dirname, filename)) as f:
-        sutest_ocp_version_yaml = yaml.safe_load(f)
+    sutest_ocp_version_yaml = topsail_parse_memo.load_yaml(register_important_file(dirname, filename))
 
     return sutest_ocp_version_yaml["openshiftVersion"]
 
@@ -221,8 +227,7 @@ def _parse_rhods_info(dirname):
     rhods_info = types.SimpleNamespace()
     artifact_dirname = pathlib.Path("001__rhods__capture_state")
 
-    with open(register_important_file(dirname, artifact_dirname / "rhods.version")) as f:
-        rhods_info.version = f.read().strip()
+    rhods_info.version = topsail_parse_memo.read_text(register_important_file(dirname, artifact_dirname / "rhods.version"))
 
     with open(register_important_file(dirname, artifact_dirname / "rhods.createdAt")) as f:
         rhods_info.createdAt_raw = f.read().strip()
@@ -273,19 +278,16 @@ def _parse_user_progress(dirname, ci_pod_dir):
 
 def _parse_user_ansible_progress(dirname, ci_pod_dir):
     ansible_progress = {}
-    for ansible_log in sorted(ci_pod_dir.glob("*/_ansible.log")):
+    for ansible_log in dir_listing.glob("*/_ansible.log", ci_pod_dir):
         filename = ansible_log.relative_to(dirname)
-        last_line = None
         step_name = filename.parent.name
-        with open(register_important_file(dirname, filename)) as f:
-            for lines in f.readlines():
-                last_line = lines
-            if not last_line:
-                logging.warning(f"Empty Ansible log file in {filename} :/")
-                continue
-            ts_str = last_line.split(",")[0]
-            ts = datetime.datetime.strptime(ts_str, ANSIBLE_LOG_DATE_TIME_FMT)
-            ansible_progress[f"ansible.{step_name}"] = ts
+        try:
+            _, ts = topsail_ansible_log.parse_start_end_times(register_important_file(dirname, filename))
+        except ValueError:
+            logging.warning(f"Empty Ansible log file in {filename} :/")
+            continue
+
+        ansible_progress[f"ansible.{step_name}"] = ts
 
     return ansible_progress
 
@@ -348,18 +350,18 @@ def _extract_metrics(dirname):
         "driver": ("000__local_ci__run_multi/prometheus_ocp.t*", rhods_pipelines_prom.get_driver_metrics()),
     }
 
-    metrics = {}
+    prom_tarballs = {}
     for name, (tarball_glob, metric) in METRICS.items():
         try:
-            prom_tarball = list(dirname.glob(tarball_glob))[0]
+            prom_tarball = dir_listing.glob(tarball_glob)[0]
         except IndexError:
             logging.warning(f"No {tarball_glob} in '{dirname}'.")
             continue
 
         register_important_file(dirname, prom_tarball.relative_to(dirname))
-        metrics[name] = store_prom_db.extract_metrics(prom_tarball, metric, dirname)
+        prom_tarballs[name] = (prom_tarball, metric)
 
-    return metrics
+    return topsail_prom_db.extract_metrics(prom_tarballs, dirname)
 
 @ignore_file_not_found
 def _parse_artifacts_version(dirname):
@@ -372,12 +374,12 @@ def _parse_artifacts_version(dirname):
 @ignore_file_not_found
 def _parse_pod_times(dirname, ci_pod_dir):
     filenames = [fname.relative_to(dirname) for fname in
-                 ci_pod_dir.glob("00*__pipelines__capture_state/pods/*.json")]
+                 dir_listing.glob("00*__pipelines__capture_state/pods/*.json", ci_pod_dir)]
 
     pod_times = []
 
     def _parse_pod_times_file(filename, pod):
-        pod_time = types.SimpleNamespace()
+        pod_time = topsail_records.PodTimes()
         pod_times.append(pod_time)
 
         if pod["metadata"]["labels"].get("component") == "data-science-pipelines":
@@ -429,7 +431,7 @@ def _parse_pod_times(dirname, ci_pod_dir):
             except KeyError: continue
 
             # take the last container_finished found
-            if ("container_finished" not in pod_time.__dict__
+            if (not hasattr(pod_time, "container_finished")
                 or pod_time.container_finished < finishedAt):
                 pod_time.container_finished = finishedAt
 
@@ -1,11 +1,18 @@
+import topsail.visualizations.figure_export as topsail_figure_export
+import topsail.visualizations.plot_memo as topsail_plot_memo
+
 from . import error_report
 from ..store import prom
 from . import prom_report
 from . import lts_documentation
 
 def register():
+    topsail_figure_export.init()
+
     error_report.register()
     report.register()
     prom.register()
     prom_report.register()
     lts_documentation.register()
+
+    topsail_plot_memo.init()
@@ -1,5 +1,7 @@
 import types
 
+import topsail.visualizations.prom_metrics as topsail_prom_metrics
+
 from .. import models
 from ..models import lts as models_lts
 from . import lts
@@ -35,7 +37,7 @@ def generate_lts_results(results):
 
 
 def _gather_prom_metrics(metrics, model) -> dict:
-    data = {metric_name: metrics[metric_name]
+    data = {metric_name: topsail_prom_metrics.to_prometheus_values(metrics[metric_name])
             for metric_name in model.schema()["properties"].keys()}
 
     return model(**data)
@@ -1,24 +1,25 @@
 import types
 import pathlib
 import logging
-import yaml
 import os
 import json
-import datetime
 import urllib
 
 import jsonpath_ng
 
 import matrix_benchmarking.cli_args as cli_args
-import matrix_benchmarking.store.prom_db as store_prom_db
+
+import topsail.visualizations.prom_db as topsail_prom_db
+import topsail.visualizations.ansible_log as topsail_ansible_log
+import topsail.visualizations.parse_memo as topsail_parse_memo
 
 from . import prom as workload_prom
 
 register_important_file = None # will be when importing store/__init__.py
+dir_listing = None # store._parse_directory will set it to the DirectoryListing of the results directory
 
 K8S_TIME_FMT = "%Y-%m-%dT%H:%M:%SZ"
 SHELL_DATE_TIME_FMT = "%a %b %d %H:%M:%S %Z %Y"
-ANSIBLE_LOG_DATE_TIME_FMT = "%Y-%m-%d %H:%M:%S"
 
 artifact_dirnames = types.SimpleNamespace()
 artifact_dirnames.CLUSTER_CAPTURE_ENV_DIR = "*__cluster__capture_environment"
@@ -113,8 +114,7 @@ def _parse_test_config(dirname):
     filename = pathlib.Path("config.yaml")
     test_config.filepath = dirname / filename
 
-    with open(register_important_file(dirname, filename)) as f:
-        yaml_file = test_config.yaml_file = yaml.safe_load(f)
+    yaml_file = test_config.yaml_file = topsail_parse_memo.load_yaml(register_important_file(dirname, filename))
 
     if not yaml_file:
         logging.error(f"Config file '{filename}' is empty ...")
@@ -140,12 +140,16 @@ def _parse_test_config(dirname):
 
 @ignore_file_not_found
 def _parse_nodes_info(dirname, sutest_cluster=True):
-    nodes_info = {}
-
     filename = artifact_paths.CLUSTER_CAPTURE_ENV_DIR / "nodes.json"
 
-    with open(register_important_file(dirname, filename)) as f:
-        nodeList = json.load(f)
+    # parsed once per nodes.json content, the runs of the matrix share the node-info objects
+    return topsail_parse_memo.parse_file(register_important_file(dirname, filename), _parse_nodes_list, sutest_cluster)
+
+
+def _parse_nodes_list(content, sutest_cluster):
+    nodes_info = {}
+
+    nodeList = json.loads(content)
 
     for node in nodeList["items"]:
         node_name = node["metadata"]["name"]
@@ -167,8 +171,7 @@ def _parse_nodes_info(dirname, sutest_cluster=True):
 @ignore_file_not_found
 def _parse_ocp_version(dirname):
 
-    with open(register_important_file(dirname, artifact_paths.CLUSTER_CAPTURE_ENV_DIR / "ocp_version.yml")) as f:
-        sutest_ocp_version_yaml = yaml.safe_load(f)
+    sutest_ocp_version_yaml = topsail_parse_memo.load_yaml(register_important_file(dirname, artifact_paths.CLUSTER_CAPTURE_ENV_DIR / "ocp_version.yml"))
 
     return sutest_ocp_version_yaml["openshiftVersion"]
 
@@ -178,18 +181,18 @@ def _extract_metrics(dirname):
         "sutest": (str(artifact_paths.CLUSTER_DUMP_PROM_DB_DIR / "prometheus.t*"), workload_prom.get_sutest_metrics()),
     }
 
-    metrics = {}
+    prom_tarballs = {}
     for name, (tarball_glob, metric) in METRICS.items():
         try:
-            prom_tarball = list(dirname.glob(tarball_glob))[0]
+            prom_tarball = dir_listing.glob(tarball_glob)[0]
         except IndexError:
             logging.warning(f"No {tarball_glob} in '{dirname}'.")
             continue
 
         register_important_file(dirname, prom_tarball.relative_to(dirname))
-        metrics[name] = store_prom_db.extract_metrics(prom_tarball, metric, dirname)
+        prom_tarballs[name] = (prom_tarball, metric)
 
-    return metrics
+    return topsail_prom_db.extract_metrics(prom_tarballs, dirname)
 
 def _extract_cluster_info(nodes_info):
     cluster_info = types.SimpleNamespace()
@@ -208,20 +211,11 @@ def _extract_cluster_info(nodes_info):
 
 @ignore_file_not_found
 def _parse_start_end_time(dirname):
-    ANSIBLE_LOG_TIME_FMT = '%Y-%m-%d %H:%M:%S'
-
     test_start_end_time = types.SimpleNamespace()
     test_start_end_time.start = None
     test_start_end_time.end = None
 
-    with open(register_important_file(dirname, artifact_paths.CLUSTER_CAPTURE_ENV_DIR / "_ansible.log")) as f:
-        for line in f.readlines():
-            time_str = line.partition(",")[0] # ignore the MS
-            if test_start_end_time.start is None:
-                test_start_end_time.start = datetime.datetime.strptime(time_str, ANSIBLE_LOG_TIME_FMT)
-        if test_start_end_time.start is None:
-            raise ValueError("Ansible log file is empty :/")
-
-        test_start_end_time.end = datetime.datetime.strptime(time_str, ANSIBLE_LOG_TIME_FMT)
+    ansible_log = register_important_file(dirname, artifact_paths.CLUSTER_CAPTURE_ENV_DIR / "_ansible.log")
+    test_start_end_time.start, test_start_end_time.end = topsail_ansible_log.parse_start_end_times(ansible_log)
 
     return test_start_end_time
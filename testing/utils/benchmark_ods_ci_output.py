@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+
+"""
+Compares the streaming parser of the ods-ci output.xml files (notebooks
+store, _parse_ods_ci_output_xml) with the previous xmltodict parser:
+same steps, parsing time and peak memory.
+
+Usage: benchmark_ods_ci_output.py [OUTPUT_XML...]
+  (default: a generated output.xml with 10 tests of 3000 keywords)
+
+Run from the TOPSAIL directory, with the notebooks visualization
+dependencies (matrix_benchmarking, xmltodict) installed.
+"""
+
+import importlib
+import tracemalloc
+import tempfile
+import datetime
+import pathlib
+import shutil
+import types
+import time
+import sys
+
+import xmltodict
+
+TOPSAIL_DIR = pathlib.Path(__file__).absolute().parent.parent.parent
+sys.path.insert(0, str(TOPSAIL_DIR))
+
+STORE_MODULE = "projects.notebooks.visualizations.rhods-notebooks.store"
+
+# must match the "ods-ci/ods-ci-*/output.xml" important file of the store
+OUTPUT_DIR = pathlib.Path("ods-ci") / "ods-ci-benchmark"
+
+ROBOT_TIME_FMT = "%Y%m%d %H:%M:%S.%f"
+
+TEST_COUNT = 10
+KEYWORD_COUNT = 3000
+
+
+def previous_parser(filename):
+    # the previous implementation, with xmltodict
+    with open(filename) as f:
+        output_dict = xmltodict.parse(f.read())
+
+    ods_ci_output = {}
+    tests = output_dict["robot"]["suite"]["test"]
+    if not isinstance(tests, list): tests = [tests]
+
+    for test in tests:
+        if test["status"].get("#text") == 'Failure occurred and exit-on-failure mode is in use.':
+            continue
+
+        ods_ci_output[test["@name"]] = output_step = types.SimpleNamespace()
+
+        output_step.start = datetime.datetime.strptime(test["status"]["@starttime"], ROBOT_TIME_FMT)
+        output_step.finish = datetime.datetime.strptime(test["status"]["@endtime"], ROBOT_TIME_FMT)
+        output_step.status = test["status"]["@status"]
+
+    return ods_ci_output
+
+
+def generate_output_xml(filename, test_count=TEST_COUNT, keyword_count=KEYWORD_COUNT):
+    status = 'status="PASS" starttime="20240101 10:00:00.000" endtime="20240101 10:00:01.500"'
+    with open(filename, "w") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n<robot generator="Robot 6.1">\n<suite id="s1" name="Benchmark">\n')
+        for test_idx in range(test_count):
+            f.write(f'<test id="s1-t{test_idx}" name="Test {test_idx}">\n')
+            for kw_idx in range(keyword_count):
+                f.write(f'<kw name="Keyword {kw_idx}" library="BuiltIn"><arg>value {kw_idx}</arg>'
+                        f'<msg timestamp="20240101 10:00:00.100" level="INFO">message {kw_idx}</msg>'
+                        f'<status {status}/></kw>\n')
+
+            text = "Failure occurred and exit-on-failure mode is in use." if test_idx == test_count - 1 else ""
+            f.write(f'<status status="PASS" starttime="20240101 10:{test_idx:02d}:00.000" '
+                    f'endtime="20240101 10:{test_idx:02d}:30.250">{text}</status>\n</test>\n')
+
+        f.write(f'<status {status}/>\n</suite>\n</robot>\n')
+
+
+def _measure(fct):
+    # timed without tracemalloc, which slows down the allocations
+    start = time.perf_counter()
+    result = fct()
+    duration = time.perf_counter() - start
+
+    tracemalloc.start()
+    fct()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return duration, peak, result
+
+
+def benchmark(store, output_xml, tmp_dir):
+    # the store parses <dirname>/<output_dir>/output.xml
+    dirname = pathlib.Path(tmp_dir)
+    (dirname / OUTPUT_DIR).mkdir(parents=True, exist_ok=True)
+    shutil.copyfile(output_xml, dirname / OUTPUT_DIR / "output.xml")
+
+    previous_time, previous_peak, previous = _measure(lambda: previous_parser(output_xml))
+    current_time, current_peak, current = _measure(lambda: store._parse_ods_ci_output_xml(dirname, OUTPUT_DIR))
+
+    same = current == previous
+    print(f"{output_xml} ({pathlib.Path(output_xml).stat().st_size / 1024 / 1024:.1f} MB, {len(previous)} steps)")
+    print(f"  xmltodict  {previous_time:6.2f} s  {previous_peak / 1024 / 1024:7.1f} MB peak")
+    print(f"  iterparse  {current_time:6.2f} s  {current_peak / 1024 / 1024:7.1f} MB peak")
+    print(f"  {'same steps' if same else 'DIFFERENT STEPS'}")
+
+    return same
+
+
+def main():
+    store = importlib.import_module(STORE_MODULE)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output_xmls = sys.argv[1:]
+        if not output_xmls:
+            output_xmls = [pathlib.Path(tmp_dir) / "generated_output.xml"]
+            generate_output_xml(output_xmls[0])
+
+        same = [benchmark(store, output_xml, pathlib.Path(tmp_dir) / f"run-{idx}")
+                for idx, output_xml in enumerate(output_xmls)]
+
+    return 0 if all(same) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
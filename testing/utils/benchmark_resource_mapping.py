@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+
+"""
+Compares the Pod/Node mapping timeline generator of the codeflare and
+load-aware plots (ResourceMappingTimeline_generate_data) with its
+previous, row-by-row implementation: same output, and generation time.
+
+Usage: benchmark_resource_mapping.py [POD_COUNT [NODE_COUNT]]
+  (default: 10000 Pods on 100 Nodes, synthetic timestamps)
+
+Run from the TOPSAIL directory, with the visualization dependencies
+(pandas, plotly, matrix_benchmarking) installed.
+"""
+
+from collections import defaultdict
+import importlib.util
+import datetime
+import pathlib
+import random
+import types
+import time
+import sys
+
+import pandas as pd
+
+TOPSAIL_DIR = pathlib.Path(__file__).absolute().parent.parent.parent
+sys.path.insert(0, str(TOPSAIL_DIR))
+
+import topsail.visualizations.records as topsail_records
+
+# loaded directly, without their workload package (and its store)
+MAPPING_FILES = {
+    "codeflare": TOPSAIL_DIR / "projects/codeflare/visualizations/codeflare/plotting/mapping.py",
+    "load-aware": TOPSAIL_DIR / "projects/load-aware/visualizations/load-aware/plotting/mapping.py",
+}
+
+REPEAT = 3
+
+YOTA = datetime.timedelta(microseconds=1)
+
+
+def _previous_steps(events, with_start_end, entry):
+    # the previous implementation, after the generation of the events.
+    # The sort is stable here, so that the events at the same time are in a deterministic order
+    df = pd.DataFrame(events).sort_values(by="Time", kind="stable")
+    node_pod_count = defaultdict(int)
+    data = []
+    for index, row in df.iterrows():
+        step = dict(Time=row.Time - YOTA, Count=node_pod_count[row.NodeName], NodeName=row.NodeName)
+        if "Instance" in row: step["Instance"] = row.Instance
+        data.append(step)
+
+        node_pod_count[row.NodeName] += row.Inc
+
+        step = dict(Time=row.Time, Count=node_pod_count[row.NodeName], NodeName=row.NodeName)
+        if "Instance" in row: step["Instance"] = row.Instance
+        data.append(step)
+
+    if with_start_end:
+        for node in node_pod_count.keys():
+            data.insert(0, dict(Time=entry.results.test_start_end_time.start, Count=0, NodeName=node))
+            data.append(dict(Time=entry.results.test_start_end_time.end, Count=0, NodeName=node))
+
+    return pd.DataFrame(data)
+
+
+def previous_codeflare(entry):
+    events = []
+    hostnames_index = list(entry.results.nodes_info.keys()).index
+    for pod_time in entry.results.pod_times:
+        hostname = pod_time.hostname
+        finish = getattr(pod_time, "container_finished", False) or entry.results.test_start_end_time.end
+        node_name = f"Node {hostnames_index(hostname)}<br>{hostname}"
+        events.append(dict(Time=pod_time.start_time, Inc=1, NodeName=node_name, PodName=pod_time.pod_friendly_name))
+        events.append(dict(Time=finish, Inc=-1, NodeName=node_name, PodName=pod_time.pod_friendly_name))
+
+    return _previous_steps(events, True, entry)
+
+
+def previous_load_aware(entry):
+    events = []
+    hostnames_index = list(entry.results.nodes_info.keys()).index
+    for pod_time in entry.results.pods_info:
+        hostname = pod_time.hostname
+        node_name = f"Node {hostnames_index(hostname)}<br>{hostname}"
+        for ts, inc in ((pod_time.start_time, 1), (pod_time.container_finished, -1)):
+            events.append(dict(Time=ts, Inc=inc, NodeName=node_name, PodName=pod_time.pod_name, Instance=hostname))
+
+    return _previous_steps(events, False, entry)
+
+
+def load_mapping(name):
+    spec = importlib.util.spec_from_file_location(f"mapping_{name.replace('-', '_')}", MAPPING_FILES[name])
+    mapping = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mapping)
+
+    return mapping
+
+
+def generate_entry(pod_count, node_count):
+    rnd = random.Random(42)
+    start = datetime.datetime(2024, 1, 1)
+    end = start + datetime.timedelta(hours=2)
+
+    nodes = [f"node-{idx}" for idx in range(node_count)]
+    pod_times = []
+    for idx in range(pod_count):
+        pod_start = start + datetime.timedelta(microseconds=rnd.randrange(3600 * 10**6))
+        pod_times.append(topsail_records.PodTimes(
+            pod_name=f"pod-{idx}",
+            pod_friendly_name=f"pod-{idx}",
+            hostname=rnd.choice(nodes),
+            workload=None,
+            start_time=pod_start,
+            container_finished=pod_start + datetime.timedelta(microseconds=rnd.randrange(1, 3600 * 10**6)),
+        ))
+
+    results = types.SimpleNamespace(
+        nodes_info={node: None for node in nodes},
+        pod_times=pod_times,
+        pods_info=pod_times,
+        test_start_end_time=types.SimpleNamespace(start=start, end=end),
+    )
+
+    return types.SimpleNamespace(results=results)
+
+
+def _timeit(fct):
+    durations = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = fct()
+        durations.append(time.perf_counter() - start)
+
+    return min(durations), result
+
+
+def main():
+    pod_count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    node_count = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    entry = generate_entry(pod_count, node_count)
+
+    candidates = [
+        ("codeflare", previous_codeflare, lambda mapping: mapping.ResourceMappingTimeline_generate_data(entry)),
+        ("load-aware", previous_load_aware, lambda mapping: mapping.ResourceMappingTimeline_generate_data(entry, None)),
+    ]
+
+    failed = False
+    for name, previous, current in candidates:
+        mapping = load_mapping(name)
+
+        previous_time, previous_df = _timeit(lambda: previous(entry))
+        current_time, current_df = _timeit(lambda: current(mapping))
+
+        current_df = current_df[list(previous_df.columns)]
+        try:
+            pd.testing.assert_frame_equal(previous_df.reset_index(drop=True), current_df.reset_index(drop=True),
+                                          check_dtype=False)
+            same = "same output"
+        except AssertionError as e:
+            same = f"DIFFERENT OUTPUT: {e}"
+            failed = True
+
+        print(f"{name}: {pod_count} Pods on {node_count} Nodes: "
+              f"previous {previous_time * 1000:.0f} ms, current {current_time * 1000:.0f} ms "
+              f"(x{previous_time / current_time:.0f}), {same}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+
+"""
+Compares the cache serializers of the stores on real result
+directories: file size, write time, load time (all the sections) and
+open time (only the header and inline attributes).
+
+Usage: benchmark_store_cache.py RESULTS_DIR...
+  (the cache files of the stores are searched in the RESULTS_DIRs)
+
+The cache files saved with pickle are trusted and loaded here, the
+store modules they refer to must be importable (run from the TOPSAIL
+directory).
+"""
+
+import tempfile
+import pathlib
+import time
+import sys
+import os
+
+TOPSAIL_DIR = pathlib.Path(__file__).absolute().parent.parent.parent
+sys.path.insert(0, str(TOPSAIL_DIR))
+
+import topsail.visualizations.cache_serializer as topsail_cache_serializer
+import topsail.visualizations.result_cache as topsail_result_cache
+
+CACHE_FILENAMES = ["cache.pickle", "kserve-prom.cache.pickle"]
+
+REPEAT = 3
+
+# (label, serializer, compression)
+CANDIDATES = [
+    ("pickle", "pickle", "none"),
+    ("pickle+zstd", "pickle", "zstd"),
+    ("msgpack", "msgpack", "none"),
+    ("msgpack+zlib", "msgpack", "zlib"),
+    ("msgpack+zstd", "msgpack", "zstd"),
+]
+
+
+def _timeit(fct):
+    durations = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = fct()
+        durations.append(time.perf_counter() - start)
+
+    return min(durations), result
+
+
+def benchmark(cache_file, tmp_dir):
+    results = topsail_result_cache.load(cache_file, allow_pickle=True)
+    if results is None:
+        print(f"{cache_file}: cannot be loaded, skipping.")
+        return
+
+    if isinstance(results, topsail_result_cache.LazyResults):
+        results = results.load_all()
+
+    if getattr(getattr(results, "test_config", None), "get", None) is not None:
+        results.test_config.get = None # not serializable, rebuilt by the stores
+
+    print(f"{cache_file} ({cache_file.stat().st_size / 1024:.0f} KiB on disk)")
+    for label, serializer, compression in CANDIDATES:
+        if serializer == "msgpack" and topsail_cache_serializer.msgpack is None \
+           or compression == "zstd" and topsail_cache_serializer.zstandard is None:
+            print(f"  {label:14s} not available")
+            continue
+
+        filename = tmp_dir / f"{label}.cache"
+        write_time, saved = _timeit(lambda: topsail_result_cache.dump(filename, results, serializer, compression))
+        if not saved:
+            print(f"  {label:14s} failed, see the logs")
+            continue
+
+        open_time, _ = _timeit(lambda: topsail_result_cache.load(filename, allow_pickle=True))
+        load_time, _ = _timeit(lambda: topsail_result_cache.load(filename, allow_pickle=True).load_all())
+
+        print(f"  {label:14s} {filename.stat().st_size / 1024:8.0f} KiB"
+              f"  write {write_time * 1000:7.1f} ms"
+              f"  load {load_time * 1000:7.1f} ms"
+              f"  open {open_time * 1000:6.1f} ms")
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__.strip())
+        return 1
+
+    cache_files = []
+    for results_dir in sys.argv[1:]:
+        for dirpath, _dirnames, filenames in os.walk(results_dir, followlinks=True):
+            cache_files += [pathlib.Path(dirpath) / name for name in filenames if name in CACHE_FILENAMES]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for cache_file in sorted(cache_files):
+            benchmark(cache_file, pathlib.Path(tmp_dir))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+
+"""
+Measures the import time of the store of each visualization workload,
+as done by `matbench parse`, and tells which plotting modules it pulls.
+
+The LTS path is measured too: the import of the LTS module of the
+workload and its build_lts_payloads() call, on an empty matrix (only
+the initialization, eg, the Prometheus metric definitions, is timed).
+
+Usage: benchmark_store_imports.py [WORKLOAD_DIR...]
+  (default: all the projects/*/visualizations/* workloads)
+"""
+
+import subprocess
+import pathlib
+import json
+import sys
+
+TOPSAIL_DIR = pathlib.Path(__file__).absolute().parent.parent.parent
+
+# should not be imported by the parse-only runs
+PLOTTING_MODULES = ["plotly", "pandas", "dash", "matrix_benchmarking.plotting.prom"]
+
+REPEAT = 3
+
+IMPORT_CODE = """
+import importlib, json, sys, time
+
+start = time.perf_counter()
+importlib.import_module(sys.argv[1])
+duration = time.perf_counter() - start
+
+print(json.dumps(dict(duration=duration, plotting=[name for name in json.loads(sys.argv[2]) if name in sys.modules])))
+"""
+
+LTS_CODE = """
+import importlib, json, sys, time
+
+start = time.perf_counter()
+module = importlib.import_module(sys.argv[1])
+list(module.build_lts_payloads())
+duration = time.perf_counter() - start
+
+print(json.dumps(dict(duration=duration, plotting=[name for name in json.loads(sys.argv[2]) if name in sys.modules])))
+"""
+
+
+def get_lts_module(workload_dir):
+    # store/lts.py, or lts.py next to a single-file store
+    for lts_file in workload_dir / "store" / "lts.py", workload_dir / "lts.py":
+        if lts_file.exists():
+            return ".".join(lts_file.with_suffix("").relative_to(TOPSAIL_DIR).parts)
+
+    return None
+
+
+def benchmark(module, code=IMPORT_CODE):
+    durations = []
+    for _ in range(REPEAT):
+        # a new interpreter each time, nothing cached in sys.modules
+        proc = subprocess.run([sys.executable, "-c", code, module, json.dumps(PLOTTING_MODULES)],
+                              cwd=TOPSAIL_DIR, capture_output=True, text=True)
+        if proc.returncode != 0:
+            return module, None, proc.stderr.strip().splitlines()[-1:]
+
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        durations.append(result["duration"])
+
+    return module, min(durations), result["plotting"]
+
+
+def main():
+    workload_dirs = [pathlib.Path(arg).absolute() for arg in sys.argv[1:]] \
+        or sorted(path.parent for path in TOPSAIL_DIR.glob("projects/*/visualizations/*/store*"))
+
+    for workload_dir in dict.fromkeys(workload_dirs):
+        modules = [(".".join(workload_dir.relative_to(TOPSAIL_DIR).parts) + ".store", IMPORT_CODE, "import")]
+        if lts_module := get_lts_module(workload_dir):
+            modules.append((lts_module, LTS_CODE, "build_lts_payloads"))
+
+        for module, code, what in modules:
+            module, duration, plotting = benchmark(module, code)
+            if duration is None:
+                print(f"{module}: {what} failed: {' '.join(plotting)}")
+                continue
+
+            print(f"{module}: {what}: {duration*1000:.0f} ms" + (f" (plotting modules imported: {', '.join(plotting)})" if plotting else ""))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -28,6 +28,15 @@ def report_index_to_html(report_index):
     print("<br>")
     for json_file in sorted(report_dir.glob("*.json")):
         add_entry(json_file)
+
+    # the figure pages, they may share the plotly.min.js bundle of the report directory
+    figure_files = sorted((report_dir / "figures_html").glob("*.html"))
+    if figure_files:
+        print("<br>")
+        print(f"<li><details><summary>{len(figure_files)} figures</summary><ul>")
+        for figure_file in figure_files:
+            add_entry(figure_file)
+        print("</ul></details></li>")
     print("</ul>")
     print("<br/>")
 
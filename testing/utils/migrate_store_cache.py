@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+
+"""
+Converts the store cache files saved with pickle (before the msgpack
+cache serializer) to the cache serializer in use, so that the next
+parses reuse them instead of parsing the results again.
+
+Usage: migrate_store_cache.py RESULTS_DIR...
+  (the cache files of the stores are searched in the RESULTS_DIRs)
+
+The cache files are loaded with pickle: only run it on trusted results
+directories, eg, the ones parsed locally. The store modules the files
+refer to must be importable (run from the TOPSAIL directory).
+"""
+
+import pathlib
+import logging
+import sys
+import os
+
+TOPSAIL_DIR = pathlib.Path(__file__).absolute().parent.parent.parent
+sys.path.insert(0, str(TOPSAIL_DIR))
+
+import topsail.visualizations.cache_serializer as topsail_cache_serializer
+import topsail.visualizations.result_cache as topsail_result_cache
+
+CACHE_FILENAMES = ["cache.pickle", "kserve-prom.cache.pickle"]
+
+
+def main():
+    logging.getLogger().setLevel(logging.INFO)
+
+    if len(sys.argv) < 2:
+        print(__doc__.strip())
+        return 1
+
+    serializer_name = topsail_cache_serializer.get_serializer_name()
+    if serializer_name == "pickle":
+        print("pickle is the cache serializer in use, nothing to migrate.")
+        return 0
+
+    migrated = failed = 0
+    for results_dir in sys.argv[1:]:
+        for dirpath, _dirnames, filenames in os.walk(results_dir, followlinks=True):
+            for name in filenames:
+                if name not in CACHE_FILENAMES: continue
+                cache_file = pathlib.Path(dirpath) / name
+
+                if topsail_result_cache.get_file_serializer(cache_file) != "pickle":
+                    continue
+
+                try:
+                    success = topsail_result_cache.migrate_pickle(cache_file)
+                except Exception as e:
+                    logging.error(f"{cache_file}: {e.__class__.__name__}: {e}")
+                    success = False
+
+                if success:
+                    migrated += 1
+                    print(f"{cache_file}: migrated to {serializer_name}")
+                else:
+                    failed += 1
+                    print(f"{cache_file}: cannot be migrated, it will be parsed again")
+
+    print(f"{migrated} cache file(s) migrated, {failed} failed.")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+
+"""
+Tests the Ansible log helpers (topsail.visualizations.ansible_log):
+the start/end times and the play/task boundary index.
+
+Usage: test_ansible_log.py
+  (or: python -m pytest testing/utils/test_ansible_log.py)
+"""
+
+import unittest
+import datetime
+import tempfile
+import pathlib
+import json
+import sys
+import os
+
+TOPSAIL_DIR = pathlib.Path(__file__).absolute().parent.parent.parent
+sys.path.insert(0, str(TOPSAIL_DIR))
+
+import topsail.visualizations.ansible_log as ansible_log
+
+LOG_PREFIX = "p=770 u=psap-ci-runner n=ansible |"
+
+LOG = f"""\
+2023-04-14 17:19:19,808 {LOG_PREFIX} ansible-playbook 2.9.27
+2023-04-14 17:19:20,123 {LOG_PREFIX} PLAY [Run the test] ****
+2023-04-14 17:19:21,456 {LOG_PREFIX} TASK [test : prepare the namespace] ****
+  continuation line, no timestamp
+2023-04-14 17:20:02,000 {LOG_PREFIX} TASK [test : run the test] ****
+2023-04-14 17:25:00,000 {LOG_PREFIX} PLAY RECAP ****
+"""
+
+
+class AnsibleLogTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.log_file = pathlib.Path(self.tmp_dir.name) / "_ansible.log"
+        self.log_file.write_text(LOG)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_start_end_times(self):
+        start, end = ansible_log.parse_start_end_times(self.log_file)
+
+        self.assertEqual(start, datetime.datetime(2023, 4, 14, 17, 19, 19))
+        self.assertEqual(end, datetime.datetime(2023, 4, 14, 17, 25, 0))
+
+    def test_boundaries(self):
+        boundaries = ansible_log.parse_boundaries(self.log_file)
+
+        self.assertEqual([(b.kind, b.name) for b in boundaries],
+                         [("play", "Run the test"),
+                          ("task", "test : prepare the namespace"),
+                          ("task", "test : run the test")])
+        self.assertEqual(boundaries[2].time, datetime.datetime(2023, 4, 14, 17, 20, 2))
+
+        index_file = ansible_log._get_index_file(self.log_file)
+        self.assertTrue(index_file.exists())
+
+        # the index is reused, the log isn't scanned again
+        with open(index_file) as f:
+            index = json.load(f)
+        index["boundaries"][0]["name"] = "from the index"
+        with open(index_file, "w") as f:
+            json.dump(index, f)
+
+        self.assertEqual(ansible_log.parse_boundaries(self.log_file)[0].name, "from the index")
+
+    def test_boundaries_index_rebuilt(self):
+        ansible_log.parse_boundaries(self.log_file)
+
+        # the log grows: the index is outdated
+        with open(self.log_file, "a") as f:
+            f.write(f"2023-04-14 17:26:00,000 {LOG_PREFIX} PLAY [Cleanup] ****\n")
+
+        boundaries = ansible_log.parse_boundaries(self.log_file)
+        self.assertEqual(len(boundaries), 4)
+        self.assertEqual(boundaries[-1].name, "Cleanup")
+
+        # the log is rewritten with the same size: only its mtime changes
+        stat = self.log_file.stat()
+        self.log_file.write_text(self.log_file.read_text().replace("Cleanup", "Cleanuq"))
+        os.utime(self.log_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        self.assertEqual(ansible_log.parse_boundaries(self.log_file)[-1].name, "Cleanuq")
+
+    def test_boundaries_invalid_index(self):
+        ansible_log._get_index_file(self.log_file).write_text("not json")
+
+        with self.assertLogs(level="WARNING"):
+            boundaries = ansible_log.parse_boundaries(self.log_file)
+
+        self.assertEqual(len(boundaries), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
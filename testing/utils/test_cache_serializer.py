@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+
+"""
+Tests the round trip of the store results through the cache files
+(topsail.visualizations.result_cache and cache_serializer).
+
+Usage: test_cache_serializer.py
+  (or: python -m pytest testing/utils/test_cache_serializer.py)
+
+With TOPSAIL_CACHE_TEST_RESULTS_DIRS=DIR[:DIR...], the results of the
+store cache files found in these directories go through the round trip
+too. They are loaded with pickle when they were saved with it: only
+for trusted results directories.
+"""
+
+import collections
+import unittest
+import datetime
+import tempfile
+import pathlib
+import types
+import enum
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+TOPSAIL_DIR = pathlib.Path(__file__).absolute().parent.parent.parent
+sys.path.insert(0, str(TOPSAIL_DIR))
+
+import topsail.visualizations.cache_serializer as cache_serializer
+import topsail.visualizations.result_cache as result_cache
+import topsail.visualizations.records as records
+
+ENV_RESULTS_DIRS = "TOPSAIL_CACHE_TEST_RESULTS_DIRS"
+
+CACHE_FILENAMES = ["cache.pickle", "kserve-prom.cache.pickle"]
+
+
+class Status(enum.Enum):
+    PASSED = "passed"
+    FAILED = "failed"
+
+
+class Unregistered():
+    pass
+
+
+def store_like_results():
+    # the types the stores put in their results
+    start = datetime.datetime(2024, 1, 1, 10, 0, 0, 123456)
+
+    pods = [records.PodTimes(pod_name=f"pod-{idx}", user_index=idx, is_dspa=idx % 2 == 0,
+                             creation_time=start, start_time=start + datetime.timedelta(seconds=idx))
+            for idx in range(100)]
+
+    return types.SimpleNamespace(
+        test_config=types.SimpleNamespace(yaml_file={"tests": {"mode": "scale", "users": [1, 2, 3]}}, name="config"),
+        start_time=start,
+        end_time=datetime.datetime(2024, 1, 1, 12, tzinfo=datetime.timezone.utc),
+        day=start.date(),
+        duration=datetime.timedelta(minutes=90),
+        timestamp=pd.Timestamp("2024-01-01 10:00:00.123456789", tz="UTC"),
+        no_timestamp=pd.NaT,
+        delta=pd.Timedelta(seconds=1.5),
+        location=pathlib.Path("/results/001__test"),
+        pod_times=pods,
+        by_user=collections.defaultdict(types.SimpleNamespace, {0: types.SimpleNamespace(exit_code=0)}),
+        settings=("expe", "scale"),
+        labels={"a", "b"},
+        status=Status.PASSED,
+        samples=np.arange(5000, dtype=np.float64) / 3,
+        missing=np.array([1.0, np.nan]),
+        count=np.int64(42),
+        ratio=float("nan"),
+        raw=b"\x00\x01",
+        nothing=None,
+    )
+
+
+class CacheSerializerTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_file = pathlib.Path(self.tmp_dir.name) / "cache.pickle"
+
+        self.env = {key: os.environ.get(key) for key in (result_cache.ENV_STRICT, cache_serializer.ENV_SERIALIZER)}
+        os.environ.pop(cache_serializer.ENV_SERIALIZER, None)
+        os.environ[result_cache.ENV_STRICT] = "y"
+
+    def tearDown(self):
+        for key, value in self.env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+        self.tmp_dir.cleanup()
+
+    def _round_trip(self, results):
+        self.assertTrue(result_cache.dump(self.cache_file, results))
+
+        reloaded = result_cache.load(self.cache_file)
+        self.assertIsInstance(reloaded, result_cache.LazyResults)
+
+        return reloaded.load_all()
+
+    def test_round_trip(self):
+        results = store_like_results()
+
+        reloaded = self._round_trip(results)
+
+        cache_serializer.check_round_trip(results, reloaded)
+        self.assertIs(type(reloaded.timestamp), pd.Timestamp)
+        self.assertEqual(reloaded.timestamp.nanosecond, 789)
+        self.assertIs(reloaded.no_timestamp, pd.NaT)
+        self.assertIs(type(reloaded.delta), pd.Timedelta)
+        self.assertIs(reloaded.by_user.default_factory, types.SimpleNamespace)
+        self.assertEqual(reloaded.pod_times, results.pod_times)
+
+    def test_check_round_trip(self):
+        with self.assertRaisesRegex(TypeError, r"results.start: .*Timestamp.* comes back as 'datetime.datetime'"):
+            cache_serializer.check_round_trip(types.SimpleNamespace(start=pd.Timestamp("2024-01-01")),
+                                              types.SimpleNamespace(start=datetime.datetime(2024, 1, 1)))
+
+        with self.assertRaisesRegex(TypeError, r"results\['a'\]\[1\]: the value changed"):
+            cache_serializer.check_round_trip({"a": [1, 2]}, {"a": [1, 3]})
+
+    def test_unserializable(self):
+        results = types.SimpleNamespace(ok=1, bad=Unregistered())
+
+        # strict: fails loudly, with the name of the attribute
+        with self.assertLogs(level="ERROR"), self.assertRaisesRegex(TypeError, "attribute 'bad'"):
+            result_cache.dump(self.cache_file, results)
+        self.assertFalse(self.cache_file.exists())
+
+        # not strict: no cache file, the results will be parsed again
+        os.environ[result_cache.ENV_STRICT] = "n"
+        with self.assertLogs(level="ERROR"):
+            self.assertFalse(result_cache.dump(self.cache_file, results))
+        self.assertFalse(self.cache_file.exists())
+
+    def test_results_dirs(self):
+        results_dirs = [dirname for dirname in os.environ.get(ENV_RESULTS_DIRS, "").split(":") if dirname]
+        if not results_dirs:
+            self.skipTest(f"{ENV_RESULTS_DIRS} not set")
+
+        cache_files = [path for dirname in results_dirs for name in CACHE_FILENAMES
+                       for path in pathlib.Path(dirname).rglob(name)]
+        if not cache_files:
+            self.skipTest(f"No cache file in {ENV_RESULTS_DIRS}")
+
+        for cache_file in cache_files:
+            with self.subTest(cache_file=str(cache_file)):
+                results = result_cache.load(cache_file, allow_pickle=True)
+                if results is None:
+                    self.skipTest(f"{cache_file} cannot be loaded")
+
+                if isinstance(results, result_cache.LazyResults):
+                    results = results.load_all()
+
+                cache_serializer.check_round_trip(results, self._round_trip(results))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+
+"""
+Tests the OpenSearch bulk exporter (topsail.testing.opensearch_export)
+against a local mock of the _bulk endpoint.
+
+Usage: test_opensearch_export.py
+  (or: python -m pytest testing/utils/test_opensearch_export.py)
+"""
+
+import http.server
+import threading
+import unittest
+import datetime
+import pathlib
+import types
+import json
+import sys
+
+import numpy as np
+
+TOPSAIL_DIR = pathlib.Path(__file__).absolute().parent.parent.parent
+sys.path.insert(0, str(TOPSAIL_DIR))
+
+import topsail.testing.opensearch_export as opensearch_export
+
+
+class MockBulkHandler(http.server.BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status, content):
+        body = json.dumps(content).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        server = self.server
+        lines = self.rfile.read(int(self.headers["Content-Length"])).decode().splitlines()
+        actions = [(json.loads(action)["index"], json.loads(document))
+                   for action, document in zip(lines[0::2], lines[1::2])]
+
+        with server.lock:
+            server.requests += 1
+
+            if any(document.get("reject") for _, document in actions):
+                return self._reply(400, dict(error="mapper_parsing_exception"))
+
+            if any(document.get("not_json") for _, document in actions):
+                body = b"<html>proxy page</html>"
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                return self.wfile.write(body)
+
+            items = []
+            for action, document in actions:
+                doc_id = action["_id"]
+                if document.get("throttle") and doc_id not in server.throttled:
+                    server.throttled.add(doc_id) # rejected once, accepted on retry
+                    status = 429
+                else:
+                    server.documents[(action["_index"], doc_id)] = document
+                    status = 201
+
+                items.append({"index": {"_id": doc_id, "status": status}})
+
+        self._reply(200, dict(errors=False, items=items))
+
+
+class OpenSearchExportTest(unittest.TestCase):
+    def setUp(self):
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), MockBulkHandler)
+        self.server.lock = threading.Lock()
+        self.server.documents = {}
+        self.server.throttled = set()
+        self.server.requests = 0
+
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+        self.backoff_base = opensearch_export.BACKOFF_BASE
+        opensearch_export.BACKOFF_BASE = 0
+
+    def tearDown(self):
+        opensearch_export.BACKOFF_BASE = self.backoff_base
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _payload(self, idx, **kwargs):
+        start = datetime.datetime(2024, 1, 1) + datetime.timedelta(hours=idx)
+        return types.SimpleNamespace(
+            metadata=types.SimpleNamespace(settings=dict(idx=idx), start=start, end=start + datetime.timedelta(minutes=30)),
+            results=types.SimpleNamespace(values=np.arange(3) * idx),
+            **kwargs,
+        )
+
+    def _export(self, payloads):
+        return opensearch_export.export_lts_payloads(((payload, None, None) for payload in payloads),
+                                                     self.url, "lts", batch_documents=100)
+
+    def test_export(self):
+        payloads = [self._payload(idx, throttle=(idx % 7 == 0)) for idx in range(250)]
+
+        stats = self._export(payloads)
+
+        self.assertEqual(stats.indexed, 250)
+        self.assertEqual(stats.failed, 0)
+        self.assertEqual(stats.retries, 3) # one per batch with throttled items
+        self.assertEqual(len(self.server.documents), 250)
+
+        document = self.server.documents[("lts", opensearch_export.get_document_id(opensearch_export._to_document(payloads[3])))]
+        self.assertEqual(document["metadata"]["start"], "2024-01-01T03:00:00")
+        self.assertEqual(document["results"]["values"], [0, 3, 6])
+
+        # same document IDs, the documents are overwritten
+        self._export(payloads)
+        self.assertEqual(len(self.server.documents), 250)
+
+    def test_rejected_batch(self):
+        payloads = [self._payload(idx, reject=(idx == 150)) for idx in range(250)]
+
+        stats = self._export(payloads)
+
+        # the batch of the rejected document fails, the other batches are indexed
+        self.assertEqual(stats.indexed, 150)
+        self.assertEqual(stats.failed, 100)
+        self.assertEqual({error["status"] for error in stats.errors}, {400})
+        self.assertEqual(len(self.server.documents), 150)
+
+    def test_invalid_response(self):
+        payloads = [self._payload(idx, not_json=(idx == 50)) for idx in range(250)]
+
+        stats = self._export(payloads)
+
+        # the batch with the non-JSON response is counted as rejected
+        self.assertEqual(stats.indexed, 150)
+        self.assertEqual(stats.failed, 100)
+        self.assertEqual({error["status"] for error in stats.errors}, {200})
+        self.assertEqual(len(self.server.documents), 150)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+
+"""
+Tests the memoization of the files shared by the runs of a matrix
+(topsail.visualizations.parse_memo).
+
+Usage: test_parse_memo.py
+  (or: python -m pytest testing/utils/test_parse_memo.py)
+"""
+
+import unittest
+import tempfile
+import pathlib
+import sys
+
+TOPSAIL_DIR = pathlib.Path(__file__).absolute().parent.parent.parent
+sys.path.insert(0, str(TOPSAIL_DIR))
+
+import topsail.visualizations.parse_memo as parse_memo
+
+PARSE_CALLS = []
+
+
+def _parse_nodes(content, cluster):
+    PARSE_CALLS.append(cluster)
+    return [dict(name=name, cluster=cluster) for name in content.decode().split()]
+
+
+class ParseMemoTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.dirname = pathlib.Path(self.tmp_dir.name)
+        parse_memo.clear()
+        PARSE_CALLS.clear()
+
+    def tearDown(self):
+        parse_memo.clear()
+        self.tmp_dir.cleanup()
+
+    def test_parsed_once(self):
+        # two runs, same content
+        for run in "run1", "run2":
+            (self.dirname / run).mkdir()
+            (self.dirname / run / "nodes").write_text("node-1 node-2")
+
+        nodes1 = parse_memo.parse_file(self.dirname / "run1" / "nodes", _parse_nodes, "sutest")
+        nodes2 = parse_memo.parse_file(self.dirname / "run2" / "nodes", _parse_nodes, "sutest")
+        self.assertEqual(nodes1, nodes2)
+        self.assertEqual(PARSE_CALLS, ["sutest"])
+
+        # other args: parsed again
+        parse_memo.parse_file(self.dirname / "run1" / "nodes", _parse_nodes, "driver")
+        self.assertEqual(PARSE_CALLS, ["sutest", "driver"])
+
+    def test_not_shared(self):
+        config_file = self.dirname / "config.yaml"
+        config_file.write_text("tests:\n  users: [1, 2]\n")
+
+        config = parse_memo.load_yaml(config_file)
+        config["tests"]["users"].append(3)
+        config["extra"] = True
+
+        # the changes of a run don't leak to the others
+        self.assertEqual(parse_memo.load_yaml(config_file), {"tests": {"users": [1, 2]}})
+
+    def test_missing_file(self):
+        with self.assertRaises(FileNotFoundError):
+            parse_memo.read_text(self.dirname / "rhods.version")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,322 @@
+#! /usr/bin/env python
+
+import concurrent.futures
+import datetime
+import pathlib
+import threading
+import logging
+import hashlib
+import random
+import types
+import json
+import time
+import sys
+
+import fire
+import requests
+import requests.adapters
+
+# bulk request limits, whichever comes first
+BATCH_DOCUMENTS = 500
+BATCH_BYTES = 5 * 1024 * 1024
+
+DEFAULT_CONCURRENCY = 4
+
+# retried with exponential backoff, the whole request or the bulk items
+RETRY_STATUSES = (429, 502, 503, 504)
+MAX_RETRIES = 6
+BACKOFF_BASE = 0.5 # seconds
+BACKOFF_MAX = 30 # seconds
+
+
+def _json_default(obj):
+    if isinstance(obj, types.SimpleNamespace):
+        return obj.__dict__
+
+    if isinstance(obj, (datetime.datetime, datetime.date)):
+        return obj.isoformat()
+
+    if isinstance(obj, pathlib.PurePath):
+        return str(obj)
+
+    if hasattr(obj, "tolist"): # numpy arrays and values
+        return obj.tolist()
+
+    if hasattr(obj, "model_dump"): # pydantic v2
+        return obj.model_dump(mode="json", by_alias=True)
+
+    if hasattr(obj, "dict"): # pydantic v1
+        return obj.dict(by_alias=True)
+
+    raise TypeError(f"Object of type {obj.__class__.__name__} is not JSON serializable")
+
+
+def _to_document(payload):
+    """
+    Returns the payload as a document of plain dicts and lists. The
+    values (datetimes, numpy arrays, ...) are converted only when the
+    document is serialized, in the bulk request body.
+    """
+
+    if hasattr(payload, "model_dump"): # pydantic v2
+        return payload.model_dump(mode="json", by_alias=True)
+
+    if hasattr(payload, "dict") and not isinstance(payload, dict): # pydantic v1
+        return payload.dict(by_alias=True)
+
+    if isinstance(payload, types.SimpleNamespace):
+        payload = payload.__dict__
+
+    if isinstance(payload, dict):
+        return {key: _to_document(value) for key, value in payload.items()}
+
+    if isinstance(payload, (list, tuple)):
+        return [_to_document(value) for value in payload]
+
+    return payload
+
+
+def get_document_id(document):
+    """
+    Returns the ID of an LTS document: the hash of its metadata settings and start/end times,
+    or of the whole document if it has no metadata. Exporting a payload again overwrites it.
+    """
+
+    metadata = document.get("metadata") if isinstance(document, dict) else None
+    if isinstance(metadata, dict) and "start" in metadata:
+        key = {k: metadata.get(k) for k in ("settings", "start", "end")}
+    else:
+        key = document
+
+    return hashlib.sha256(json.dumps(key, sort_keys=True, default=_json_default).encode()).hexdigest()
+
+
+def _backoff(attempt):
+    # full jitter
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+
+class BulkExporter():
+    """
+    Exports documents to an OpenSearch index with the _bulk API
+
+    The documents are sent in batches, at most `concurrency` requests
+    at a time, through a pooled keep-alive session. The requests and
+    the bulk items rejected with 429 (or 502/503/504) are retried with
+    an exponential backoff. The document IDs are deterministic, so
+    retrying or exporting again doesn't create duplicates.
+    """
+
+    def __init__(self, url, index, username=None, password=None, verify=True,
+                 concurrency=DEFAULT_CONCURRENCY, batch_documents=BATCH_DOCUMENTS, batch_bytes=BATCH_BYTES):
+        self.bulk_url = url.rstrip("/") + "/_bulk"
+        self.index = index
+        self.concurrency = concurrency
+        self.batch_documents = batch_documents
+        self.batch_bytes = batch_bytes
+
+        self.session = requests.Session()
+        self.session.mount(self.bulk_url.split("://")[0] + "://",
+                           requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=concurrency))
+        self.session.headers["Content-Type"] = "application/x-ndjson"
+        self.session.verify = verify
+        if username:
+            self.session.auth = (username, password)
+
+        self.stats = types.SimpleNamespace(indexed=0, failed=0, requests=0, retries=0, errors=[])
+        self._stats_lock = threading.Lock() # the batches are sent from multiple threads
+
+    def _count(self, **counts):
+        with self._stats_lock:
+            for name, value in counts.items():
+                if name == "errors":
+                    self.stats.errors += value
+                else:
+                    setattr(self.stats, name, getattr(self.stats, name) + value)
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _action(self, doc_id, document):
+        return (json.dumps({"index": {"_index": self.index, "_id": doc_id}}) + "\n"
+                + json.dumps(document, default=_json_default) + "\n").encode()
+
+    def _reject(self, batch, status, error):
+        # the whole batch is rejected, the next batches are still sent
+        logging.warning(f"OpenSearch {error}")
+        self._count(failed=len(batch),
+                    errors=[dict(id=doc_id, status=status, error=error) for doc_id in batch])
+
+    def _send(self, batch):
+        # batch: dict of doc_id --> bulk action lines
+        for attempt in range(MAX_RETRIES + 1):
+            if attempt:
+                time.sleep(_backoff(attempt))
+                self._count(retries=1)
+
+            self._count(requests=1)
+            try:
+                resp = self.session.post(self.bulk_url, data=b"".join(batch.values()))
+            except requests.ConnectionError as e:
+                logging.warning(f"OpenSearch bulk request failed: {e}")
+                continue
+
+            if resp.status_code in RETRY_STATUSES:
+                logging.info(f"OpenSearch bulk request rejected with {resp.status_code}, retrying ...")
+                continue
+
+            if resp.status_code >= 400:
+                self._reject(batch, resp.status_code, f"bulk request rejected with {resp.status_code}: {resp.text[:200]}")
+                return
+
+            try:
+                items = resp.json().get("items", [])
+            except ValueError as e:
+                # eg, the HTML page of a proxy
+                self._reject(batch, resp.status_code, f"bulk request returned an invalid response ({resp.status_code}): {e}: {resp.text[:200]}")
+                return
+
+            # only the items rejected with a retry status are sent again
+            retry = {}
+            indexed = 0
+            errors = []
+            for item in items:
+                result = next(iter(item.values()))
+                doc_id = result.get("_id")
+                status = result.get("status", 500)
+
+                if status < 300:
+                    indexed += 1
+                elif status in RETRY_STATUSES and doc_id in batch:
+                    retry[doc_id] = batch[doc_id]
+                else:
+                    errors.append(dict(id=doc_id, status=status, error=result.get("error")))
+
+            self._count(indexed=indexed, failed=len(errors), errors=errors)
+
+            if not retry:
+                return
+            batch = retry
+
+        self._count(failed=len(batch),
+                    errors=[dict(id=doc_id, status=None, error="too many retries") for doc_id in batch])
+
+    def _batches(self, documents):
+        batch = {}
+        batch_size = 0
+        for document in documents:
+            doc_id = get_document_id(document)
+            action = self._action(doc_id, document)
+
+            if batch and (len(batch) >= self.batch_documents or batch_size + len(action) > self.batch_bytes):
+                yield batch
+                batch = {}
+                batch_size = 0
+
+            batch[doc_id] = action
+            batch_size += len(action)
+
+        if batch:
+            yield batch
+
+    def export(self, documents):
+        """
+        Exports an iterable of documents, consumed as the batches are sent
+
+        Returns: the stats of the export (indexed, failed, requests, retries, errors)
+        """
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            pending = set()
+            for batch in self._batches(documents):
+                # bounded: the next batch is built only when a request slot is available
+                if len(pending) >= self.concurrency:
+                    done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                    for future in done: future.result()
+
+                pending.add(executor.submit(self._send, batch))
+
+            for future in concurrent.futures.as_completed(pending):
+                future.result()
+
+        return self.stats
+
+
+def export_lts_payloads(lts_payloads, url, index, **kwargs):
+    """
+    Exports the output of a store's build_lts_payloads() to OpenSearch
+
+    Args:
+      lts_payloads: iterable of (payload, start, end), as yielded by build_lts_payloads()
+      url, index, kwargs: see BulkExporter
+    """
+
+    with BulkExporter(url, index, **kwargs) as exporter:
+        stats = exporter.export(_to_document(payload) for payload, _start, _end in lts_payloads)
+
+    logging.info(f"OpenSearch export: {stats.indexed} documents indexed, {stats.failed} failed "
+                 f"({stats.requests} requests, {stats.retries} retries)")
+
+    for error in stats.errors[:10]:
+        logging.error(f"Failed to index {error['id']}: {error['status']} {error['error']}")
+    if len(stats.errors) > 10:
+        logging.error(f"... and {len(stats.errors) - 10} more errors")
+
+    return stats
+
+
+def _load_payload_files(paths):
+    for path in paths:
+        path = pathlib.Path(path)
+        files = sorted(path.glob("**/*.json")) if path.is_dir() else [path]
+        for filename in files:
+            with open(filename) as f:
+                content = json.load(f)
+
+            yield from ((payload, None, None) for payload in (content if isinstance(content, list) else [content]))
+
+
+def export_files(*paths, url, index, username=None, password_file=None, insecure=False, concurrency=DEFAULT_CONCURRENCY):
+    """
+    Exports LTS payload files (or directories of files) to OpenSearch
+
+    Args:
+      paths: JSON files containing a payload or a list of payloads, or directories of such files
+      url: URL of the OpenSearch backend
+      index: index where the payloads are stored
+      username: username to use to login into OpenSearch
+      password_file: file containing the password of the user
+      insecure: if True, doesn't verify the TLS certificate of the backend
+      concurrency: number of bulk requests sent concurrently
+    """
+
+    password = pathlib.Path(password_file).read_text().strip() if password_file else None
+
+    stats = export_lts_payloads(_load_payload_files(paths), url, index,
+                                username=username, password=password,
+                                verify=not insecure, concurrency=concurrency)
+
+    if stats.failed:
+        raise RuntimeError(f"{stats.failed} documents could not be exported to OpenSearch")
+
+
+def main():
+    # Print help rather than opening a pager
+    fire.core.Display = lambda lines, out: print(*lines, file=out)
+
+    fire.Fire(export_files)
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except KeyboardInterrupt:
+        print() # empty line after ^C
+        logging.error("Interrupted.")
+        sys.exit(1)
@@ -10,16 +10,24 @@ import logging
 logging.getLogger().setLevel(logging.INFO)
 
 import fire
+import joblib
 
 TOPSAIL_TESTING_DIR = pathlib.Path(__file__).absolute().parent
 TOPSAIL_DIR = TOPSAIL_TESTING_DIR.parent.parent
 
 from topsail.testing import env, config, run
+import topsail.visualizations.matrix_cache as topsail_matrix_cache
 
 matbench_config = None # will be set in init()
 matbench_workload = None # will be set in init()
 workload_storage_dir = None # will be set in init()
 
+# number of `matbench visualize` running concurrently, if `matbench.visualize_parallel` isn't set
+DEFAULT_VISUALIZE_PARALLEL = 4
+
+# number of figures exported concurrently by the renderer of each `matbench visualize`, if `matbench.visualize_png_concurrency` isn't set
+DEFAULT_PNG_CONCURRENCY = 2
+
 
 def init(allow_no_config_file=False):
     global matbench_config, matbench_workload, workload_storage_dir
@@ -82,22 +90,64 @@ def prepare_matbench():
 
 @entrypoint()
 def generate_visualizations(results_dirname, generate_lts=None):
+    """
+    Parses the results once (internal matrix and LTS payload), then
+    runs one `matbench visualize` per group of filters.
+
+    The figures are rendered by the matbench CLI, in its own process:
+    the visualize pipeline (filters, figure generation and export)
+    lives in the matrix-benchmarking subproject. Each of these
+    processes reloads the results from the store cache written by the
+    parse, it doesn't parse them again.
+    """
+
     visualizations = matbench_config.get_config("visualize")
-    plotting_failed = False
+
+    lts_error = parse_results(results_dirname, generate_lts=generate_lts)
+
+    # the visualizations are independent, except when they write in
+    # the same directory (same filters). They run sequentially then.
+    groups = {} # filters --> list of visualization indexes
     for idx in range(len(visualizations)):
-        generate_visualization(results_dirname, idx, generate_lts=generate_lts)
+        if not matbench_config.get_config(f"visualize[{idx}].generate"):
+            raise ValueError(f"Couldn't get the configuration #{idx} ...")
 
-    if plotting_failed:
-        raise RuntimeError("Som of visualization failed")
+        for filters_to_apply in matbench_config.get_config(f"visualize[{idx}]").get("filters", [None]):
+            groups.setdefault(filters_to_apply or "", []).append(idx)
 
+    if not groups:
+        logging.info("No visualization to generate.")
 
-def generate_visualization(results_dirname, idx, generate_lts=None):
-    generate_list = matbench_config.get_config(f"visualize[{idx}].generate")
-    if not generate_list:
-        raise ValueError(f"Couldn't get the configuration #{idx} ...")
+    n_jobs = config.ci_artifacts.get_config("matbench.visualize_parallel", None, warn=False) or max(1, min(len(groups), DEFAULT_VISUALIZE_PARALLEL))
+    logging.info(f"Generating {len(groups)} visualization group(s), {n_jobs} at a time ...")
 
-    generate_url = "stats=" + "&stats=".join(generate_list)
+    groups_failures = joblib.Parallel(n_jobs=n_jobs, backend="threading")(
+        joblib.delayed(generate_visualization_group)(results_dirname, filters_to_apply, idxs)
+        for filters_to_apply, idxs in groups.items()
+    )
 
+    error = False
+    for failures in groups_failures:
+        if failures is None: continue
+        error = True
+
+        if not failures: continue
+        with open(env.ARTIFACT_DIR / "FAILURE", "a") as fail_f:
+            for line in failures:
+                print(line, end="", file=fail_f)
+
+    if lts_error:
+        msg = "An error happened while parsing the results or generating the LTS payload ..."
+        logging.error(msg)
+        raise RuntimeError(msg)
+
+    if error:
+        msg = "An error happened during the report generation ..."
+        logging.error(msg)
+        raise RuntimeError(msg)
+
+
+def parse_results(results_dirname, generate_lts=None):
     common_args, common_env = get_common_matbench_args_env(results_dirname)
 
     parse_env = common_env.copy()
@@ -106,30 +156,30 @@ def generate_visualization(results_dirname, idx, generate_lts=None):
         logging.info(f"Download mode set to '{mode}', ignoring the parser cache.")
         parse_env["MATBENCH_STORE_IGNORE_CACHE"] = "y"
 
+    do_generate_lts = generate_lts if generate_lts is not None \
+        else config.ci_artifacts.get_config("matbench.generate_lts", False) \
+
+    # a single parse generates the internal matrix and the LTS payload
     parse_args = common_args.copy()
     parse_args["output-matrix"] = env.ARTIFACT_DIR / "internal_matrix.json"
+    if do_generate_lts:
+        parse_args["output-lts"] = env.ARTIFACT_DIR / "lts_payload.json"
 
-    parse_args_str = " ".join(f"'--{k}={v}'" for k, v in parse_args.items())
     parse_env_str = "env " + " ".join(f"'{k}={v}'" for k, v in parse_env.items())
-
-    if run.run(f"{parse_env_str} matbench parse {parse_args_str}  |& tee > {env.ARTIFACT_DIR}/_matbench_parse.log", check=False).returncode != 0:
-        raise RuntimeError("Failed to parse the results ...")
+    parse_args_str = " ".join(f"'--{k}={v}'" for k, v in parse_args.items())
 
     error = False
-    lts_args = common_args.copy()
-    lts_args["output-lts"] = env.ARTIFACT_DIR / "lts_payload.json"
-    lts_args_str = " ".join(f"'--{k}={v}'" for k, v in lts_args.items())
-
-    common_env_str = "env " + " ".join(f"'{k}={v}'" for k, v in common_env.items())
+    if run.run(f"{parse_env_str} matbench parse {parse_args_str}  |& tee > {env.ARTIFACT_DIR}/_matbench_parse.log", check=False).returncode != 0:
+        if not do_generate_lts:
+            raise RuntimeError("Failed to parse the results ...")
 
-    do_generate_lts = generate_lts if generate_lts is not None \
-        else config.ci_artifacts.get_config("matbench.generate_lts", False) \
+        # the results aren't parsed again: the failure may come from the
+        # LTS payload only, and the visualizations load the results
+        # themselves, they report their own errors
+        logging.warning("An error happened while parsing the results or generating the LTS payload ...")
+        error = True
 
     if do_generate_lts:
-        if run.run(f"{common_env_str} matbench parse {lts_args_str} |& tee > {env.ARTIFACT_DIR}/_matbench_generate_lts.log", check=False).returncode != 0:
-            logging.warning("An error happened while generating the LTS payload ...")
-            error = True
-
         lts_schema_args = common_args.copy()
         lts_schema_args.pop("results_dirname")
         lts_schema_args["file"] = env.ARTIFACT_DIR / "lts_payload.schema.json"
@@ -144,49 +194,81 @@ def generate_visualization(results_dirname, idx, generate_lts=None):
             logging.info("matbench.generate_lts not enabled, skipping LTS payload&schema generation.")
 
     if config.ci_artifacts.get_config("matbench.download.save_to_artifacts"):
-        shutil.copytree(common_args["MATBENCH_RESULTS_DIRNAME"], env.ARTIFACT_DIR / "downloaded")
+        shutil.copytree(results_dirname, env.ARTIFACT_DIR / "downloaded")
+
+    return error
+
+
+def generate_visualization_group(results_dirname, filters_to_apply, idxs):
+    """
+    Generates the visualizations of a group sharing the same filters (and destination directory)
+
+    Returns None if the generation succeeded, or the list of ERROR lines of the logs.
+    """
+
+    common_args, common_env = get_common_matbench_args_env(results_dirname)
 
+    # the PNG files are exported all together, at the end of each `matbench visualize`
+    # true, or the list of the filters without PNG export
+    skip_png = config.ci_artifacts.get_config("matbench.visualize_skip_png", False, warn=False)
+    if isinstance(skip_png, str):
+        skip_png = [skip_png]
 
-    filters = matbench_config.get_config(f"visualize[{idx}]").get("filters", [None])
-    for filters_to_apply in filters:
-        if not filters_to_apply:
-            filters_to_apply = ""
+    if skip_png is True or filters_to_apply in (skip_png or []):
+        logging.info(f"PNG export disabled for '{filters_to_apply}', generating only the HTML files.")
+        common_env["TOPSAIL_FIGURE_EXPORT"] = "skip"
+    else:
+        common_env["TOPSAIL_FIGURE_EXPORT"] = "batch"
+        common_env["TOPSAIL_FIGURE_EXPORT_CONCURRENCY"] = \
+            config.ci_artifacts.get_config("matbench.visualize_png_concurrency", None, warn=False) or DEFAULT_PNG_CONCURRENCY
+
+    dest_dir = env.ARTIFACT_DIR / filters_to_apply
+    dest_dir.mkdir(parents=True, exist_ok=True)
+
+    # a single plotly.js bundle at the report root, instead of one copy per HTML file
+    if config.ci_artifacts.get_config("matbench.visualize_shared_plotlyjs", False, warn=False):
+        common_env["TOPSAIL_FIGURE_EXPORT_PLOTLYJS"] = dest_dir.absolute() / "plotly.min.js"
+
+    common_env_str = "env " + " ".join(f"'{k}={v}'" for k, v in common_env.items())
+
+    log_file = dest_dir / "_matbench_visualize.log"
+    log_file.unlink(missing_ok=True)
+
+    error = False
+    failures = []
+    for idx in idxs:
+        generate_list = matbench_config.get_config(f"visualize[{idx}].generate")
+        generate_url = "stats=" + "&stats=".join(generate_list)
 
         visu_args = common_args.copy()
         visu_args["filters"] = filters_to_apply
         visu_args["generate"] = generate_url
         visu_args_str = " ".join(f"'--{k}={v}'" for k, v in visu_args.items())
 
-        dest_dir = env.ARTIFACT_DIR / filters_to_apply
-        dest_dir.mkdir(parents=True, exist_ok=True)
-
-        log_file = dest_dir / "_matbench_visualize.log"
+        log_start = log_file.stat().st_size if log_file.exists() else 0
 
-        if run.run(f"{common_env_str} matbench visualize {visu_args_str} |& tee > {log_file}",
+        if run.run(f"{common_env_str} matbench visualize {visu_args_str} |& tee >> {log_file}",
                 check=False, cwd=dest_dir).returncode != 0:
-            logging.warning("An error happened while generating the visualization ...")
+            logging.warning(f"An error happened while generating the visualization #{idx} of '{filters_to_apply}' ...")
             error = True
 
         with open(log_file) as log_f:
-            for line in log_f.readlines():
+            log_f.seek(log_start)
+            for line in log_f:
                 if not line.startswith("ERROR"):
                     continue
                 error = True
-                with open(env.ARTIFACT_DIR / "FAILURE", "a") as fail_f:
-                    print(line, end="", file=fail_f)
+                failures.append(line)
                 print(line.strip())
 
-        run.run(f"""
-        cd
-        mkdir -p {dest_dir}/figures_{{png,html}}
-        mv {dest_dir}/fig_*.png "{dest_dir}/figures_png" 2>/dev/null || true
-        mv {dest_dir}/fig_*.html "{dest_dir}/figures_html" 2>/dev/null || true
-        """)
+    # move the figures to their final directories
+    for ext in "png", "html":
+        figures_dir = dest_dir / f"figures_{ext}"
+        figures_dir.mkdir(exist_ok=True)
+        for figure in dest_dir.glob(f"fig_*.{ext}"):
+            figure.replace(figures_dir / figure.name)
 
-    if error:
-        msg = "An error happened during the report generation ..."
-        logging.error(msg)
-        raise RuntimeError(msg)
+    return failures if error else None
 
 
 @entrypoint()
@@ -206,6 +288,10 @@ def get_common_matbench_args_env(results_dirname):
     common_env = dict()
     common_env["MATBENCH_SIMPLE_STORE_IGNORE_EXIT_CODE"] = "true" if config.ci_artifacts.get_config("matbench.ignore_exit_code") else "false"
 
+    # all the entries in a single file of the results directory, reused by the next parses of the same results
+    if config.ci_artifacts.get_config("matbench.matrix_cache", False, warn=False):
+        common_env[topsail_matrix_cache.ENV_MATRIX_CACHE] = pathlib.Path(results_dirname).absolute() / topsail_matrix_cache.MATRIX_CACHE_FILENAME
+
     return common_args, common_env
 
 
@@ -0,0 +1,138 @@
+import datetime
+import pathlib
+import logging
+import types
+import json
+import re
+import os
+
+ANSIBLE_LOG_TIME_FMT = "%Y-%m-%d %H:%M:%S"
+
+# 2023-04-14 17:19:19,808 p=770 u=psap-ci-runner n=ansible | ansible-playbook 2.9.27
+LINE_TIME_REGEX = re.compile(rb"^(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d)")
+
+# 2023-04-14 17:19:20,123 p=770 u=psap-ci-runner n=ansible | TASK [role : task name] ****
+BOUNDARY_REGEX = re.compile(rb"^(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d)[^|\n]*\| (PLAY|TASK) \[(.*)\]", re.MULTILINE)
+
+INDEX_SUFFIX = ".index.json"
+INDEX_VERSION = 1
+
+BLOCK_SIZE = 64 * 1024
+
+
+def _parse_line_time(line):
+    match = LINE_TIME_REGEX.match(line)
+    if not match:
+        return None
+
+    return datetime.datetime.strptime(match.group(1).decode(), ANSIBLE_LOG_TIME_FMT)
+
+
+def _reversed_lines(f):
+    # yields the lines of a binary file, from the last one, reading it by blocks from the end
+    f.seek(0, os.SEEK_END)
+    pos = f.tell()
+    buffer = b""
+    while pos > 0:
+        read_size = min(BLOCK_SIZE, pos)
+        pos -= read_size
+        f.seek(pos)
+        buffer = f.read(read_size) + buffer
+
+        lines = buffer.split(b"\n")
+        buffer = lines.pop(0) # may be incomplete, wait for the previous block
+        yield from reversed(lines)
+
+    yield buffer
+
+
+def parse_start_end_times(ansible_log):
+    """
+    Returns the (start, end) times of an Ansible log file, from its
+    first and last timestamped lines.
+
+    Only the beginning and the end of the file are read.
+
+    Raises ValueError if the file has no timestamped line.
+    """
+
+    start_time = end_time = None
+    with open(ansible_log, "rb") as f:
+        for line in f:
+            start_time = _parse_line_time(line)
+            if start_time: break
+
+        if start_time is None:
+            raise ValueError(f"Ansible log file '{ansible_log}' is empty :/")
+
+        for line in _reversed_lines(f):
+            end_time = _parse_line_time(line)
+            if end_time: break
+
+    return start_time, end_time
+
+
+def _get_index_file(ansible_log):
+    ansible_log = pathlib.Path(ansible_log)
+    return ansible_log.with_name(ansible_log.name + INDEX_SUFFIX)
+
+
+def _scan_boundaries(ansible_log):
+    boundaries = []
+
+    def add_boundaries(text):
+        for match in BOUNDARY_REGEX.finditer(text):
+            time_str, kind, name = (group.decode(errors="replace") for group in match.groups())
+            boundaries.append(dict(kind=kind.lower(), name=name, time=time_str))
+
+    with open(ansible_log, "rb") as f:
+        remainder = b""
+        while chunk := f.read(16 * 1024 * 1024):
+            # only complete lines are scanned, the last one waits for the next chunk
+            chunk = remainder + chunk
+            last_newline = chunk.rfind(b"\n")
+            remainder = chunk[last_newline + 1:]
+            add_boundaries(chunk[:last_newline + 1])
+
+        add_boundaries(remainder)
+
+    return boundaries
+
+
+def parse_boundaries(ansible_log):
+    """
+    Returns the play and task boundaries of an Ansible log file, as a
+    list of SimpleNamespace(kind="play"|"task", name, time)
+
+    The boundaries are saved in a sidecar index file next to the log
+    (<log>.index.json), so that the log is scanned only once. The index
+    is rebuilt when the size or the mtime of the log changes.
+    """
+
+    stat = pathlib.Path(ansible_log).stat()
+    index_file = _get_index_file(ansible_log)
+
+    index = None
+    try:
+        with open(index_file) as f:
+            index = json.load(f)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logging.warning(f"Failed to load the Ansible log index '{index_file}': {e}")
+
+    if not isinstance(index, dict) or (index.get("version"), index.get("size"), index.get("mtime_ns")) != (INDEX_VERSION, stat.st_size, stat.st_mtime_ns):
+        index = dict(version=INDEX_VERSION, size=stat.st_size, mtime_ns=stat.st_mtime_ns,
+                     boundaries=_scan_boundaries(ansible_log))
+
+        tmp_index_file = index_file.with_name(index_file.name + ".tmp")
+        try:
+            with open(tmp_index_file, "w") as f:
+                json.dump(index, f)
+            tmp_index_file.replace(index_file)
+        except OSError as e:
+            logging.warning(f"Failed to save the Ansible log index '{index_file}': {e}")
+
+    return [types.SimpleNamespace(kind=boundary["kind"], name=boundary["name"],
+                                  time=datetime.datetime.strptime(boundary["time"], ANSIBLE_LOG_TIME_FMT))
+            for boundary in index["boundaries"]]
@@ -0,0 +1,513 @@
+import collections
+import datetime
+import math
+import pathlib
+import logging
+import pickle
+import types
+import enum
+import zlib
+import sys
+import os
+
+import numpy as np
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# name of the serializer used to write the cache files ("msgpack" or "pickle")
+ENV_SERIALIZER = "TOPSAIL_CACHE_SERIALIZER"
+
+# the sections are mostly msgpack-encoded namespaces: level 1 compresses
+# them almost as well as level 3, in about half the time
+ZSTD_LEVEL = 1
+ZLIB_LEVEL = 3
+
+
+# --- compression --- #
+
+def _zstd_compress(data):
+    return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+
+
+def _zstd_decompress(data):
+    return zstandard.ZstdDecompressor().decompress(data)
+
+
+COMPRESSIONS = {
+    # name --> (compress, decompress)
+    "zstd": (_zstd_compress, _zstd_decompress),
+    "zlib": (lambda data: zlib.compress(data, ZLIB_LEVEL), zlib.decompress),
+    "none": (lambda data: data, lambda data: data),
+}
+
+
+def get_default_compression():
+    return "zstd" if zstandard is not None else "zlib"
+
+
+# --- msgpack extension types --- #
+
+# the classes (other than the builtin ones) allowed in the cache files, name --> (class, to_state, from_state)
+_registered_types = {}
+_registered_names = {} # class --> name
+
+
+def register_type(cls, to_state=None, from_state=None, name=None):
+    """
+    Allows the instances of a class in the msgpack cache files
+
+    By default, the state is the __getstate__() (or __dict__) of the
+    object, and the object is rebuilt without calling its __init__,
+    with its __setstate__() if it has one. The registered classes can
+    be defaultdict factories.
+    """
+
+    def _from_state(state):
+        obj = cls.__new__(cls)
+        if hasattr(obj, "__setstate__"):
+            obj.__setstate__(state)
+        else:
+            obj.__dict__.update(state)
+        return obj
+
+    def _to_state(obj):
+        return obj.__getstate__() if hasattr(obj, "__getstate__") else obj.__dict__
+
+    name = name or f"{cls.__module__}.{cls.__qualname__}"
+    _registered_types[name] = (cls, to_state or _to_state, from_state or _from_state)
+    _registered_names[cls] = name
+
+
+def _resolve_class(module_name, qualname, base):
+    # only the classes of the modules already imported, and subclasses of `base`
+    cls = sys.modules.get(module_name)
+    for name in qualname.split("."):
+        cls = getattr(cls, name, None)
+
+    if not (isinstance(cls, type) and issubclass(cls, base)):
+        raise TypeError(f"Class '{module_name}.{qualname}' isn't a known {base.__name__} subclass")
+
+    return cls
+
+
+def _pydantic_base_model():
+    pydantic = sys.modules.get("pydantic")
+
+    return pydantic.BaseModel if pydantic is not None else None
+
+
+# numbered once for all, the numbers are part of the file format
+EXT_NAMESPACE = 1
+EXT_DATETIME = 2
+EXT_DATE = 3
+EXT_TIME = 4
+EXT_TIMEDELTA = 5
+EXT_PATH = 6
+EXT_TUPLE = 7
+EXT_SET = 8
+EXT_FROZENSET = 9
+EXT_NDARRAY = 10
+EXT_NUMPY_SCALAR = 11
+EXT_DEFAULTDICT = 12
+EXT_REGISTERED = 13
+EXT_PYDANTIC = 14
+EXT_ENUM = 15
+EXT_PANDAS_TIMESTAMP = 16
+EXT_PANDAS_TIMEDELTA = 17
+EXT_LAST = EXT_PANDAS_TIMEDELTA
+
+DEFAULTDICT_FACTORIES = {factory.__name__: factory for factory in (types.SimpleNamespace, dict, list, set, int, float, str)}
+
+
+class _Tag():
+    # marks the arrays encoding a container type: [tag, content...]
+    __slots__ = ("code",)
+
+    def __init__(self, code):
+        self.code = code
+
+
+class MsgpackSerializer():
+    """
+    Serializes the results with msgpack, without pickle: only the
+    builtin types, SimpleNamespaces, datetimes (including the pandas
+    Timestamps and Timedeltas), paths, numpy arrays, pydantic models,
+    enums and the registered classes are accepted.
+
+    The containers (namespaces, tuples, sets, ...) and the datetimes
+    are encoded as arrays starting with an empty extension type, so
+    that msgpack packs and unpacks their content natively, in a single
+    pass.
+
+    The classes of the pydantic models and enums are looked up in the
+    modules already imported, nothing is imported while loading.
+    """
+
+    name = "msgpack"
+
+    # bump when the encoding of the extension types changes
+    schema_version = 3
+
+    def __init__(self):
+        if msgpack is None:
+            raise ValueError("msgpack isn't available")
+
+        self._pack_tags = {code: msgpack.ExtType(code, b"") for code in range(1, EXT_LAST + 1)}
+        self._unpack_tags = {code: _Tag(code) for code in range(1, EXT_LAST + 1)}
+
+    def _tagged(self, code, *content):
+        return [self._pack_tags[code], *content]
+
+    def _default(self, obj):
+        # strict_types: the subclasses (tuple, defaultdict, numpy floats, str enums, ...) end up here
+        cls = type(obj)
+
+        # fast path for the most common types. The tags are built once,
+        # building an ExtType per datetime is slower than the isoformat
+        if cls is types.SimpleNamespace:
+            return [self._pack_tags[EXT_NAMESPACE], obj.__dict__]
+        if cls is datetime.datetime:
+            return [self._pack_tags[EXT_DATETIME], obj.isoformat()]
+
+        if isinstance(obj, types.SimpleNamespace):
+            if hasattr(type(obj), "load_all"): # result_cache.LazyResults, the sections may not be loaded yet
+                obj = obj.load_all()
+
+            return self._tagged(EXT_NAMESPACE, obj.__dict__)
+
+        if cls.__module__.startswith("pandas"):
+            # pandas.Timestamp (and NaT) and pandas.Timedelta subclass the datetime classes
+            if isinstance(obj, datetime.datetime):
+                return self._tagged(EXT_PANDAS_TIMESTAMP, obj.isoformat())
+            if isinstance(obj, datetime.timedelta):
+                return self._tagged(EXT_PANDAS_TIMEDELTA, obj.value)
+
+        if isinstance(obj, datetime.datetime):
+            return self._tagged(EXT_DATETIME, obj.isoformat())
+
+        if isinstance(obj, datetime.date):
+            return msgpack.ExtType(EXT_DATE, obj.isoformat().encode())
+
+        if isinstance(obj, datetime.time):
+            return msgpack.ExtType(EXT_TIME, obj.isoformat().encode())
+
+        if isinstance(obj, datetime.timedelta):
+            return self._tagged(EXT_TIMEDELTA, obj.days, obj.seconds, obj.microseconds)
+
+        if isinstance(obj, pathlib.PurePath):
+            return msgpack.ExtType(EXT_PATH, str(obj).encode())
+
+        if cls in _registered_names:
+            name = _registered_names[cls]
+            return self._tagged(EXT_REGISTERED, name, _registered_types[name][1](obj))
+
+        if isinstance(obj, enum.Enum):
+            return self._tagged(EXT_ENUM, cls.__module__, cls.__qualname__, obj.value)
+
+        if isinstance(obj, tuple):
+            return self._tagged(EXT_TUPLE, list(obj))
+
+        if isinstance(obj, frozenset):
+            return self._tagged(EXT_FROZENSET, list(obj))
+
+        if isinstance(obj, set):
+            return self._tagged(EXT_SET, list(obj))
+
+        if isinstance(obj, collections.defaultdict):
+            factory = obj.default_factory
+            if factory is None:
+                factory_name = None
+            elif DEFAULTDICT_FACTORIES.get(factory.__name__) is factory:
+                factory_name = factory.__name__
+            elif factory in _registered_names:
+                factory_name = _registered_names[factory]
+            else:
+                raise TypeError(f"defaultdict factory {factory} can't be serialized")
+
+            return self._tagged(EXT_DEFAULTDICT, factory_name, dict(obj))
+
+        if isinstance(obj, np.ndarray):
+            if obj.dtype.hasobject:
+                return self._tagged(EXT_NDARRAY, "O", list(obj.shape), obj.ravel().tolist())
+
+            return self._tagged(EXT_NDARRAY, obj.dtype.str, list(obj.shape), np.ascontiguousarray(obj).tobytes())
+
+        if isinstance(obj, np.generic):
+            return self._tagged(EXT_NUMPY_SCALAR, obj.dtype.str, obj.tobytes())
+
+        base_model = _pydantic_base_model()
+        if base_model is not None and isinstance(obj, base_model):
+            return self._tagged(EXT_PYDANTIC, cls.__module__, cls.__qualname__, dict(obj.__dict__))
+
+        # the builtin types whose subclass got here (eg, OrderedDict, str/int subclasses)
+        for builtin in (dict, list, str, int, float, bytes):
+            if isinstance(obj, builtin):
+                return builtin(obj)
+
+        raise TypeError(f"Object of type '{cls.__module__}.{cls.__qualname__}' can't be serialized in the cache")
+
+    def _ext_hook(self, code, data):
+        if not data and code in self._unpack_tags:
+            return self._unpack_tags[code]
+
+        if code == EXT_DATE:
+            return datetime.date.fromisoformat(data.decode())
+
+        if code == EXT_TIME:
+            return datetime.time.fromisoformat(data.decode())
+
+        if code == EXT_PATH:
+            return pathlib.Path(data.decode())
+
+        raise TypeError(f"Unknown extension type {code} in the cache file")
+
+    def _list_hook(self, array):
+        # called for each array, after its content has been decoded
+        if not array or type(array[0]) is not _Tag:
+            return array
+
+        code = array[0].code
+
+        # fast path for the most common types
+        if code == EXT_NAMESPACE:
+            return types.SimpleNamespace(**array[1])
+        if code == EXT_DATETIME:
+            return datetime.datetime.fromisoformat(array[1])
+
+        content = array[1:]
+
+        if code == EXT_TIMEDELTA:
+            days, seconds, microseconds = content
+            return datetime.timedelta(days=days, seconds=seconds, microseconds=microseconds)
+
+        if code == EXT_TUPLE:
+            return tuple(content[0])
+
+        if code in (EXT_PANDAS_TIMESTAMP, EXT_PANDAS_TIMEDELTA):
+            import pandas as pd # only imported when the cache file has pandas values
+
+            return (pd.Timestamp if code == EXT_PANDAS_TIMESTAMP else pd.Timedelta)(content[0])
+
+        if code == EXT_SET:
+            return set(content[0])
+
+        if code == EXT_FROZENSET:
+            return frozenset(content[0])
+
+        if code == EXT_DEFAULTDICT:
+            factory_name, values = content
+            if factory_name is None:
+                factory = None
+            elif factory_name in DEFAULTDICT_FACTORIES:
+                factory = DEFAULTDICT_FACTORIES[factory_name]
+            elif factory_name in _registered_types:
+                factory = _registered_types[factory_name][0]
+            else:
+                raise TypeError(f"defaultdict factory '{factory_name}' isn't registered in the cache serializer")
+
+            return collections.defaultdict(factory, values)
+
+        if code == EXT_NDARRAY:
+            dtype, shape, values = content
+            if dtype == "O":
+                array = np.empty(len(values), dtype=object)
+                array[:] = values
+                return array.reshape(shape)
+
+            return np.frombuffer(values, dtype=np.dtype(dtype)).reshape(shape).copy()
+
+        if code == EXT_NUMPY_SCALAR:
+            dtype, value = content
+            return np.frombuffer(value, dtype=np.dtype(dtype))[0]
+
+        if code == EXT_REGISTERED:
+            name, state = content
+            if name not in _registered_types:
+                raise TypeError(f"Class '{name}' isn't registered in the cache serializer")
+
+            return _registered_types[name][2](state)
+
+        if code == EXT_ENUM:
+            module_name, qualname, value = content
+            return _resolve_class(module_name, qualname, enum.Enum)(value)
+
+        if code == EXT_PYDANTIC:
+            module_name, qualname, fields = content
+            cls = _resolve_class(module_name, qualname, _pydantic_base_model() or type(None))
+            construct = getattr(cls, "model_construct", None) or cls.construct # no validation, the values were valid
+
+            return construct(**fields)
+
+        raise TypeError(f"Unknown container type {code} in the cache file")
+
+    def dumps(self, obj):
+        return msgpack.packb(obj, default=self._default, strict_types=True, use_bin_type=True)
+
+    def loads(self, data):
+        return msgpack.unpackb(data, ext_hook=self._ext_hook, list_hook=self._list_hook,
+                               raw=False, strict_map_key=False)
+
+
+def _get_state(obj):
+    # the content compared by check_round_trip(), for the non-builtin objects
+    name = _registered_names.get(type(obj))
+    if name is not None:
+        return _registered_types[name][1](obj)
+
+    return vars(obj)
+
+
+def check_round_trip(obj, decoded, path="results"):
+    """
+    Raises a TypeError if `decoded`, the value of `obj` after a
+    serialization round trip, has another type or another value.
+
+    Args:
+      path: the name of obj, for the error message
+    """
+
+    if type(obj) is not type(decoded):
+        raise TypeError(f"{path}: '{type(obj).__module__}.{type(obj).__qualname__}' comes back as '{type(decoded).__module__}.{type(decoded).__qualname__}'")
+
+    if isinstance(obj, float) and math.isnan(obj) and math.isnan(decoded):
+        return
+
+    if isinstance(obj, dict):
+        if isinstance(obj, collections.defaultdict) and obj.default_factory is not decoded.default_factory:
+            raise TypeError(f"{path}: the defaultdict factory changed")
+        if obj.keys() != decoded.keys():
+            raise TypeError(f"{path}: the keys changed")
+
+        for key, value in obj.items():
+            check_round_trip(value, decoded[key], f"{path}[{key!r}]")
+        return
+
+    if isinstance(obj, (list, tuple)):
+        if len(obj) != len(decoded):
+            raise TypeError(f"{path}: the length changed")
+
+        for idx, (value, decoded_value) in enumerate(zip(obj, decoded)):
+            check_round_trip(value, decoded_value, f"{path}[{idx}]")
+        return
+
+    if isinstance(obj, np.ndarray):
+        if obj.dtype != decoded.dtype or obj.shape != decoded.shape:
+            raise TypeError(f"{path}: the dtype or the shape of the array changed")
+
+        if obj.dtype.hasobject:
+            for idx, (value, decoded_value) in enumerate(zip(obj.ravel(), decoded.ravel())):
+                check_round_trip(value, decoded_value, f"{path}[{idx}]")
+        elif not np.array_equal(obj, decoded, equal_nan=obj.dtype.kind in "fc"):
+            raise TypeError(f"{path}: the values of the array changed")
+        return
+
+    if isinstance(obj, np.generic) or isinstance(obj, (str, bytes, int, float, bool, type(None), enum.Enum,
+                                                           datetime.date, datetime.time, datetime.timedelta, pathlib.PurePath,
+                                                           set, frozenset)):
+        if not (obj == decoded or obj != obj and decoded != decoded): # NaN, NaT
+            raise TypeError(f"{path}: the value changed")
+        return
+
+    # namespaces, registered classes, pydantic models: attribute by attribute
+    state, decoded_state = _get_state(obj), _get_state(decoded)
+    if type(state) is not dict:
+        check_round_trip(state, decoded_state, path)
+        return
+
+    if state.keys() != decoded_state.keys():
+        raise TypeError(f"{path}: the attributes changed")
+
+    for key, value in state.items():
+        check_round_trip(value, decoded_state[key], f"{path}.{key}")
+
+
+class PickleSerializer():
+    """
+    Serializes the results with pickle. Any object is accepted, but
+    loading a file runs arbitrary code: only for trusted cache files.
+    """
+
+    name = "pickle"
+    schema_version = 1
+
+    def dumps(self, obj):
+        return pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def loads(self, data):
+        return pickle.loads(data)
+
+
+SERIALIZERS = {
+    "msgpack": MsgpackSerializer,
+    "pickle": PickleSerializer,
+}
+
+
+def register_serializer(serializer_cls):
+    SERIALIZERS[serializer_cls.name] = serializer_cls
+
+
+def get_serializer_name():
+    """
+    Returns the name of the serializer used to write the cache files
+
+    msgpack by default, pickle if msgpack isn't available.
+    """
+
+    name = os.environ.get(ENV_SERIALIZER)
+    if name:
+        if name not in SERIALIZERS:
+            raise ValueError(f"{ENV_SERIALIZER}: unknown cache serializer '{name}', expected one of {', '.join(SERIALIZERS)}")
+        return name
+
+    if msgpack is None:
+        logging.warning("msgpack not available, the cache files will be saved with pickle.")
+        return "pickle"
+
+    return "msgpack"
+
+
+def get_serializer(name=None):
+    name = name or get_serializer_name()
+    if name not in SERIALIZERS:
+        raise ValueError(f"Unknown cache serializer '{name}'")
+
+    return SERIALIZERS[name]()
+
+
+def is_pickle_allowed():
+    """
+    Tells if the cache files saved with pickle can be loaded: only when pickle is the serializer in use
+    """
+
+    return get_serializer_name() == "pickle"
+
+
+class Codec():
+    """
+    A serializer and a compression, as recorded in the header of a cache file
+    """
+
+    def __init__(self, serializer, compression):
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown cache compression '{compression}'")
+        if compression == "zstd" and zstandard is None:
+            raise ValueError("zstandard isn't available, cannot use the zstd compression")
+
+        self.serializer = serializer
+        self.compression = compression
+        self._compress, self._decompress = COMPRESSIONS[compression]
+
+    def encode(self, obj):
+        return self._compress(self.serializer.dumps(obj))
+
+    def decode(self, data):
+        return self.serializer.loads(self._decompress(data))
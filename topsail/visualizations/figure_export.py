@@ -0,0 +1,153 @@
+import pathlib
+import logging
+import atexit
+import os
+
+import plotly.io as pio
+import plotly.offline
+
+try:
+    import kaleido
+except ImportError:
+    kaleido = None
+
+# set by topsail.testing.visualize for the `matbench visualize` processes
+ENV_MODE = "TOPSAIL_FIGURE_EXPORT" # "batch" or "skip"
+ENV_CONCURRENCY = "TOPSAIL_FIGURE_EXPORT_CONCURRENCY"
+ENV_PLOTLYJS = "TOPSAIL_FIGURE_EXPORT_PLOTLYJS" # path of the plotly.js bundle shared by the HTML files
+
+# the visualize step moves the fig_*.html files in this directory
+FIGURES_HTML_DIRNAME = "figures_html"
+
+DEFAULT_CONCURRENCY = 2
+
+_initialized = False
+_pending = [] # list of (figure dict, file, format, scale, width, height)
+
+
+def _skip_write_image(fig, file, *args, **kwargs):
+    logging.debug(f"PNG export disabled, not writing '{file}'.")
+
+
+def _defer_write_image(fig, file, format=None, scale=None, width=None, height=None, validate=True, engine=None):
+    # the figure may be modified by the caller after this call
+    fig_dict = fig.to_plotly_json() if hasattr(fig, "to_plotly_json") else fig
+    _pending.append((fig_dict, file, format, scale, width, height))
+
+
+def flush():
+    """
+    Exports the pending figures, in a single batch through the persistent renderer
+    """
+
+    if not _pending:
+        return
+
+    figures, files, formats, scales, widths, heights = (list(values) for values in zip(*_pending))
+    _pending.clear()
+
+    logging.info(f"Exporting {len(figures)} figure(s) ...")
+    try:
+        pio.write_images(figures, files, format=formats, scale=scales, width=widths, height=heights)
+    except Exception as e:
+        logging.error(f"Failed to export {len(figures)} figure(s): {e}")
+
+
+def _close():
+    try:
+        flush()
+    finally:
+        kaleido.stop_sync_server(silence_warnings=True)
+
+
+def _plotlyjs_src(html_file=None):
+    plotlyjs = pathlib.Path(os.environ[ENV_PLOTLYJS]).absolute()
+    if html_file is None or not isinstance(html_file, (str, pathlib.Path)):
+        # reports, written in the working directory
+        return os.path.relpath(plotlyjs, pathlib.Path.cwd())
+
+    html_file = pathlib.Path(html_file).absolute()
+    final_dir = html_file.parent
+    if html_file.name.startswith("fig_"):
+        final_dir = final_dir / FIGURES_HTML_DIRNAME
+
+    return os.path.relpath(plotlyjs, final_dir)
+
+
+def _write_plotlyjs():
+    plotlyjs = pathlib.Path(os.environ[ENV_PLOTLYJS])
+    if plotlyjs.exists():
+        return
+
+    plotlyjs.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = plotlyjs.with_suffix(".tmp")
+    tmp_file.write_text(plotly.offline.get_plotlyjs(), encoding="utf-8")
+    tmp_file.replace(plotlyjs)
+
+
+def _share_plotlyjs():
+    to_html = pio.to_html
+    write_html = pio.write_html
+
+    # only the default (embedded bundle) is replaced
+
+    def _to_html(fig, *args, include_plotlyjs=True, **kwargs):
+        if include_plotlyjs is True:
+            include_plotlyjs = _plotlyjs_src()
+        return to_html(fig, *args, include_plotlyjs=include_plotlyjs, **kwargs)
+
+    def _write_html(fig, file, *args, include_plotlyjs=True, **kwargs):
+        if include_plotlyjs is True:
+            include_plotlyjs = _plotlyjs_src(file)
+        return write_html(fig, file, *args, include_plotlyjs=include_plotlyjs, **kwargs)
+
+    _write_plotlyjs()
+    pio.to_html = _to_html
+    pio.write_html = _write_html
+
+
+def init():
+    """
+    Configures the figure export of the current `matbench visualize` process.
+
+    - skip: the PNG files aren't generated, only the HTML files
+    - batch: the images are exported at the end of the process, all
+      together, through one long-lived renderer with
+      TOPSAIL_FIGURE_EXPORT_CONCURRENCY tabs.
+
+    When TOPSAIL_FIGURE_EXPORT_PLOTLYJS is set, the HTML files
+    reference this plotly.js bundle (relatively) instead of embedding
+    their own copy.
+
+    Does nothing when the process wasn't launched by the TOPSAIL
+    visualize step (eg, in the interactive UI).
+    """
+
+    global _initialized
+
+    mode = os.environ.get(ENV_MODE)
+    if not mode or _initialized:
+        return
+
+    _initialized = True
+
+    if os.environ.get(ENV_PLOTLYJS):
+        _share_plotlyjs()
+
+    if mode == "skip":
+        logging.info("PNG export disabled for this visualization.")
+        pio.write_image = _skip_write_image
+        return
+
+    if mode != "batch":
+        raise ValueError(f"Invalid {ENV_MODE} value: '{mode}'. Expected 'batch' or 'skip'.")
+
+    if kaleido is None or not hasattr(kaleido, "start_sync_server") or not hasattr(pio, "write_images"):
+        logging.warning("kaleido>=1.1 or plotly>=6.1 not available, exporting the figures one by one.")
+        return
+
+    concurrency = int(os.environ.get(ENV_CONCURRENCY) or DEFAULT_CONCURRENCY)
+    kaleido.start_sync_server(n=concurrency, silence_warnings=True)
+    atexit.register(_close)
+
+    pio.write_image = _defer_write_image
@@ -0,0 +1,138 @@
+import pathlib
+import logging
+import types
+import gzip
+import re
+import os
+from collections import defaultdict
+
+import joblib
+
+CHUNK_SIZE = 16 * 1024 * 1024
+
+# below this total size, the files are scanned sequentially
+PARALLEL_MIN_SIZE = 64 * 1024 * 1024
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+def severity(level):
+    """
+    Counts the JSON log lines with the given severity
+    """
+    return f'"severity":"{level}"'
+
+
+def channel(name):
+    """
+    Counts the JSON log lines with the given channel
+    """
+    return f'"channel": "{name}"'
+
+
+def _compile(pattern):
+    if isinstance(pattern, re.Pattern):
+        return pattern if isinstance(pattern.pattern, bytes) else re.compile(pattern.pattern.encode(), pattern.flags & ~re.UNICODE)
+
+    # plain strings are substrings
+    return re.compile(re.escape(pattern.encode()))
+
+
+def _open(log_file):
+    with open(log_file, "rb") as f:
+        is_gzip = f.read(len(GZIP_MAGIC)) == GZIP_MAGIC
+
+    return gzip.open(log_file, "rb") if is_gzip else open(log_file, "rb")
+
+
+def _count_matching_lines(regex, chunk):
+    # counts the lines matching the regex, not the matches
+    count = 0
+    pos = 0
+    while match := regex.search(chunk, pos):
+        count += 1
+
+        line_end = chunk.find(b"\n", match.end())
+        if line_end == -1:
+            break
+        pos = line_end + 1
+
+    return count
+
+
+def _scan_file(log_file, patterns):
+    regexes = {name: _compile(pattern) for name, pattern in patterns.items()}
+
+    line_count = 0
+    distribution = dict.fromkeys(patterns, 0)
+
+    def scan(lines):
+        nonlocal line_count
+
+        line_count += lines.count(b"\n")
+        for name, regex in regexes.items():
+            distribution[name] += _count_matching_lines(regex, lines)
+
+    with _open(log_file) as f:
+        remainder = b""
+        while chunk := f.read(CHUNK_SIZE):
+            chunk = remainder + chunk
+
+            # only complete lines are scanned, the last one goes with the next chunk
+            last_newline = chunk.rfind(b"\n")
+            if last_newline == -1:
+                remainder = chunk
+                continue
+
+            remainder = chunk[last_newline + 1:]
+            scan(chunk[:last_newline + 1])
+
+        if remainder:
+            scan(remainder + b"\n")
+
+    return line_count, distribution
+
+
+def scan_logs(log_files, patterns, n_jobs=None):
+    """
+    Counts the lines and the lines matching the patterns in log files
+
+    Args:
+      log_files: list of log files, plain text or gzip-compressed
+      patterns: dict of counter name -> pattern. The pattern can be a
+        plain string (substring), a compiled regex, or the result of
+        severity() or channel()
+      n_jobs: number of files scanned in parallel (default: CPU count)
+
+    Returns: a SimpleNamespace with the total line_count and the
+      distribution dict (counter name -> count of matching lines)
+
+    The files are read in chunks, so that their size doesn't impact
+    the memory usage.
+    """
+
+    log_files = list(log_files)
+
+    total_size = sum(pathlib.Path(log_file).stat().st_size for log_file in log_files)
+    if len(log_files) > 1 and total_size >= PARALLEL_MIN_SIZE:
+        n_jobs = min(len(log_files), n_jobs or os.cpu_count() or 1)
+    else:
+        n_jobs = 1
+
+    logging.debug(f"Scanning {len(log_files)} log files ({total_size/1024/1024:.1f} MiB) with {n_jobs} job(s) ...")
+
+    file_results = joblib.Parallel(n_jobs=n_jobs, prefer="processes")(
+        joblib.delayed(_scan_file)(log_file, patterns) for log_file in log_files
+    )
+
+    logs = types.SimpleNamespace()
+    logs.line_count = 0
+    logs.distribution = defaultdict(int)
+
+    for line_count, distribution in file_results:
+        logs.line_count += line_count
+        for name, count in distribution.items():
+            if not count: continue
+            logs.distribution[name] += count
+
+    return logs
@@ -0,0 +1,171 @@
+import contextlib
+import datetime
+import pathlib
+import logging
+import hashlib
+import sqlite3
+import json
+import os
+
+# path of the history database. The history is disabled when it isn't set
+ENV_HISTORY_DB = "TOPSAIL_LTS_HISTORY_DB"
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS payloads (
+    payload_id TEXT PRIMARY KEY,
+    workload TEXT NOT NULL,
+    start TEXT NOT NULL,
+    end TEXT,
+    settings TEXT NOT NULL,
+    presets TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS kpis (
+    payload_id TEXT NOT NULL REFERENCES payloads(payload_id) ON DELETE CASCADE,
+    kpi TEXT NOT NULL,
+    value REAL,
+    PRIMARY KEY (payload_id, kpi)
+);
+
+CREATE INDEX IF NOT EXISTS kpis_by_name ON kpis (kpi);
+CREATE INDEX IF NOT EXISTS payloads_by_workload ON payloads (workload, start);
+"""
+
+
+def _json_default(obj):
+    if isinstance(obj, (datetime.datetime, datetime.date)):
+        return obj.isoformat()
+
+    return str(obj)
+
+
+def _to_json(obj):
+    return json.dumps(obj, sort_keys=True, default=_json_default)
+
+
+def _to_iso(time):
+    return time.isoformat() if isinstance(time, (datetime.datetime, datetime.date)) else str(time)
+
+
+def get_history_db():
+    """
+    Returns the path of the history database, or None if it is disabled
+    """
+
+    path = os.environ.get(ENV_HISTORY_DB)
+
+    return pathlib.Path(path) if path else None
+
+
+class LtsHistory():
+    """
+    Local index of the LTS KPIs, to compare a run against the history
+    without reloading all the LTS payloads.
+
+    One row per payload (workload, start/end times, settings, presets),
+    and one row per (payload, KPI) value. A payload is identified by
+    its workload, settings and start time, so appending it again
+    replaces its KPIs.
+    """
+
+    def __init__(self, path=None):
+        path = path or get_history_db()
+        if path is None:
+            raise ValueError(f"No LTS history database path, {ENV_HISTORY_DB} isn't set")
+
+        self.path = pathlib.Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.db = sqlite3.connect(self.path)
+        self.db.execute("PRAGMA foreign_keys = ON")
+
+        version = self.db.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, SCHEMA_VERSION):
+            raise ValueError(f"LTS history database '{self.path}' has schema version {version}, expected {SCHEMA_VERSION}")
+
+        self.db.executescript(SCHEMA)
+        self.db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self):
+        self.db.commit()
+        self.db.close()
+
+    def append(self, workload, start, end, settings, presets, kpis):
+        """
+        Adds (or replaces) the KPIs of an LTS payload
+
+        Args:
+          workload: name of the workload
+          start, end: start and end time of the test
+          settings: dict of the test settings
+          presets: list of the presets of the test
+          kpis: dict of KPI name -> value
+        """
+
+        settings_json = _to_json(settings)
+        start_iso = _to_iso(start)
+        payload_id = hashlib.sha256(f"{workload}|{settings_json}|{start_iso}".encode()).hexdigest()
+
+        self.db.execute("INSERT OR REPLACE INTO payloads VALUES (?, ?, ?, ?, ?, ?)",
+                        (payload_id, workload, start_iso, _to_iso(end) if end else None,
+                         settings_json, _to_json(sorted(presets or []))))
+        self.db.executemany("INSERT OR REPLACE INTO kpis VALUES (?, ?, ?)",
+                            [(payload_id, kpi, None if value is None else float(value))
+                             for kpi, value in kpis.items()])
+
+        return payload_id
+
+    def query(self, workload, kpi, settings=None, preset=None):
+        """
+        Returns the history of a KPI, ordered by start time, as a list of (start, settings, value)
+
+        Args:
+          settings: only the payloads with these settings (dict, subset match)
+          preset: only the payloads with this preset
+        """
+
+        sql = """
+            SELECT payloads.start, payloads.settings, kpis.value FROM kpis
+            JOIN payloads ON payloads.payload_id = kpis.payload_id
+            WHERE payloads.workload = ? AND kpis.kpi = ?
+        """
+        args = [workload, kpi]
+
+        for key, value in (settings or {}).items():
+            sql += " AND json_extract(payloads.settings, ?) = json_extract(?, '$')"
+            args += [f'$."{key}"', json.dumps(value, default=_json_default)]
+
+        if preset is not None:
+            sql += " AND EXISTS (SELECT 1 FROM json_each(payloads.presets) WHERE json_each.value = ?)"
+            args.append(preset)
+
+        sql += " ORDER BY payloads.start"
+
+        return [(datetime.datetime.fromisoformat(start), json.loads(settings_json), value)
+                for start, settings_json, value in self.db.execute(sql, args)]
+
+
+@contextlib.contextmanager
+def open_history(path=None):
+    """
+    Opens the LTS history database, or yields None if it is disabled or can't be opened
+    """
+
+    path = path or get_history_db()
+    if path is None:
+        yield None
+        return
+
+    try:
+        history = LtsHistory(path)
+    except (sqlite3.Error, OSError, ValueError) as e:
+        logging.warning(f"Cannot open the LTS history database '{path}': {e}")
+        yield None
+        return
+
+    try:
+        yield history
+    finally:
+        history.close()
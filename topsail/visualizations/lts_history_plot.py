@@ -0,0 +1,114 @@
+import math
+
+import plotly.graph_objs as go
+import pandas as pd
+import plotly.express as px
+
+import matrix_benchmarking.plotting.table_stats as table_stats
+import matrix_benchmarking.common as common
+
+from . import lts_history
+
+
+class LtsKpiHistory():
+    """
+    Plots the history of a KPI of a workload, from the LTS history
+    database (see lts_history), with the regression lanes around its
+    best value.
+
+    Args:
+      workload: name of the workload in the history database
+      default_kpi: KPI plotted when the cfg doesn't set 'kpi'
+      higher_is_better_kpis: the KPIs where a higher value is better
+      kpi_units: dict of KPI name prefix -> unit of the Y axis
+
+    cfg: kpi, preset, settings (only the payloads with these settings)
+    """
+
+    def __init__(self, workload, default_kpi, higher_is_better_kpis=(), kpi_units=None):
+        self.name = "LTS: KPI history"
+        self.id_name = self.name
+
+        self.workload = workload
+        self.default_kpi = default_kpi
+        self.higher_is_better_kpis = higher_is_better_kpis
+        self.kpi_units = kpi_units or {}
+
+        table_stats.TableStats._register_stat(self)
+        common.Matrix.settings["stats"].add(self.name)
+
+    def do_hover(self, meta_value, variables, figure, data, click_info):
+        return "nothing"
+
+    def do_plot(self, ordered_vars, settings, setting_lists, variables, cfg):
+        cfg__kpi = cfg.get("kpi", self.default_kpi)
+        cfg__preset = cfg.get("preset", None)
+        cfg__settings = cfg.get("settings", {})
+
+        with lts_history.open_history() as history:
+            if not history:
+                return None, f"LTS history database not available ({lts_history.ENV_HISTORY_DB} not set) ..."
+
+            kpi_history = history.query(self.workload, cfg__kpi, settings=cfg__settings, preset=cfg__preset)
+
+        df = pd.DataFrame([dict(name=start.isoformat(), value=value) for start, _settings, value in kpi_history if value is not None])
+
+        if df.empty:
+            return None, f"No '{cfg__kpi}' history available ..."
+
+        fig = px.line(df, hover_data=df.columns, x="name", y="value", markers=True)
+        fig.data[0].name = cfg__kpi
+        fig.data[0].showlegend = True
+
+        list(map(fig.add_trace, get_regression_lanes(cfg__kpi, df.name, df.value,
+                                                     default_op="max" if cfg__kpi in self.higher_is_better_kpis else "min")))
+
+        unit = next((unit for prefix, unit in self.kpi_units.items() if cfg__kpi.startswith(prefix)), None)
+
+        fig.update_layout(title=f"History of the {cfg__kpi} KPI", title_x=0.5,)
+        fig.update_yaxes(title=cfg__kpi + (f" (in {unit})" if unit else ""))
+        fig.update_xaxes(title="Test start time")
+
+        return fig, ""
+
+
+def find_reference_point(df_name, df_colname, default_op):
+    for name, value in zip(df_name, df_colname):
+        if name.endswith("-GA"):
+            return "GA", value
+
+    return default_op, getattr(df_colname, default_op)()
+
+
+def get_lane(x_col, ref_value, pct, name):
+    new_value = ref_value * (1 + pct/100)
+
+    return go.Scatter(x=x_col,
+                      y=[new_value] * len(x_col),
+                      name=name,
+                      mode="lines",
+                      line_dash="dot",
+                      )
+
+
+def get_regression_lanes(y_col_name, x_col, y_col, default_op):
+    """
+    Yields the dotted lanes at -5%, 0, +5% ... (by steps of 5%) of the
+    reference value of y_col: the value of the '-GA' entry if there is
+    one, otherwise its default_op ("min" or "max").
+    """
+
+    ref_name, ref_value = find_reference_point(x_col, y_col, default_op)
+    if not ref_value:
+        return
+
+    diff_pct = [-round((1 - y/ref_value)*100) for y in y_col if not math.isnan(y)]
+
+    ROUND = 5
+    round_pcts = set([0, 5, -5] + [ROUND * round(pct/ROUND) for pct in diff_pct])
+
+    for pct in sorted(round_pcts):
+        name = f"{ref_name} {y_col_name}" if pct == 0 else \
+            f"{pct:+d}% of the {ref_name} {y_col_name}"
+
+        yield get_lane(x_col, ref_value, pct, name)
@@ -0,0 +1,52 @@
+import datetime
+import pathlib
+import types
+
+import numpy as np
+
+# values passed through as they are
+_PLAIN_TYPES = (str, int, float, bool, type(None), datetime.datetime, datetime.date)
+
+
+def to_model_input(obj):
+    """
+    Converts an LTS payload (SimpleNamespaces, dicts, lists, numpy
+    values) into the plain dicts and lists the pydantic models expect.
+
+    Same structure as the json_dumper JSON round-trip, without the
+    serialization: the datetimes are passed as they are, the models
+    parse them.
+    """
+
+    if isinstance(obj, _PLAIN_TYPES):
+        return obj
+
+    if isinstance(obj, types.SimpleNamespace):
+        obj = obj.__dict__
+
+    if isinstance(obj, dict):
+        return {key: to_model_input(value) for key, value in obj.items()}
+
+    if isinstance(obj, (list, tuple)):
+        # fast path for the vectors of values
+        return [value if isinstance(value, _PLAIN_TYPES) else to_model_input(value)
+                for value in obj]
+
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+
+    if isinstance(obj, np.generic):
+        return obj.item()
+
+    if isinstance(obj, pathlib.PurePath):
+        return str(obj)
+
+    return obj
+
+
+def validate(model, payload):
+    """
+    Validates an LTS payload against a pydantic model, and returns the model instance
+    """
+
+    return model.parse_obj(to_model_input(payload))
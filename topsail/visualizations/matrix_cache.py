@@ -0,0 +1,243 @@
+import contextlib
+import pathlib
+import logging
+import struct
+import json
+import os
+
+from . import cache_serializer
+from . import result_cache
+
+# path of the merged matrix cache, set by `visualize.generate_from_dir`
+ENV_MATRIX_CACHE = "TOPSAIL_MATRIX_CACHE"
+
+MATRIX_CACHE_FILENAME = "matrix_cache.bin"
+
+# bump when the layout of the file changes
+MATRIX_CACHE_VERSION = 3
+
+MAGIC = b"TOPSAIL-MATRIX-CACHE\n"
+
+
+def get_matrix_cache_file():
+    """
+    Returns the path of the merged matrix cache, or None if it is disabled
+    """
+
+    path = os.environ.get(ENV_MATRIX_CACHE)
+
+    return pathlib.Path(path) if path else None
+
+
+def fingerprint(results_dir, is_tracked_file):
+    """
+    Returns the (relative path, mtime, size) of the files of results_dir matching is_tracked_file.
+
+    A new, removed or re-parsed result directory changes the fingerprint.
+    """
+
+    results_dir = pathlib.Path(results_dir)
+
+    tracked = []
+    for this_dir, _directories, files in os.walk(results_dir, followlinks=True):
+        this_dir = pathlib.Path(this_dir)
+        for filename in files:
+            path = this_dir / filename
+            if not is_tracked_file(path):
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue # broken symlink
+
+            tracked.append([str(path.relative_to(results_dir)), stat.st_mtime_ns, stat.st_size])
+
+    return sorted(tracked)
+
+
+class MatrixCache():
+    """
+    All the entries of a results directory in a single file: the
+    comparison passes and the later `-plot` jobs load it at once,
+    instead of unpickling the cache of every result directory.
+
+    The file contains a JSON header (versions, serializer, parse
+    settings, fingerprint of the results directory, settings keys and
+    values), then the results of the entries, in sections as in the
+    result cache files, and the index of the entries (import settings,
+    location relative to the results directory, offsets of the
+    results sections). The header is checked before the index is
+    loaded, and the results sections are decoded on their first access.
+
+    The parse settings are the settings that change which entries are
+    parsed (eg, the exit code filtering). The cache is ignored if they
+    differ.
+    """
+
+    def __init__(self, path, results_dir, parser_version, is_tracked_file, parse_settings=None):
+        self.path = pathlib.Path(path)
+        self.results_dir = pathlib.Path(results_dir)
+        self.parser_version = parser_version
+        self.is_tracked_file = is_tracked_file
+        self.parse_settings = parse_settings or {}
+
+        self.entries = [] # recorded while parsing
+
+    def _header(self, fprint):
+        settings = {}
+        for import_settings, _location, _results in self.entries:
+            for key, value in import_settings.items():
+                settings.setdefault(key, set()).add(str(value))
+
+        return dict(
+            version=MATRIX_CACHE_VERSION,
+            parser_version=self.parser_version,
+            parse_settings=self.parse_settings,
+            fingerprint=fprint,
+            settings={key: sorted(values) for key, values in settings.items()},
+        )
+
+    def record(self, import_settings, location, results):
+        """
+        Records an entry added to the matrix, to be saved in the merged cache
+        """
+
+        location = pathlib.Path(location).absolute()
+        try:
+            location = location.relative_to(self.results_dir.absolute())
+        except ValueError:
+            pass # outside of the results directory, kept absolute
+
+        self.entries.append((dict(import_settings), location, results))
+
+    def load(self, fn_add_to_matrix):
+        """
+        Adds the entries of the merged cache to the matrix with fn_add_to_matrix(import_settings, location, results)
+
+        Returns False, without adding anything, if the cache doesn't exist or is outdated.
+        """
+
+        try:
+            with open(self.path, "rb") as f:
+                if f.read(len(MAGIC)) != MAGIC:
+                    logging.info(f"Matrix cache '{self.path}' has an unknown format, ignoring.")
+                    return False
+
+                header_length, = struct.unpack(">I", f.read(4))
+                header = json.loads(f.read(header_length))
+
+                if header.get("version") != MATRIX_CACHE_VERSION:
+                    logging.info(f"Matrix cache '{self.path}' version '{header.get('version')}' does not match '{MATRIX_CACHE_VERSION}', ignoring.")
+                    return False
+
+                if header.get("parser_version") != self.parser_version:
+                    logging.info(f"Matrix cache '{self.path}' parser version '{header.get('parser_version')}' does not match '{self.parser_version}', ignoring.")
+                    return False
+
+                if header.get("parse_settings") != json.loads(json.dumps(self.parse_settings)):
+                    logging.info(f"Matrix cache '{self.path}' parse settings {header.get('parse_settings')} do not match {self.parse_settings}, ignoring.")
+                    return False
+
+                if header.get("serializer") == "pickle" and not cache_serializer.is_pickle_allowed():
+                    logging.info(f"Matrix cache '{self.path}' was saved with pickle, which isn't the cache serializer in use, ignoring.")
+                    return False
+
+                serializer = cache_serializer.get_serializer(header.get("serializer"))
+                if header.get("schema_version") != serializer.schema_version:
+                    logging.info(f"Matrix cache '{self.path}' schema version '{header.get('schema_version')}' does not match '{serializer.schema_version}', ignoring.")
+                    return False
+
+                if header.get("fingerprint") != fingerprint(self.results_dir, self.is_tracked_file):
+                    logging.info(f"Matrix cache '{self.path}' is outdated, ignoring.")
+                    return False
+
+                codec = cache_serializer.Codec(serializer, header.get("compression"))
+                data_start = f.tell()
+
+                index_offset, index_length = header["index"]
+                f.seek(data_start + index_offset)
+                index = codec.decode(f.read(index_length))
+
+                # only the inline attributes are decoded here, the sections on their first access
+                entries = [(import_settings, location,
+                            result_cache.decode_sections(self.path, f, data_start, codec, inline, sections))
+                           for import_settings, location, inline, sections in index]
+        except FileNotFoundError:
+            return False
+        except (struct.error, KeyError, ValueError, TypeError) as e:
+            logging.warning(f"Cannot load the matrix cache '{self.path}': {e.__class__.__name__}: {e}")
+            return False
+
+        for import_settings, location, results in entries:
+            fn_add_to_matrix(import_settings, self.results_dir / location, results)
+
+        logging.info(f"Loaded {len(entries)} entries from the matrix cache '{self.path}'.")
+
+        return True
+
+    def save(self, prepare_results=None):
+        """
+        Saves the recorded entries in the merged cache
+
+        Args:
+          prepare_results: context manager factory, called with the results of each entry while they are serialized
+        """
+
+        codec = cache_serializer.Codec(cache_serializer.get_serializer(), cache_serializer.get_default_compression())
+
+        try:
+            with contextlib.ExitStack() as stack:
+                if prepare_results is not None:
+                    for _import_settings, _location, results in self.entries:
+                        stack.enter_context(prepare_results(results))
+
+                blobs = []
+                index = []
+                offset = 0
+                for import_settings, location, results in self.entries:
+                    entry_blobs, inline, sections = result_cache.encode_sections(codec, results, offset)
+                    blobs += entry_blobs
+                    offset += sum(len(blob) for blob in entry_blobs)
+                    index.append((import_settings, str(location), inline, sections))
+
+                index_blob = codec.encode(index)
+        except (TypeError, ValueError, OverflowError) as e:
+            logging.warning(f"Cannot save the matrix cache '{self.path}' with {codec.serializer.name}: {e}")
+            return
+
+        header = self._header(fingerprint(self.results_dir, self.is_tracked_file))
+        header |= dict(serializer=codec.serializer.name,
+                       schema_version=codec.serializer.schema_version,
+                       compression=codec.compression,
+                       index=(offset, len(index_blob)))
+        header = json.dumps(header).encode()
+
+        tmp_path = self.path.with_name(f".{self.path.name}.tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(MAGIC)
+                f.write(struct.pack(">I", len(header)))
+                f.write(header)
+                for blob in blobs:
+                    f.write(blob)
+                f.write(index_blob)
+
+            tmp_path.replace(self.path)
+        except OSError as e:
+            logging.warning(f"Cannot save the matrix cache '{self.path}': {e}")
+            tmp_path.unlink(missing_ok=True)
+            return
+
+        logging.info(f"Saved {len(self.entries)} entries in the matrix cache '{self.path}'.")
+
+
+def from_env(results_dir, parser_version, is_tracked_file, parse_settings=None):
+    """
+    Returns the MatrixCache configured in the environment, or None if it is disabled
+    """
+
+    path = get_matrix_cache_file()
+    if path is None:
+        return None
+
+    return MatrixCache(path, results_dir, parser_version, is_tracked_file, parse_settings)
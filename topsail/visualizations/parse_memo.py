@@ -0,0 +1,61 @@
+import hashlib
+import copy
+
+import yaml
+
+# (parser, parser args, digest of the file content) --> parsed object
+_memo = {}
+
+
+def parse_file(path, parse, *args):
+    """
+    Returns parse(content, *args), where content is the bytes of the
+    file at path, memoized on the digest of the content.
+
+    The files shared by the runs of a matrix (nodes.json, config.yaml,
+    ...) are parsed only once. Each call gets its own deep copy of the
+    parsed object, so a run can modify its copy (eg, its test config)
+    without affecting the other runs. A copy is much cheaper than the
+    YAML parsing.
+
+    FileNotFoundError is raised as with open().
+    """
+
+    with open(path, "rb") as f:
+        content = f.read()
+
+    key = (parse.__module__, parse.__qualname__, args,
+           hashlib.blake2b(content, digest_size=16).digest())
+
+    if key not in _memo:
+        _memo[key] = parse(content, *args)
+
+    return copy.deepcopy(_memo[key])
+
+
+def _parse_yaml(content):
+    return yaml.safe_load(content)
+
+
+def _parse_text(content):
+    return content.decode().strip()
+
+
+def load_yaml(path):
+    """
+    Returns the content of a YAML file
+    """
+
+    return parse_file(path, _parse_yaml)
+
+
+def read_text(path):
+    """
+    Returns the stripped text of a file (eg, a version file)
+    """
+
+    return parse_file(path, _parse_text)
+
+
+def clear():
+    _memo.clear()
@@ -0,0 +1,171 @@
+import collections
+import functools
+import threading
+import logging
+import copy
+import json
+import os
+
+import matrix_benchmarking.plotting.table_stats as table_stats
+
+from . import figure_export
+
+# memory budget of the memoized plots, in MiB. 0 disables the memoization
+ENV_SIZE = "TOPSAIL_PLOT_MEMO_SIZE"
+
+DEFAULT_SIZE = 512 # MiB
+
+# the properties of the traces holding the data, the bulk of a figure
+TRACE_DATA_PROPERTIES = ("x", "y", "z", "text", "hovertext", "customdata", "ids",
+                         "labels", "values", "parents", "lat", "lon", "base", "width")
+
+# fixed size accounted per figure and per trace (layout, properties)
+FIGURE_OVERHEAD = 16 * 1024
+TRACE_OVERHEAD = 2 * 1024
+
+# per element of the sequences other than the numeric arrays (Python objects)
+OBJECT_SIZE = 64
+
+
+def _estimate_size(result):
+    # estimates the memory of a do_plot result from the data of its
+    # traces, without serializing the figure
+    size = 0
+    for value in result if isinstance(result, tuple) else (result,):
+        data = getattr(value, "data", None)
+        if not isinstance(data, tuple): # not a plotly figure (message, dash components)
+            continue
+
+        size += FIGURE_OVERHEAD
+        for trace in data:
+            size += TRACE_OVERHEAD
+            for name in TRACE_DATA_PROPERTIES:
+                if name not in trace:
+                    continue
+
+                prop = trace[name]
+                if prop is None or isinstance(prop, (str, int, float)):
+                    continue
+
+                if getattr(prop, "dtype", None) is not None and not prop.dtype.hasobject:
+                    size += prop.nbytes
+                else:
+                    size += len(prop) * OBJECT_SIZE
+
+    return size
+
+
+class PlotMemo():
+    """
+    LRU of the do_plot results, bounded by their estimated size (the
+    data arrays of their traces).
+
+    A copy of the result is stored, and each hit returns its own copy:
+    the callers can modify the figures they get (eg, update their
+    layout in a report).
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.size = 0
+        self._entries = collections.OrderedDict() # key --> (result, size)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            self._entries.move_to_end(key)
+            result, size = entry
+
+        return copy.deepcopy(result), size
+
+    def put(self, key, result):
+        size = _estimate_size(result)
+        if size > self.max_size:
+            return
+
+        try:
+            result = copy.deepcopy(result) # the caller may modify its result
+        except Exception as e:
+            logging.debug(f"Plot result not memoized, it cannot be copied: {e}")
+            return
+
+        with self._lock:
+            if key in self._entries:
+                return
+
+            self._entries[key] = (result, size)
+            self.size += size
+
+            while self.size > self.max_size:
+                _key, (_result, evicted_size) = self._entries.popitem(last=False)
+                self.size -= evicted_size
+
+
+def _plot_key(name, ordered_vars, settings, setting_lists, variables, cfg):
+    # the cfg of the plots is a matbench Config, with its values in .d
+    cfg = getattr(cfg, "d", cfg)
+
+    return json.dumps([name, ordered_vars, settings, setting_lists, variables, cfg],
+                      sort_keys=True, default=str)
+
+
+def memoize(stats, memo):
+    """
+    Replaces the do_plot method of a Plot instance with its memoized version
+    """
+
+    do_plot = stats.do_plot
+
+    @functools.wraps(do_plot)
+    def memoized_do_plot(*args):
+        try:
+            key = _plot_key(stats.name, *args)
+        except (TypeError, ValueError):
+            return do_plot(*args) # unexpected arguments, cannot be memoized
+
+        entry = memo.get(key)
+        if entry is not None:
+            return entry[0]
+
+        result = do_plot(*args)
+        memo.put(key, result)
+
+        return result
+
+    stats.do_plot = memoized_do_plot
+
+
+_memo = None
+
+
+def init():
+    """
+    Memoizes the plots registered so far, in the interactive `matbench
+    visualize` UI: the UI changes that come back to a previous set of
+    settings don't regenerate the plot from the results.
+
+    Must be called at the end of the plotting register() function.
+
+    Does nothing in the processes launched by the TOPSAIL visualize
+    step, where each plot is generated once.
+    """
+
+    global _memo
+
+    if os.environ.get(figure_export.ENV_MODE):
+        return
+
+    max_size = int(os.environ.get(ENV_SIZE, DEFAULT_SIZE)) * 1024 * 1024
+    if not max_size:
+        return
+
+    if _memo is None:
+        _memo = PlotMemo(max_size)
+
+    for stats in table_stats.TableStats.stats_by_name.values():
+        if getattr(stats.do_plot, "__wrapped__", None) is None:
+            memoize(stats, _memo)
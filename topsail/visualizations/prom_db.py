@@ -0,0 +1,166 @@
+import pathlib
+import logging
+import hashlib
+import types
+import os
+
+import matrix_benchmarking.store.prom_db as store_prom_db
+
+from . import result_cache
+
+# unset or empty: the cache is disabled
+CACHE_DIR_ENV_KEY = "TOPSAIL_PROM_DB_CACHE_DIR"
+
+_tarball_digests = {} # (path, size, mtime) --> sha256 of the tarball
+
+
+def _get_cache_dir():
+    cache_dir = os.environ.get(CACHE_DIR_ENV_KEY)
+
+    return pathlib.Path(cache_dir) if cache_dir else None
+
+
+def _get_tarball_key(prom_tarball):
+    stat = prom_tarball.stat()
+
+    return (str(prom_tarball.resolve()), stat.st_size, stat.st_mtime_ns)
+
+
+def _get_tarball_digest(prom_tarball):
+    key = _get_tarball_key(prom_tarball)
+
+    if key not in _tarball_digests:
+        digest = hashlib.sha256()
+        with open(prom_tarball, "rb") as f:
+            while chunk := f.read(1024 * 1024):
+                digest.update(chunk)
+
+        _tarball_digests[key] = digest.hexdigest()
+
+    return _tarball_digests[key]
+
+
+def _get_name_query(metric):
+    if isinstance(metric, dict):
+        [(name, query)] = metric.items()
+    else:
+        name = query = metric
+
+    return name, query
+
+
+def _get_query_cache_file(cache_dir, digest, query):
+    return cache_dir / digest / (hashlib.sha256(query.encode()).hexdigest() + ".cache")
+
+
+def _extract_queries(prom_tarball, digest, queries, dirname, cache_dir):
+    # queries: PromQL query --> name to use when extracting it, unique per tarball
+
+    values = {}
+    missing = {}
+    for query, name in queries.items():
+        if not cache_dir:
+            missing[query] = name
+            continue
+
+        cache_file = _get_query_cache_file(cache_dir, digest, query)
+        try:
+            cached = result_cache.load(cache_file)
+        except FileNotFoundError:
+            cached = None
+        except Exception as e:
+            logging.warning(f"Failed to load the cached Prometheus metric '{name}' ({cache_file}): {e}")
+            cached = None
+
+        if cached is None or not hasattr(cached, "values"):
+            missing[query] = name
+            continue
+
+        values[query] = cached.values
+
+    if not missing:
+        logging.info(f"All the {len(queries)} metrics of {prom_tarball.name} loaded from the cache.")
+        return values
+
+    # a single extraction of the Prometheus DB for all the missing queries
+    extracted = store_prom_db.extract_metrics(prom_tarball, [{name: query} for query, name in missing.items()], dirname)
+
+    for query, name in missing.items():
+        if name not in extracted:
+            continue
+
+        values[query] = extracted[name]
+
+        if not cache_dir:
+            continue
+
+        cache_file = _get_query_cache_file(cache_dir, digest, query)
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            result_cache.dump(cache_file, types.SimpleNamespace(values=values[query]))
+        except OSError as e:
+            logging.warning(f"Failed to cache the Prometheus metric '{name}' ({cache_file}): {e}")
+
+    return values
+
+
+def extract_metrics(prom_tarballs, dirname):
+    """
+    Extracts the metrics of multiple Prometheus DB tarballs
+
+    Args:
+      prom_tarballs: dict of name -> (Prometheus DB tarball, metrics to extract)
+      dirname: the directory of the results being parsed
+
+    Returns: dict of name -> metric name -> metric values,
+      like matrix_benchmarking.store.prom_db.extract_metrics
+
+    The queries are deduplicated by tarball, so that each tarball is
+    extracted at most once. When $TOPSAIL_PROM_DB_CACHE_DIR is set, the
+    values are cached there, keyed by the tarball digest, with the
+    cache serializer of the store cache files. Otherwise, the tarballs
+    are only identified by their path, size and mtime, and never hashed.
+    """
+
+    cache_dir = _get_cache_dir()
+
+    tarballs = {} # digest (or path, size, mtime) --> (tarball, PromQL query --> list of (name, metric_name))
+    for name, (prom_tarball, metrics) in prom_tarballs.items():
+        prom_tarball = pathlib.Path(prom_tarball)
+        tarball_id = _get_tarball_digest(prom_tarball) if cache_dir else _get_tarball_key(prom_tarball)
+
+        _, tarball_queries = tarballs.setdefault(tarball_id, (prom_tarball, {}))
+        for metric in metrics:
+            metric_name, query = _get_name_query(metric)
+            tarball_queries.setdefault(query, []).append((name, metric_name))
+
+    results = {name: {} for name in prom_tarballs}
+    for tarball_id, (prom_tarball, tarball_queries) in tarballs.items():
+        if not tarball_queries:
+            continue
+
+        # each query is extracted under the first name that requested
+        # it, made unique: the same metric name can be used for
+        # different queries
+        queries = {}
+        extraction_names = set()
+        for query, users in tarball_queries.items():
+            extraction_name = users[0][1]
+            suffix = 0
+            while extraction_name in extraction_names:
+                suffix += 1
+                extraction_name = f"{users[0][1]}__{suffix}"
+
+            extraction_names.add(extraction_name)
+            queries[query] = extraction_name
+
+        values = _extract_queries(prom_tarball, tarball_id, queries, dirname, cache_dir)
+
+        for query, users in tarball_queries.items():
+            if query not in values:
+                continue
+
+            for name, metric_name in users:
+                results[name][metric_name] = values[query]
+
+    return results
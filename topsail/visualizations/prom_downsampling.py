@@ -0,0 +1,142 @@
+import contextlib
+import contextvars
+import types
+
+import numpy as np
+
+# visualize cfg keys, set per plot. Disabled unless the cfg enables it.
+CFG_MODE_KEY = "prom_downsampling" # "lttb", "minmax", or unset/False to disable it
+CFG_POINTS_KEY = "prom_downsampling_points" # point budget per trace
+
+DEFAULT_MODE = "lttb" # when downsample() is called directly
+DEFAULT_POINTS = 1000
+
+# cfg of the Prometheus plot being generated (see prom_plotting),
+# None outside of the plots (eg, LTS payload generation)
+_plot_cfg = contextvars.ContextVar("prom_downsampling_plot_cfg", default=None)
+
+
+@contextlib.contextmanager
+def plot_cfg(cfg):
+    token = _plot_cfg.set(cfg)
+    try:
+        yield
+    finally:
+        _plot_cfg.reset(token)
+
+
+def lttb(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets: returns the indexes of the n_out
+    points that best preserve the visual shape of the (x, y) series.
+    """
+
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # the first and last points are always kept, the others are split in n_out-2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+
+    selected = np.empty(n_out, dtype=int)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    prev = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+
+        # average point of the next bucket (the last point for the last bucket)
+        next_start, next_end = end, (edges[i + 2] if i + 2 < len(edges) else n)
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        # area of the triangles (prev, candidate, next average), without the 1/2 factor
+        area = np.abs((x[prev] - avg_x) * (y[start:end] - y[prev])
+                      - (x[prev] - x[start:end]) * (avg_y - y[prev]))
+
+        prev = start + int(np.argmax(area))
+        selected[i + 1] = prev
+
+    return selected
+
+
+def minmax(x, y, n_out):
+    """
+    Min/max buckets: returns the indexes of the lowest and highest
+    points of n_out/2 buckets, so that all the spikes remain visible.
+    """
+
+    n = len(x)
+    if n_out >= n or n_out < 2:
+        return np.arange(n)
+
+    bucket_count = n_out // 2
+    buckets = np.arange(n) * bucket_count // n
+
+    # sorted by bucket, then by value
+    order = np.lexsort((y, buckets))
+    starts = np.searchsorted(buckets[order], np.arange(bucket_count))
+    ends = np.append(starts[1:], n) - 1
+
+    return np.unique(np.concatenate((order[starts], order[ends], [0, n - 1])))
+
+
+MODES = {
+    "lttb": lttb,
+    "minmax": minmax,
+}
+
+
+def downsample(metrics, mode=DEFAULT_MODE, points=DEFAULT_POINTS):
+    """
+    Returns a copy of the metrics with at most (about) `points` values per series.
+    """
+
+    select = MODES[mode]
+
+    downsampled = []
+    for metric in metrics:
+        timestamps = getattr(metric, "timestamps", None)
+        if timestamps is not None:
+            # prom_metrics.PromSeries, already NumPy arrays
+            x, y = timestamps, metric.samples
+        else:
+            ts_values = np.asarray(metric.values, dtype=float).reshape(-1, 2)
+            x, y = ts_values[:, 0], ts_values[:, 1]
+
+        if len(x) <= points:
+            downsampled.append(metric)
+            continue
+
+        indexes = select(x, y, points)
+
+        downsampled.append(types.SimpleNamespace(metric=metric.metric,
+                                                 values=np.column_stack((x[indexes], y[indexes])).tolist()))
+
+    return downsampled
+
+
+def get_metrics(_get_metrics):
+    """
+    Wraps a plotting get_metrics(entry, metric) function, to downsample
+    the series according to the cfg of the plot being generated.
+    """
+
+    def _get_downsampled_metrics(entry, metric):
+        metrics = _get_metrics(entry, metric)
+
+        cfg = _plot_cfg.get()
+        if cfg is None:
+            return metrics
+
+        mode = cfg.get(CFG_MODE_KEY)
+        if not mode or mode == "none":
+            return metrics
+
+        if mode not in MODES:
+            raise ValueError(f"Invalid '{CFG_MODE_KEY}' value: '{mode}'. Expected one of {', '.join(MODES)} or False.")
+
+        return downsample(metrics, mode, int(cfg.get(CFG_POINTS_KEY, DEFAULT_POINTS)))
+
+    return _get_downsampled_metrics
@@ -0,0 +1,294 @@
+import collections.abc
+import pathlib
+import logging
+import hashlib
+import types
+import json
+import re
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+from . import prom_db
+from . import cache_serializer
+
+METRICS_DIRNAME = "prom_metrics"
+INDEX_FILENAME = "index.json"
+INDEX_VERSION = 3
+
+
+def _get_metric_filename(metric_name):
+    # readable prefix, unique suffix
+    safe_name = re.sub(r"[^\w.=-]+", "_", metric_name)[:80]
+    digest = hashlib.sha256(metric_name.encode()).hexdigest()[:12]
+
+    return f"{safe_name}.{digest}.arrow"
+
+
+def _write_metric(filename, metric_values):
+    series = []
+    timestamps = []
+    values = []
+    labels = []
+    for idx, entry in enumerate(metric_values or []):
+        ts_values = np.asarray(entry.values, dtype=float).reshape(-1, 2)
+        series.append(np.full(len(ts_values), idx, dtype=np.int32))
+        timestamps.append(ts_values[:, 0])
+        values.append(ts_values[:, 1])
+        labels += [json.dumps(entry.metric, sort_keys=True)] * len(ts_values)
+
+    table = pa.table({
+        "series": pa.array(np.concatenate(series) if series else [], pa.int32()),
+        "timestamp": pa.array(np.concatenate(timestamps) if timestamps else [], pa.float64()),
+        "value": pa.array(np.concatenate(values) if values else [], pa.float64()),
+        "labels": pa.array(labels, pa.string()).dictionary_encode(),
+    })
+
+    tmp_filename = filename.with_suffix(".tmp")
+    with pa.OSFile(str(tmp_filename), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+    tmp_filename.replace(filename)
+
+
+class PromSeries():
+    """
+    Values of a Prometheus series, read from its Arrow file: the
+    timestamps and samples are NumPy views of the memory-mapped file.
+
+    `values` returns the [timestamp, value] list of the matbench
+    metrics, built only once, when a consumer (plot, LTS payload)
+    first asks for it.
+    """
+
+    __slots__ = ("metric", "timestamps", "samples", "_values")
+
+    def __init__(self, metric, timestamps, samples):
+        self.metric = metric
+        self.timestamps = timestamps
+        self.samples = samples
+        self._values = None
+
+    @property
+    def values(self):
+        if self._values is None:
+            self._values = np.column_stack((self.timestamps, self.samples)).tolist()
+
+        return self._values
+
+    def __repr__(self):
+        return f"PromSeries(metric={self.metric!r}, {len(self.timestamps)} values)"
+
+
+def to_prometheus_values(metric_values):
+    """
+    Returns the series of a metric as plain namespaces (metric labels,
+    [timestamp, value] list), for the consumers that need the values
+    as Python lists (eg, the LTS payloads).
+    """
+
+    return [types.SimpleNamespace(metric=series.metric, values=series.values)
+            for series in metric_values or []]
+
+
+def _column_view(table, name):
+    column = table.column(name)
+    if column.num_chunks == 1:
+        return column.chunk(0).to_numpy(zero_copy_only=True)
+
+    return column.to_numpy() # written in one batch, not expected
+
+
+def _read_metric(filename):
+    # the column buffers keep the file mapped after it is closed
+    with pa.memory_map(str(filename), "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+
+    if not table.num_rows:
+        return []
+
+    series = _column_view(table, "series")
+    timestamps = _column_view(table, "timestamp")
+    samples = _column_view(table, "value")
+    labels = table.column("labels").combine_chunks()
+    label_dict = labels.dictionary.to_pylist()
+    label_indices = labels.indices.to_numpy(zero_copy_only=True)
+
+    # the rows of a series are contiguous
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(series)) + 1))
+    ends = np.append(starts[1:], len(series))
+
+    return [PromSeries(json.loads(label_dict[label_indices[start]]),
+                       timestamps[start:end], samples[start:end])
+            for start, end in zip(starts, ends)]
+
+
+class LazyMetrics(collections.abc.Mapping):
+    """
+    metric name -> metric values, read from the Arrow files of a
+    results directory only when a plot asks for that metric.
+    """
+
+    def __init__(self, dirname):
+        self.dirname = pathlib.Path(dirname).absolute()
+        self.index = {} # metric name --> {"query": PromQL query, "tarball": {"size", "mtime_ns", "digest"} of the Prometheus DB, "file": Arrow filename}
+        self._loaded = {}
+        self.index_updated = False
+
+        try:
+            with open(self.dirname / INDEX_FILENAME) as f:
+                index = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logging.warning(f"Failed to load the Prometheus metrics index of '{self.dirname}': {e}")
+            return
+
+        if index.get("version") != INDEX_VERSION:
+            logging.warning(f"Prometheus metrics index of '{self.dirname}' has version '{index.get('version')}', expected '{INDEX_VERSION}', ignoring.")
+            return
+
+        self.index = index["metrics"]
+
+    def __getstate__(self):
+        # the values are reloaded from the Arrow files, they don't go to the cache file
+        state = self.__dict__.copy()
+        state["_loaded"] = {}
+        return state
+
+    def __getitem__(self, metric_name):
+        if metric_name in self._loaded:
+            return self._loaded[metric_name]
+
+        entry = self.index[metric_name]
+
+        try:
+            self._loaded[metric_name] = _read_metric(self.dirname / entry["file"])
+        except FileNotFoundError as e:
+            raise KeyError(metric_name) from e
+
+        return self._loaded[metric_name]
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def __len__(self):
+        return len(self.index)
+
+    def has_query(self, metric_name, query, prom_tarball):
+        entry = self.index.get(metric_name, {})
+        if entry.get("query") != query:
+            return False
+
+        tarball = entry.get("tarball") or {}
+        stat = prom_tarball.stat()
+        if (tarball.get("size"), tarball.get("mtime_ns")) == (stat.st_size, stat.st_mtime_ns):
+            return True
+
+        # the tarball was touched or copied, only hash it in this case
+        if tarball.get("size") != stat.st_size or tarball.get("digest") != prom_db._get_tarball_digest(prom_tarball):
+            return False
+
+        tarball["mtime_ns"] = stat.st_mtime_ns
+        self.index_updated = True # saved with the index, not hashed again
+
+        return True
+
+    def save(self, metric_name, query, prom_tarball, metric_values):
+        self.dirname.mkdir(parents=True, exist_ok=True)
+
+        filename = _get_metric_filename(metric_name)
+        _write_metric(self.dirname / filename, metric_values)
+
+        stat = prom_tarball.stat()
+        tarball = dict(size=stat.st_size, mtime_ns=stat.st_mtime_ns,
+                       digest=prom_db._get_tarball_digest(prom_tarball))
+
+        self.index[metric_name] = dict(query=query, tarball=tarball, file=filename)
+        self._loaded.pop(metric_name, None)
+
+    def save_index(self):
+        self.dirname.mkdir(parents=True, exist_ok=True)
+
+        tmp_filename = self.dirname / (INDEX_FILENAME + ".tmp")
+        with open(tmp_filename, "w") as f:
+            json.dump(dict(version=INDEX_VERSION, metrics=self.index), f, indent=1)
+
+        tmp_filename.replace(self.dirname / INDEX_FILENAME)
+        self.index_updated = False
+
+cache_serializer.register_type(LazyMetrics)
+
+
+def extract_metrics(prom_tarballs, dirname):
+    """
+    Extracts the metrics of multiple Prometheus DB tarballs, and persists them in the results directory
+
+    Args:
+      prom_tarballs: dict of name -> (Prometheus DB tarball, metrics to extract)
+      dirname: the directory of the results being parsed
+
+    Returns: dict of name -> LazyMetrics (metric name -> metric values)
+
+    Each metric is stored as an Arrow IPC file (series, timestamp,
+    value and labels columns) in dirname/prom_metrics/<name>/, and
+    read back as PromSeries. Only the metrics missing from these
+    files, or extracted from another Prometheus DB tarball, are
+    extracted from the Prometheus DB. The tarball is identified by its
+    size and mtime first, and only hashed when they changed. Falls
+    back to prom_db.extract_metrics when pyarrow isn't available.
+    """
+
+    if pa is None:
+        logging.warning("pyarrow not available, the Prometheus metrics won't be persisted.")
+        return prom_db.extract_metrics(prom_tarballs, dirname)
+
+    results = {}
+    missing = {}
+    for name, (prom_tarball, metrics) in prom_tarballs.items():
+        results[name] = lazy_metrics = LazyMetrics(dirname / METRICS_DIRNAME / name)
+        prom_tarball = pathlib.Path(prom_tarball)
+
+        missing_metrics = [metric for metric in metrics
+                           if not lazy_metrics.has_query(*prom_db._get_name_query(metric), prom_tarball)]
+        if missing_metrics:
+            missing[name] = (prom_tarball, missing_metrics)
+
+    if not missing:
+        for lazy_metrics in results.values():
+            if lazy_metrics.index_updated:
+                lazy_metrics.save_index()
+
+        return results
+
+    extracted = prom_db.extract_metrics(missing, dirname)
+
+    for name, (prom_tarball, missing_metrics) in missing.items():
+        lazy_metrics = results[name]
+        for metric in missing_metrics:
+            metric_name, query = prom_db._get_name_query(metric)
+            if metric_name not in extracted[name]:
+                continue
+
+            lazy_metrics.save(metric_name, query, prom_tarball, extracted[name][metric_name])
+
+        lazy_metrics.save_index()
+
+    return results
+
+
+def bind_metrics(metrics, dirname):
+    """
+    Points the LazyMetrics of a reloaded cache file to the current location of the results directory
+    """
+
+    for name, lazy_metrics in (metrics or {}).items():
+        if not isinstance(lazy_metrics, LazyMetrics):
+            continue
+
+        lazy_metrics.dirname = pathlib.Path(dirname).absolute() / METRICS_DIRNAME / name
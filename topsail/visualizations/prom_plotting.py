@@ -0,0 +1,44 @@
+import functools
+
+from . import prom_downsampling
+
+
+def _with_plot_cfg(plot_class):
+    # records the cfg of the plot being generated, for the
+    # get_metrics() callbacks wrapped by prom_downsampling
+    do_plot = plot_class.do_plot
+    if getattr(do_plot, "_with_plot_cfg", False):
+        return
+
+    @functools.wraps(do_plot)
+    def _do_plot(self, *args, **kwargs):
+        cfg = kwargs["cfg"] if "cfg" in kwargs else args[-1]
+        with prom_downsampling.plot_cfg(cfg):
+            return do_plot(self, *args, **kwargs)
+
+    _do_plot._with_plot_cfg = True
+    plot_class.do_plot = _do_plot
+
+
+def import_modules():
+    """
+    Returns the matbench Prometheus plotting modules:
+    (plotting.prom, plotting.prom.cpu_memory).
+
+    The prom modules of the workloads call it from their register()
+    function only: the metric definitions don't need the plotting
+    modules, and the parse-only runs don't render anything.
+
+    The do_plot() method of their Plot classes is wrapped to record
+    the cfg of the plot, so that all the Prometheus plots, in the
+    reports or standalone, are downsampled according to their cfg
+    (see prom_downsampling).
+    """
+
+    import matrix_benchmarking.plotting.prom as plotting_prom
+    import matrix_benchmarking.plotting.prom.cpu_memory as plotting_prom_cpu_memory
+
+    _with_plot_cfg(plotting_prom.Plot)
+    _with_plot_cfg(plotting_prom_cpu_memory.Plot)
+
+    return plotting_prom, plotting_prom_cpu_memory
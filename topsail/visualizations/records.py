@@ -0,0 +1,70 @@
+from . import cache_serializer
+
+
+class Record():
+    """
+    Compact replacement of the SimpleNamespaces the stores create by
+    the thousands (one per pod, one per user): same attribute access,
+    but __slots__ instead of a per-instance dict.
+
+    As with a SimpleNamespace, the attributes are optional: hasattr()
+    tells if an attribute was set. _asdict() returns the attributes
+    set, in place of __dict__.
+
+    The subclasses are registered in the cache serializer, under the
+    name given in the class definition (class X(Record, name="X")).
+    """
+
+    __slots__ = ()
+
+    _fields = () # all the slots, including the parent classes ones
+
+    def __init_subclass__(cls, name=None, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        fields = []
+        for klass in reversed(cls.__mro__):
+            fields += [field for field in klass.__dict__.get("__slots__", ()) if field not in fields]
+        cls._fields = tuple(fields)
+
+        cache_serializer.register_type(cls, name=name or cls.__qualname__)
+
+    def __init__(self, **kwargs):
+        for key, value in kwargs.items():
+            setattr(self, key, value)
+
+    def _asdict(self):
+        return {field: getattr(self, field) for field in self._fields if hasattr(self, field)}
+
+    def __getstate__(self):
+        return self._asdict()
+
+    def __setstate__(self, state):
+        for key, value in state.items():
+            setattr(self, key, value)
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+
+        return self._asdict() == other._asdict()
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(" + ", ".join(f"{key}={value!r}" for key, value in self._asdict().items()) + ")"
+
+
+class PodTimes(Record, name="PodTimes"):
+    """
+    Timestamps of a Pod, parsed from its status, and its identification
+
+    Each store sets the attributes it needs.
+    """
+
+    __slots__ = (
+        # identification
+        "pod_name", "pod_friendly_name", "namespace", "pod_namespace", "hostname",
+        "workload", "user_index", "user_idx", "model_id", "is_dspa", "is_pipeline_task",
+        # timestamps
+        "creation_time", "start_time", "pod_scheduled", "pod_initialized",
+        "containers_ready", "container_started", "container_finished", "last_activity",
+    )
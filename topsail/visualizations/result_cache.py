@@ -0,0 +1,343 @@
+import pathlib
+import logging
+import pickle
+import os
+import struct
+import types
+import json
+
+from . import cache_serializer
+
+# bump when the layout of the file changes
+RESULT_CACHE_VERSION = 2
+
+# start of the cache files. The files without it are single pickled namespaces (or version 1 files)
+MAGIC = b"TOPSAIL-RESULT-CACHE\n"
+
+# attributes smaller than this are stored in the header, and loaded right away
+INLINE_SECTION_SIZE = 4 * 1024
+
+# "y" or "n". In strict mode, dump() checks that each attribute comes
+# back identical after a round trip, and raises instead of skipping the
+# cache file. Enabled by default in the CI.
+ENV_STRICT = "TOPSAIL_CACHE_STRICT"
+
+
+def is_strict():
+    strict = os.environ.get(ENV_STRICT)
+    if strict:
+        return strict.lower() in ("y", "yes", "true", "1")
+
+    return bool(os.environ.get("OPENSHIFT_CI") or os.environ.get("PERFLAB_CI"))
+
+
+class LazyResults(types.SimpleNamespace):
+    """
+    Results namespace reloaded from a cache file, where each large
+    attribute (section) is decoded only on its first access.
+
+    The attributes set after the reload (eg, by _parse_always) take
+    precedence over the cached sections. vars() only shows the
+    sections already loaded, call load_all() to get all of them.
+
+    The identity of the file (device, inode, mtime and size) is
+    checked before reading a section: a file replaced since the
+    reload raises a RuntimeError instead of decoding another file at
+    the same offsets.
+    """
+
+    # a slot, so that it doesn't appear in the results (__dict__)
+    __slots__ = ("_source",)
+
+    def __init__(self, filename, file_identity, data_start, sections, codec, **inline):
+        super().__init__(**inline)
+        self._source = (pathlib.Path(filename), file_identity, data_start, dict(sections), codec)
+
+    def __getattr__(self, name):
+        # called only when the attribute isn't in __dict__ yet
+        if name == "_source":
+            raise AttributeError(name)
+
+        filename, file_identity, data_start, sections, codec = self._source
+
+        if name not in sections:
+            raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{name}'")
+
+        offset, length = sections[name]
+        with open(filename, "rb") as f:
+            if _file_identity(f) != file_identity:
+                raise RuntimeError(f"Cache file '{filename}' changed since it was loaded, cannot load its '{name}' section")
+
+            f.seek(data_start + offset)
+            value = codec.decode(f.read(length))
+
+        # removed only once decoded, a failed decoding can be retried
+        self.__dict__[name] = value
+        del sections[name]
+
+        return value
+
+    def pending_sections(self):
+        """
+        Returns the names of the sections not loaded yet
+        """
+
+        return [name for name in self._source[3] if name not in self.__dict__]
+
+    def load_all(self):
+        """
+        Loads all the sections, and returns the results as a plain SimpleNamespace
+        """
+
+        for name in self.pending_sections():
+            getattr(self, name)
+
+        return types.SimpleNamespace(**self.__dict__)
+
+    def __reduce__(self):
+        # pickled (or deep-copied) as a complete, plain namespace
+        return (types.SimpleNamespace, (), self.load_all().__dict__)
+
+    def __repr__(self):
+        pending = self.pending_sections()
+        return super().__repr__() + (f" (not loaded: {', '.join(pending)})" if pending else "")
+
+
+def _file_identity(f):
+    stat = os.fstat(f.fileno())
+
+    return (stat.st_dev, stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+def encode_sections(codec, results, offset=0, check=False):
+    """
+    Encodes a results namespace, one section per large attribute, and
+    the small attributes together in the inline blob
+
+    Args:
+      offset: position of the first blob, the section offsets are relative to it
+      check: if True, each attribute is decoded again and compared with
+        its value (cache_serializer.check_round_trip)
+
+    Returns: (blobs, inline, sections), where inline and the sections
+    are the (offset, length) of their blob. The inline blob is the last one.
+
+    Raises TypeError, ValueError or OverflowError, with the name of
+    the attribute, if the results can't be serialized.
+    """
+
+    if isinstance(results, LazyResults):
+        results = results.load_all()
+
+    inline = {}
+    sections = {}
+    blobs = []
+    for name, value in results.__dict__.items():
+        try:
+            blob = codec.encode(value)
+            if check:
+                cache_serializer.check_round_trip(value, codec.decode(blob), name)
+        except (TypeError, ValueError, OverflowError) as e:
+            raise type(e)(f"attribute '{name}': {e}") from e
+
+        if len(blob) < INLINE_SECTION_SIZE:
+            inline[name] = value
+            continue
+
+        sections[name] = (offset, len(blob))
+        blobs.append(blob)
+        offset += len(blob)
+
+    inline_blob = codec.encode(inline)
+    blobs.append(inline_blob)
+
+    return blobs, (offset, len(inline_blob)), sections
+
+
+def decode_sections(filename, f, data_start, codec, inline, sections):
+    """
+    Returns the LazyResults of results encoded with encode_sections(),
+    with only its inline attributes decoded
+
+    Args:
+      f: the file, open in binary mode
+      data_start: position of the blobs in the file
+    """
+
+    inline_offset, inline_length = inline
+    f.seek(data_start + inline_offset)
+
+    return LazyResults(filename, _file_identity(f), data_start, sections, codec, **codec.decode(f.read(inline_length)))
+
+
+def dump(filename, results, serializer=None, compression=None):
+    """
+    Saves a results namespace in a cache file, one compressed section per attribute
+
+    Args:
+      serializer: name of the serializer, see cache_serializer.get_serializer_name()
+      compression: name of the compression, zstd if available, zlib otherwise
+
+    Returns False, without saving anything, if the results can't be
+    serialized. In strict mode (see is_strict()), raises the error
+    instead, and checks that the attributes come back identical.
+    Shared objects between two attributes are duplicated in their sections.
+
+    File layout: MAGIC, header length (4 bytes), JSON header
+    (versions, serializer, compression, offsets of the sections),
+    then the sections and the inline attributes.
+    """
+
+    codec = cache_serializer.Codec(cache_serializer.get_serializer(serializer),
+                                   compression or cache_serializer.get_default_compression())
+
+    strict = is_strict()
+    try:
+        blobs, inline, sections = encode_sections(codec, results, check=strict)
+    except (TypeError, ValueError, OverflowError) as e:
+        logging.error(f"Cannot save the cache file '{filename}' with {codec.serializer.name}: {e}")
+        if strict:
+            raise
+
+        return False
+
+    header = json.dumps(dict(
+        version=RESULT_CACHE_VERSION,
+        serializer=codec.serializer.name,
+        schema_version=codec.serializer.schema_version,
+        compression=codec.compression,
+        inline=inline,
+        sections=sections,
+    )).encode()
+
+    filename = pathlib.Path(filename)
+    tmp_filename = filename.with_name(f".{filename.name}.tmp")
+    try:
+        with open(tmp_filename, "wb") as f:
+            f.write(MAGIC)
+            f.write(struct.pack(">I", len(header)))
+            f.write(header)
+            for blob in blobs:
+                f.write(blob)
+
+        tmp_filename.replace(filename)
+    finally:
+        tmp_filename.unlink(missing_ok=True)
+
+    return True
+
+
+# the cache files saved with pickle are only loaded by this script (or when pickle is the serializer in use)
+MIGRATE_SCRIPT = "testing/utils/migrate_store_cache.py"
+
+
+def _warn_pickle_ignored(filename):
+    logging.warning(f"Cache file '{filename}' was saved with pickle, which isn't the cache serializer in use, ignoring. "
+                    f"Run {MIGRATE_SCRIPT} to convert the trusted cache files.")
+
+
+def _load_pickle(filename, f, allow_pickle):
+    if not allow_pickle:
+        _warn_pickle_ignored(filename)
+        return None
+
+    f.seek(0)
+    results = pickle.load(f)
+    if not (isinstance(results, dict) and "result_cache" in results):
+        return results # single pickled namespace
+
+    # version 1: pickled header, then the pickled sections
+    return LazyResults(filename, _file_identity(f), f.tell(), results["sections"],
+                       cache_serializer.Codec(cache_serializer.PickleSerializer(), "none"),
+                       **results["inline"])
+
+
+def load(filename, allow_pickle=None):
+    """
+    Reloads a cache file saved by dump(), as a LazyResults
+
+    Returns None if the file can't be loaded: unknown format or
+    schema version, or saved with pickle when pickle isn't allowed.
+
+    Args:
+      allow_pickle: if True, the files saved with pickle are loaded. By default, only if pickle is the serializer in use.
+    """
+
+    if allow_pickle is None:
+        allow_pickle = cache_serializer.is_pickle_allowed()
+
+    with open(filename, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            return _load_pickle(filename, f, allow_pickle)
+
+        try:
+            header_length, = struct.unpack(">I", f.read(4))
+            header = json.loads(f.read(header_length))
+        except (struct.error, ValueError) as e:
+            logging.warning(f"Cache file '{filename}' has an invalid header ({e}), ignoring.")
+            return None
+
+        data_start = f.tell()
+
+        if header.get("version") != RESULT_CACHE_VERSION:
+            logging.warning(f"Cache file '{filename}' has format version '{header.get('version')}', expected '{RESULT_CACHE_VERSION}', ignoring.")
+            return None
+
+        serializer_name = header.get("serializer")
+        if serializer_name == "pickle" and not allow_pickle:
+            _warn_pickle_ignored(filename)
+            return None
+
+        try:
+            serializer = cache_serializer.get_serializer(serializer_name)
+            codec = cache_serializer.Codec(serializer, header.get("compression"))
+        except ValueError as e:
+            logging.warning(f"Cache file '{filename}' cannot be loaded: {e}, ignoring.")
+            return None
+
+        if header.get("schema_version") != serializer.schema_version:
+            logging.warning(f"Cache file '{filename}' has {serializer_name} schema version '{header.get('schema_version')}', expected '{serializer.schema_version}', ignoring.")
+            return None
+
+        return decode_sections(filename, f, data_start, codec, header["inline"], header["sections"])
+
+
+def get_file_serializer(filename):
+    """
+    Returns the name of the serializer of a cache file, "pickle" for the files without header
+    """
+
+    with open(filename, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            return "pickle"
+
+        try:
+            header_length, = struct.unpack(">I", f.read(4))
+            return json.loads(f.read(header_length)).get("serializer")
+        except (struct.error, ValueError):
+            return None
+
+
+def migrate_pickle(filename):
+    """
+    Rewrites a cache file saved with pickle with the serializer in use
+
+    The file is loaded with pickle: only for the trusted cache files
+    (eg, written by a previous local parse).
+
+    Returns True if the file was rewritten, False if it didn't need to
+    be, or couldn't be, migrated.
+    """
+
+    serializer_name = cache_serializer.get_serializer_name()
+    if get_file_serializer(filename) != "pickle" or serializer_name == "pickle":
+        return False
+
+    results = load(filename, allow_pickle=True)
+    if results is None:
+        return False
+
+    if isinstance(results, LazyResults):
+        results = results.load_all() # the file is replaced by dump()
+
+    return dump(filename, results, serializer_name)
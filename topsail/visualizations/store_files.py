@@ -0,0 +1,103 @@
+import pathlib
+import fnmatch
+import glob
+import os
+import re
+
+
+class ImportantFilesMatcher():
+    """
+    Tells if a file is part of the IMPORTANT_FILES of a store.
+
+    Same rules as the original loop: exact names, or fnmatch patterns
+    for the entries containing a '*'. The patterns are compiled once
+    into a single regex.
+    """
+
+    def __init__(self, important_files):
+        self.exact_names = frozenset(important_files)
+
+        patterns = [f"(?:{fnmatch.translate(important_file)})"
+                    for important_file in important_files if "*" in important_file]
+        self.regex = re.compile("|".join(patterns)) if patterns else None
+
+    def match(self, filename):
+        filename = str(filename)
+
+        if filename in self.exact_names:
+            return True
+
+        return bool(self.regex and self.regex.match(filename))
+
+
+class DirectoryListing():
+    """
+    Snapshot of the content of a results directory, to resolve the
+    globs in memory.
+
+    Each directory is listed (once) only when a glob needs it. The
+    recursive '**' globs are delegated to pathlib.
+    """
+
+    def __init__(self, dirname):
+        self.dirname = pathlib.Path(dirname)
+        self._entries = {} # relative dirname --> {entry name: is_dir}
+
+    def _list(self, rel_dirname):
+        if rel_dirname not in self._entries:
+            try:
+                with os.scandir(self.dirname / rel_dirname) as scan:
+                    self._entries[rel_dirname] = {entry.name: entry.is_dir() for entry in scan}
+            except (FileNotFoundError, NotADirectoryError):
+                self._entries[rel_dirname] = {}
+
+        return self._entries[rel_dirname]
+
+    def _relative(self, path):
+        path = pathlib.PurePath(path)
+        if not path.is_absolute():
+            return path
+
+        try:
+            return path.relative_to(self.dirname)
+        except ValueError:
+            return None
+
+    def exists(self, path):
+        rel_path = self._relative(path)
+        if rel_path is None:
+            return pathlib.Path(path).exists()
+
+        if not rel_path.parts:
+            return self.dirname.exists()
+
+        return rel_path.name in self._list(str(rel_path.parent))
+
+    def glob(self, pattern, root=None):
+        """
+        Same as pathlib.Path(root or dirname).glob(pattern), but sorted.
+        root can be absolute or relative to the directory.
+        """
+
+        root = self.dirname / root if root else self.dirname
+
+        rel_root = self._relative(root)
+        if rel_root is None or "**" in pathlib.PurePath(pattern).parts:
+            return sorted(root.glob(pattern))
+
+        parts = pathlib.PurePath(pattern).parts
+        candidates = [os.path.normpath(rel_root)]
+        for idx, part in enumerate(parts):
+            is_last = idx == len(parts) - 1
+
+            if not glob.has_magic(part):
+                candidates = [os.path.normpath(os.path.join(candidate, part)) for candidate in candidates
+                              if part in self._list(candidate) and (is_last or self._list(candidate)[part])]
+                continue
+
+            regex = re.compile(fnmatch.translate(part))
+            candidates = [os.path.normpath(os.path.join(candidate, name)) for candidate in candidates
+                          for name, is_dir in self._list(candidate).items()
+                          if (is_last or is_dir) and regex.match(name)]
+
+        return sorted(self.dirname / candidate for candidate in candidates)